@@ -1,6 +1,7 @@
 """
 URL Prioritizer Agent
-Selects the most valuable pages from vendor and prospect websites for intelligence gathering.
+Selects the most valuable pages from a vendor or prospect website for intelligence gathering.
+Runs once per company (Step 4 runs the vendor and prospect calls concurrently).
 Uses OpenAI GPT-4o-mini for fast URL filtering (40-60% faster than gpt-4o).
 """
 
@@ -18,18 +19,17 @@ class PrioritizedURL(BaseModel):
     reasoning: str
 
 
-class URLPrioritizationResult(BaseModel):
-    """Result containing prioritized URLs for both vendor and prospect"""
-    vendor_selected_urls: List[PrioritizedURL]
-    prospect_selected_urls: List[PrioritizedURL]
+class URLSelectionResult(BaseModel):
+    """Result containing the prioritized URLs of one company"""
+    selected_urls: List[PrioritizedURL]
 
 
 url_prioritizer = Agent(
     name="Strategic URL Selector",
     model=config.FAST_MODEL,  # gpt-4o-mini: 40-60% faster!
-    description="Content strategist selecting the most valuable pages from vendor and prospect websites for B2B sales intelligence gathering.",
+    description="Content strategist selecting the most valuable pages from a vendor or prospect website for B2B sales intelligence gathering.",
     instructions=[
-        "Given lists of URLs from vendor and prospect websites, select the TOP 10-15 MOST VALUABLE pages for each.",
+        "Given the list of URLs from one company's website (vendor or prospect), select the TOP 10-15 MOST VALUABLE pages.",
         "PRIORITIZE: /about, /about-us, /company, /team, /leadership pages.",
         "PRIORITIZE: /products, /solutions, /platform, /features pages.",
         "PRIORITIZE: /customers, /case-studies, /success-stories, /testimonials pages.",
@@ -41,7 +41,7 @@ url_prioritizer = Agent(
         "AVOID: Login/signup pages (/login, /signup, /register).",
         "AVOID: Media/press pages (unless highly relevant).",
         "For each selected URL, provide: page_type (category), priority (1=must have to 10=nice to have), and reasoning (why valuable for sales intelligence).",
-        "Return top 10-15 URLs per company, prioritized.",
+        "Return the top 10-15 URLs, prioritized. Only select URLs from the given list.",
     ],
-    output_schema=URLPrioritizationResult
+    output_schema=URLSelectionResult
 )
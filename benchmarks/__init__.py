@@ -0,0 +1 @@
+"""Offline benchmarks for Playbook AI pipeline components"""
@@ -0,0 +1,111 @@
+"""
+Execution Profile Benchmark
+Runs the full workflow once per execution profile (config.EXECUTION_PROFILES)
+and reports latency and cost for each, so profile settings can be tuned
+against each other.
+
+By default the run is fully offline: Firecrawl is the local mock server
+(benchmarks/mock_firecrawl_server.py) and agents use the fake LLM backend
+(utils/fake_model.py). Fake calls have the same latency whatever the model, so
+offline latency differences come from call and page counts; costs use the real
+model pricing on the token counts each profile produces. With --live, the
+services configured in .env are used (this spends credits).
+
+Usage:
+    python -m benchmarks.bench_profiles [vendor_domain prospect_domain] [--profiles a,b] [--rounds N] [--live] [mock server options]
+
+Examples:
+    python -m benchmarks.bench_profiles
+    python -m benchmarks.bench_profiles --profiles fast,balanced --rounds 3
+    python -m benchmarks.bench_profiles gong.io sendoso.com --live
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.mock_firecrawl_server import parse_args, serve
+
+VENDOR_DOMAIN = "acme-analytics.example"
+PROSPECT_DOMAIN = "globex-logistics.example"
+
+
+def main():
+    argv = sys.argv[1:]
+    options = {"--profiles": None, "--rounds": "1"}
+    for flag in options:
+        if flag in argv:
+            index = argv.index(flag)
+            options[flag] = argv[index + 1]
+            del argv[index:index + 2]
+
+    live = "--live" in argv
+    if live:
+        argv.remove("--live")
+
+    domains = [VENDOR_DOMAIN, PROSPECT_DOMAIN]
+    if argv and not argv[0].startswith("--"):
+        domains, argv = argv[:2], argv[2:]
+        if len(domains) < 2:
+            print(__doc__)
+            sys.exit(1)
+
+    server = None
+    if not live:
+        settings, _ = parse_args(argv)
+        server = serve(settings, port=0)
+
+        # Must be set before config is imported
+        os.environ["FIRECRAWL_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+        os.environ.setdefault("FIRECRAWL_API_KEY", "mock")
+        os.environ.setdefault("LLM_BACKEND", "fake")
+
+    import config
+    from main import workflow
+    from models.workflow_input import WorkflowInput
+    from utils.telemetry import collect_step_contents, collect_run_telemetry
+
+    profiles = options["--profiles"].split(",") if options["--profiles"] else list(config.EXECUTION_PROFILES)
+    rounds = int(options["--rounds"])
+    results = {}
+
+    for profile in profiles:
+        validated_input = WorkflowInput(vendor_domain=domains[0], prospect_domain=domains[1], profile=profile)
+        workflow_input = {
+            "vendor_domain": validated_input.vendor_domain,
+            "prospect_domain": validated_input.prospect_domain,
+            "profile": validated_input.profile
+        }
+
+        for round_number in range(1, rounds + 1):
+            start = time.perf_counter()
+            result = workflow.run(input=workflow_input)
+            wall_seconds = time.perf_counter() - start
+
+            totals = collect_run_telemetry(collect_step_contents(result.step_results or []))["totals"]
+            results.setdefault(profile, []).append({"wall_seconds": wall_seconds, **totals})
+            print(f"{profile} round {round_number}/{rounds}: {wall_seconds:.2f}s, ${totals['cost_usd']:.4f}")
+
+    if server:
+        server.shutdown()
+
+    print("\n" + "=" * 86)
+    print(f"EXECUTION PROFILE BENCHMARK - {rounds} round(s) per profile, {'live services' if live else 'offline'}")
+    print("=" * 86)
+    print(f"{'profile':<12}{'p50 s':>9}{'max s':>9}{'cost $':>11}{'tokens':>11}{'agent calls':>13}{'pages':>8}{'retries':>9}")
+
+    for profile, runs in results.items():
+        wall = [run["wall_seconds"] for run in runs]
+        print(
+            f"{profile:<12}{statistics.median(wall):>9.2f}{max(wall):>9.2f}"
+            f"{statistics.mean(run['cost_usd'] for run in runs):>11.4f}"
+            f"{statistics.mean(run['total_tokens'] for run in runs):>11,.0f}"
+            f"{statistics.mean(run['agent_calls'] for run in runs):>13.1f}"
+            f"{statistics.mean(run['pages_scraped'] for run in runs):>8.1f}"
+            f"{statistics.mean(run['retries'] for run in runs):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
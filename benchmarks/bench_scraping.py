@@ -0,0 +1,109 @@
+"""
+Scraping Benchmark
+Times utils/firecrawl_helpers (map, single scrape, batch scrape) and Step 5
+against the local mock Firecrawl server, under a configurable latency
+distribution, failure rate and timeout rate.
+
+Usage:
+    python -m benchmarks.bench_scraping [--rounds N] [mock server options]
+
+Examples:
+    python -m benchmarks.bench_scraping
+    python -m benchmarks.bench_scraping --latency-sigma 1.2 --failure-rate 0.05 --timeout-rate 0.02
+
+Mock server options are the same as benchmarks/mock_firecrawl_server.py. The
+server is started in-process on a free port; nothing touches the network.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.mock_firecrawl_server import parse_args, serve
+
+VENDOR_DOMAIN = "https://acme-analytics.example"
+PROSPECT_DOMAIN = "https://globex-logistics.example"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def report(name, timings):
+    print(f"{name:<28}{len(timings):>6}{statistics.median(timings):>10.2f}"
+          f"{percentile(timings, 95):>10.2f}{max(timings):>10.2f}")
+
+
+def main():
+    argv = sys.argv[1:]
+    rounds = 3
+    if "--rounds" in argv:
+        index = argv.index("--rounds")
+        rounds = int(argv[index + 1])
+        del argv[index:index + 2]
+
+    settings, _ = parse_args(argv)
+    server = serve(settings, port=0)
+
+    # Must be set before config is imported
+    os.environ["FIRECRAWL_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("FIRECRAWL_API_KEY", "mock")
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+    from agno.workflow.types import StepInput
+    from steps.step5_batch_scraping import batch_scrape_selected_pages
+    from utils.firecrawl_helpers import batch_scrape_urls, map_website, scrape_url
+
+    timings = {"map_website": [], "scrape_url": [], "batch_scrape_urls": [], "step5_batch_scrape": []}
+    pages = {"requested": 0, "returned": 0}
+    outcomes = {}
+
+    for round_number in range(1, rounds + 1):
+        start = time.perf_counter()
+        vendor_map = map_website(VENDOR_DOMAIN, use_cache=False)  # Time the Firecrawl call, not the local cache
+        prospect_map = map_website(PROSPECT_DOMAIN, use_cache=False)
+        timings["map_website"].append((time.perf_counter() - start) / 2)
+
+        for url in vendor_map["urls"][:3]:
+            start = time.perf_counter()
+            scrape_url(url)
+            timings["scrape_url"].append(time.perf_counter() - start)
+
+        urls = vendor_map["urls"] + prospect_map["urls"]
+        start = time.perf_counter()
+        batch = batch_scrape_urls(urls)
+        timings["batch_scrape_urls"].append(time.perf_counter() - start)
+        pages["requested"] += len(urls)
+        pages["returned"] += batch["total_scraped"]
+        outcome = batch.get("outcome", "error")
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        # Step 5 end to end, fed by a stand-in Step 4 output
+        step_input = StepInput(previous_step_content={
+            "vendor_selected_urls": vendor_map["urls"],
+            "prospect_selected_urls": prospect_map["urls"]
+        })
+        start = time.perf_counter()
+        batch_scrape_selected_pages(step_input)
+        timings["step5_batch_scrape"].append(time.perf_counter() - start)
+
+        print(f"Round {round_number}/{rounds}: {batch['total_scraped']}/{len(urls)} pages returned")
+
+    server.shutdown()
+
+    print("\n" + "=" * 64)
+    print(f"SCRAPING BENCHMARK - median page latency {settings.latency_median}s, sigma {settings.latency_sigma}, "
+          f"failures {settings.failure_rate:.0%}, timeouts {settings.timeout_rate:.0%}")
+    print("=" * 64)
+    print(f"{'operation':<28}{'calls':>6}{'p50 s':>10}{'p95 s':>10}{'max s':>10}")
+    for name, values in timings.items():
+        report(name, values)
+    print("-" * 64)
+    print(f"Batch pages returned: {pages['returned']}/{pages['requested']}")
+    print(f"Batch job outcomes: " + ", ".join(f"{name} {count}" for name, count in sorted(outcomes.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Workflow Replay Benchmark
+Times the full workflow and each step offline, from recorded Firecrawl and
+agent responses (see utils/replay.py). No network calls, no credits.
+
+Record once against the live services:
+    REPLAY_MODE=record python main.py gong.io sendoso.com
+
+Then benchmark as often as needed:
+    python -m benchmarks.bench_workflow <vendor_domain> <prospect_domain> [--rounds N] [--scale X]
+
+Examples:
+    python -m benchmarks.bench_workflow gong.io sendoso.com
+    python -m benchmarks.bench_workflow gong.io sendoso.com --rounds 5 --scale 0
+
+--scale multiplies the recorded latencies (default 1.0 = as recorded,
+0 = instant, which isolates orchestration and parsing cost).
+
+For each step the report shows wall time and "overhead": step time not spent
+inside Firecrawl or agent calls (prompt building, parsing, minification,
+serialization between steps).
+"""
+
+import os
+import statistics
+import sys
+import time
+
+# Replay mode must be set before config is imported
+os.environ.setdefault("REPLAY_MODE", "replay")
+os.environ.setdefault("FIRECRAWL_API_KEY", "replay")
+os.environ.setdefault("OPENAI_API_KEY", "replay")
+
+
+def parse_args():
+    args = sys.argv[1:]
+    options = {"rounds": 3, "scale": None}
+    positional = []
+
+    i = 0
+    while i < len(args):
+        if args[i] in ("--rounds", "--scale") and i + 1 < len(args):
+            options[args[i][2:]] = args[i + 1]
+            i += 2
+        else:
+            positional.append(args[i])
+            i += 1
+
+    if len(positional) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    return positional[0], positional[1], int(options["rounds"]), options["scale"]
+
+
+def main():
+    vendor_domain, prospect_domain, rounds, scale = parse_args()
+    if scale is not None:
+        os.environ["REPLAY_LATENCY_SCALE"] = scale
+
+    import config
+    from main import workflow
+    from models.workflow_input import WorkflowInput
+    from utils.telemetry import collect_step_contents, collect_run_telemetry
+
+    validated_input = WorkflowInput(vendor_domain=vendor_domain, prospect_domain=prospect_domain)
+    workflow_input = {
+        "vendor_domain": validated_input.vendor_domain,
+        "prospect_domain": validated_input.prospect_domain
+    }
+
+    wall_times = []
+    step_times = {}
+    step_overheads = {}
+
+    for round_number in range(1, rounds + 1):
+        start = time.perf_counter()
+        result = workflow.run(input=workflow_input)
+        wall_times.append(time.perf_counter() - start)
+
+        run_telemetry = collect_run_telemetry(collect_step_contents(result.step_results or []))
+        for step_name, step in run_telemetry["steps"].items():
+            call_seconds = sum(
+                call.get("duration_seconds", 0) + call.get("queue_seconds", 0)
+                for call in step.get("agent_calls", []) + step.get("firecrawl_calls", [])
+            )
+            step_times.setdefault(step_name, []).append(step["duration_seconds"])
+            step_overheads.setdefault(step_name, []).append(max(step["duration_seconds"] - call_seconds, 0))
+
+        print(f"Round {round_number}/{rounds}: {wall_times[-1]:.2f}s ({len(run_telemetry['steps'])} steps)")
+
+    print("\n" + "=" * 72)
+    print(f"WORKFLOW REPLAY BENCHMARK - {rounds} rounds, latency scale {config.REPLAY_LATENCY_SCALE}")
+    print("=" * 72)
+    print(f"{'step':<32}{'mean s':>10}{'max s':>10}{'overhead s':>12}")
+
+    for step_name, times in step_times.items():
+        overhead = statistics.mean(step_overheads[step_name])
+        print(f"{step_name:<32}{statistics.mean(times):>10.2f}{max(times):>10.2f}{overhead:>12.3f}")
+
+    print("-" * 72)
+    print(f"{'workflow wall time':<32}{statistics.mean(wall_times):>10.2f}{max(wall_times):>10.2f}")
+    print(f"{'workflow wall time (median)':<32}{statistics.median(wall_times):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+API Load Generator
+Fires concurrent workflow runs at a running serve.py and reports throughput,
+latency percentiles and errors, to find the concurrency ceiling of one server
+process (and of the AgentOS session storage behind it).
+
+Run the server offline first, so no OpenAI or Firecrawl calls are made:
+    python -m benchmarks.mock_firecrawl_server &
+    LLM_BACKEND=fake FIRECRAWL_API_URL=http://localhost:3002 python serve.py
+
+Then:
+    python -m benchmarks.load_test_serve [--concurrency N] [--requests N] [--url URL]
+
+Examples:
+    python -m benchmarks.load_test_serve --concurrency 4 --requests 20
+    python -m benchmarks.load_test_serve --concurrency 16 --requests 64 --url http://10.0.0.5:8080
+
+Step up --concurrency until p95 latency or the error rate climbs; that is the ceiling.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = "http://localhost:8080"
+WORKFLOW_PATH = "/workflows/playbook-ai-sales-intelligence-pipeline/runs"
+REQUEST_TIMEOUT = 900  # Seconds; a full run takes minutes under load
+
+# Fixture sites served by benchmarks/mock_firecrawl_server.py
+PAYLOAD = {"vendor_domain": "acme-analytics.example", "prospect_domain": "globex-logistics.example"}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def run_once(url: str) -> tuple:
+    """POST one workflow run; returns (seconds, error or None)"""
+    request = urllib.request.Request(
+        url + WORKFLOW_PATH,
+        data=json.dumps(PAYLOAD).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+        return time.perf_counter() - start, None
+    except urllib.error.HTTPError as e:
+        return time.perf_counter() - start, f"HTTP {e.code}"
+    except Exception as e:
+        return time.perf_counter() - start, type(e).__name__
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"--concurrency": "4", "--requests": "20", "--url": DEFAULT_URL}
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag not in options:
+            print(__doc__)
+            sys.exit(1)
+        options[flag] = value
+
+    concurrency = int(options["--concurrency"])
+    total_requests = int(options["--requests"])
+    url = options["--url"].rstrip("/")
+
+    print(f"🚀 {total_requests} runs against {url} with concurrency {concurrency}...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: run_once(url), range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for seconds, error in results if error is None]
+    errors = [error for _, error in results if error is not None]
+
+    print("\n" + "=" * 56)
+    print(f"LOAD TEST - concurrency {concurrency}, {total_requests} runs")
+    print("=" * 56)
+    print(f"Throughput:   {len(latencies) / elapsed * 60:.1f} runs/minute ({elapsed:.1f}s total)")
+    if latencies:
+        print(f"Latency p50:  {statistics.median(latencies):.1f}s")
+        print(f"Latency p95:  {percentile(latencies, 95):.1f}s")
+        print(f"Latency max:  {max(latencies):.1f}s")
+    print(f"Errors:       {len(errors)}/{total_requests}" + (f" ({', '.join(sorted(set(errors)))})" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
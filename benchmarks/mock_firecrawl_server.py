@@ -0,0 +1,353 @@
+"""
+Mock Firecrawl Server
+Local stand-in for the Firecrawl v2 API (map, scrape, batch scrape) that serves
+pages from a directory of fixture sites, with simulated latency, partial
+failures and timeouts. No network, no credits.
+
+Usage:
+    python -m benchmarks.mock_firecrawl_server [--port 3002] [--sites DIR] [options]
+
+Then point the pipeline at it:
+    FIRECRAWL_API_URL=http://localhost:3002 python main.py acme-analytics.example globex-logistics.example
+
+Options:
+    --sites DIR              Fixture sites directory (default: benchmarks/fixtures/sites)
+    --latency-median S       Median per-page scrape latency in seconds (default: 0.8)
+    --latency-sigma X        Log-normal spread of page latency; 1.0 gives a long tail (default: 0.6)
+    --map-latency S          Map latency in seconds (default: 0.5)
+    --failure-rate P         Fraction of pages that fail (default: 0.0)
+    --timeout-rate P         Fraction of pages that hang for --timeout-seconds (default: 0.0)
+    --timeout-seconds S      How long a hanging page takes (default: 60)
+    --concurrency N          Pages a batch job scrapes at once (default: 5)
+    --cache-age S            Serve every page as a cache hit this many seconds old when the
+                             request's maxAge allows it (default: -1, no cache)
+    --seed N                 Random seed for reproducible runs (default: 42)
+
+Fixture sites are directories named after the host, with one markdown file per
+page (index.md is the root, customers/acme.md is /customers/acme). An .html file
+next to a page is served as its HTML (and raw HTML); otherwise HTML is derived from the markdown.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import html
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+
+DEFAULT_SITES_DIR = Path(__file__).parent / "fixtures" / "sites"
+
+
+@dataclass
+class MockSettings:
+    """Latency and failure simulation settings"""
+    sites_dir: Path = DEFAULT_SITES_DIR
+    latency_median: float = 0.8
+    latency_sigma: float = 0.6
+    map_latency: float = 0.5
+    failure_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 60.0
+    concurrency: int = 5
+    cache_age: float = -1.0
+    seed: int = 42
+
+
+@dataclass
+class PagePlan:
+    """Simulated outcome of scraping one page"""
+    url: str
+    latency: float
+    outcome: str  # "ok" | "failed" | "timeout"
+
+
+@dataclass
+class BatchJob:
+    """Batch scrape job whose pages finish at precomputed times"""
+    id: str
+    started_at: float
+    formats: List
+    pages: List[PagePlan]
+    max_age: Optional[int] = None
+    finish_times: List[float] = field(default_factory=list)
+    cancelled: bool = False
+
+
+class FixtureSites:
+    """Pages of the fixture sites, keyed by host and path"""
+
+    def __init__(self, sites_dir: Path):
+        self.sites_dir = sites_dir
+
+    def _page_path(self, url: str) -> Optional[Path]:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower().removeprefix("www.")
+        path = parsed.path.strip("/") or "index"
+        page = self.sites_dir / host / f"{path}.md"
+        if not page.exists():
+            page = self.sites_dir / host / path / "index.md"
+        return page if page.exists() else None
+
+    def links(self, url: str) -> List[Dict]:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower().removeprefix("www.")
+        site_dir = self.sites_dir / host
+        links = []
+        for page in sorted(site_dir.rglob("*.md")):
+            path = page.relative_to(site_dir).with_suffix("").as_posix()
+            path = "" if path == "index" else path.removesuffix("/index")
+            links.append({"url": f"https://{host}/{path}".rstrip("/"), "title": _title(page.read_text(encoding="utf-8"))})
+        return links
+
+    def document(self, url: str, formats: List) -> Optional[Dict]:
+        page = self._page_path(url)
+        if page is None:
+            return None
+
+        markdown = page.read_text(encoding="utf-8")
+        html_page = page.with_suffix(".html")
+        document = {
+            "metadata": {
+                "sourceURL": url,
+                "url": url,
+                "title": _title(markdown),
+                "statusCode": 200,
+                "cacheState": "miss",
+                "creditsUsed": 1
+            }
+        }
+
+        format_names = [item.get("type") if isinstance(item, dict) else item for item in formats or ["markdown"]]
+        if "markdown" in format_names:
+            document["markdown"] = markdown
+        for name in ("html", "rawHtml"):
+            if name in format_names:
+                document[name] = (
+                    html_page.read_text(encoding="utf-8") if html_page.exists()
+                    else f"<html><body><pre>{html.escape(markdown)}</pre></body></html>"
+                )
+        return document
+
+
+def _title(markdown: str) -> str:
+    for line in markdown.splitlines():
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return ""
+
+
+class MockFirecrawl:
+    """Simulation state shared by all request handler threads"""
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self.sites = FixtureSites(settings.sites_dir)
+        self.jobs: Dict[str, BatchJob] = {}
+        self._random = random.Random(settings.seed)
+        self._lock = threading.Lock()
+
+    def plan_page(self, url: str) -> PagePlan:
+        """Draw a page's latency (log-normal around the median) and outcome"""
+        with self._lock:
+            latency = self.settings.latency_median * self._random.lognormvariate(0, self.settings.latency_sigma)
+            roll = self._random.random()
+
+        if roll < self.settings.timeout_rate:
+            return PagePlan(url, self.settings.timeout_seconds, "timeout")
+        if roll < self.settings.timeout_rate + self.settings.failure_rate:
+            return PagePlan(url, latency, "failed")
+        return PagePlan(url, latency, "ok")
+
+    def document(self, url: str, formats: List, max_age: Optional[int]) -> Optional[Dict]:
+        """Fixture page, marked as a cache hit if the simulated cached copy is within `max_age` (ms)"""
+        document = self.sites.document(url, formats)
+        if document and 0 <= self.settings.cache_age and self.settings.cache_age * 1000 <= (max_age or 0):
+            cached_at = datetime.now(timezone.utc) - timedelta(seconds=self.settings.cache_age)
+            document["metadata"].update(cacheState="hit", cachedAt=cached_at.isoformat().replace("+00:00", "Z"))
+        return document
+
+    def start_batch(self, urls: List[str], formats: List, max_age: Optional[int] = None) -> BatchJob:
+        """Create a batch job; pages are scheduled onto `concurrency` workers in order"""
+        job = BatchJob(id=str(uuid.uuid4()), started_at=time.monotonic(), formats=formats,
+                       pages=[self.plan_page(url) for url in urls], max_age=max_age)
+
+        workers = [0.0] * max(self.settings.concurrency, 1)
+        for page in job.pages:
+            worker = workers.index(min(workers))
+            workers[worker] += page.latency
+            job.finish_times.append(workers[worker])
+
+        with self._lock:
+            self.jobs[job.id] = job
+        return job
+
+    def batch_status(self, job: BatchJob) -> Dict:
+        elapsed = time.monotonic() - job.started_at
+        finished = [page for page, finish in zip(job.pages, job.finish_times) if finish <= elapsed]
+        data = [self.document(page.url, job.formats, job.max_age) for page in finished if page.outcome == "ok"]
+        data = [document for document in data if document]
+
+        return {
+            "success": True,
+            "status": "cancelled" if job.cancelled else "completed" if len(finished) == len(job.pages) else "scraping",
+            "completed": len(finished),
+            "total": len(job.pages),
+            "creditsUsed": len(data),
+            "data": data,
+            "next": None
+        }
+
+    def batch_errors(self, job: BatchJob) -> Dict:
+        elapsed = time.monotonic() - job.started_at
+        errors = [
+            {"id": str(index), "url": page.url, "error": "Simulated scrape failure"}
+            for index, (page, finish) in enumerate(zip(job.pages, job.finish_times))
+            if finish <= elapsed and page.outcome != "ok"
+        ]
+        return {"errors": errors, "robotsBlocked": []}
+
+
+class MockFirecrawlHandler(BaseHTTPRequestHandler):
+    """HTTP handler for the Firecrawl v2 endpoints the pipeline uses"""
+
+    mock: MockFirecrawl = None  # Set by serve()
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _send(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        body = self._body()
+
+        if self.path == "/v2/map":
+            time.sleep(self.mock.settings.map_latency)
+            self._send(200, {"success": True, "links": self.mock.sites.links(body.get("url", ""))})
+
+        elif self.path == "/v2/scrape":
+            url = body.get("url", "")
+            plan = self.mock.plan_page(url)
+            time.sleep(plan.latency)
+            document = self.mock.document(url, body.get("formats"), body.get("maxAge"))
+
+            if plan.outcome == "timeout":
+                self._send(408, {"success": False, "error": "Simulated scrape timeout"})
+            elif plan.outcome == "failed" or document is None:
+                self._send(500, {"success": False, "error": f"Simulated scrape failure for {url}"})
+            else:
+                self._send(200, {"success": True, "data": document})
+
+        elif self.path == "/v2/batch/scrape":
+            job = self.mock.start_batch(body.get("urls", []), body.get("formats"), body.get("maxAge"))
+            self._send(200, {"success": True, "id": job.id, "url": f"/v2/batch/scrape/{job.id}"})
+
+        else:
+            self._send(404, {"success": False, "error": f"Unknown endpoint {self.path}"})
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+
+        if parts[:3] == ["v2", "batch", "scrape"] and len(parts) >= 4:
+            job = self.mock.jobs.get(parts[3])
+            if job is None:
+                self._send(404, {"success": False, "error": "Job not found"})
+            elif len(parts) == 5 and parts[4] == "errors":
+                self._send(200, self.mock.batch_errors(job))
+            else:
+                self._send(200, self.mock.batch_status(job))
+        else:
+            self._send(404, {"success": False, "error": f"Unknown endpoint {self.path}"})
+
+    def do_DELETE(self):
+        parts = self.path.strip("/").split("/")
+        job = self.mock.jobs.get(parts[3]) if parts[:3] == ["v2", "batch", "scrape"] and len(parts) == 4 else None
+
+        if job is None:
+            self._send(404, {"success": False, "error": f"Unknown endpoint {self.path}"})
+        else:
+            job.cancelled = True
+            self._send(200, {"success": True, "status": "cancelled"})
+
+
+def serve(settings: MockSettings, port: int = 3002) -> ThreadingHTTPServer:
+    """
+    Start the mock server on a background thread.
+
+    Args:
+        settings: Simulation settings
+        port: Port to listen on (0 picks a free port)
+
+    Returns:
+        Running server (server.server_address has the bound port; call shutdown() to stop)
+    """
+    handler = type("Handler", (MockFirecrawlHandler,), {"mock": MockFirecrawl(settings)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv: List[str]) -> tuple:
+    settings = MockSettings()
+    port = 3002
+    options = {
+        "--sites": ("sites_dir", Path),
+        "--latency-median": ("latency_median", float),
+        "--latency-sigma": ("latency_sigma", float),
+        "--map-latency": ("map_latency", float),
+        "--failure-rate": ("failure_rate", float),
+        "--timeout-rate": ("timeout_rate", float),
+        "--timeout-seconds": ("timeout_seconds", float),
+        "--concurrency": ("concurrency", int),
+        "--cache-age": ("cache_age", float),
+        "--seed": ("seed", int),
+    }
+
+    for flag, value in zip(argv[::2], argv[1::2]):
+        if flag == "--port":
+            port = int(value)
+        elif flag in options:
+            name, cast = options[flag]
+            setattr(settings, name, cast(value))
+        else:
+            print(__doc__)
+            sys.exit(1)
+
+    return settings, port
+
+
+def main():
+    settings, port = parse_args(sys.argv[1:])
+    server = serve(settings, port)
+    sites = sorted(path.name for path in settings.sites_dir.iterdir() if path.is_dir())
+
+    print(f"🧪 Mock Firecrawl listening on http://localhost:{server.server_address[1]}")
+    print(f"   Sites: {', '.join(sites)}")
+    print(f"   Page latency: median {settings.latency_median}s, sigma {settings.latency_sigma}; "
+          f"failures {settings.failure_rate:.0%}, timeouts {settings.timeout_rate:.0%}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,16 +16,19 @@ FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+# LLM backend: "openai" (default) or "fake" (deterministic offline model for load tests)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai").lower()
+
 # Validate required keys
 if not FIRECRAWL_API_KEY:
     raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
-if not OPENAI_API_KEY:
+if not OPENAI_API_KEY and LLM_BACKEND != "fake":
     raise ValueError("OPENAI_API_KEY not found in environment variables")
 
 # Workflow Settings
 MAX_URLS_TO_SCRAPE = int(os.getenv("MAX_URLS_TO_SCRAPE", "50"))  # 25 vendor + 25 prospect
 BATCH_SCRAPE_TIMEOUT = int(os.getenv("BATCH_SCRAPE_TIMEOUT", "180"))  # 3 minutes
-BATCH_SCRAPE_POLL_INTERVAL = 2  # Poll every 2 seconds
+AGENT_CALL_TIMEOUT = float(os.getenv("AGENT_CALL_TIMEOUT", "120"))  # Seconds before a hung model request is abandoned
 
 # Model Configuration (model-as-string format)
 # Agno 2.2.6+ supports model-as-string format: "provider:model_id"
@@ -39,29 +42,322 @@ BATCH_SCRAPE_POLL_INTERVAL = 2  # Poll every 2 seconds
 
 # Primary models for different task types
 # Using gpt-4o (cheaper than gpt-4.1) and gpt-4o-mini (cheapest)
-DEFAULT_MODEL = OpenAIResponses(id="gpt-4o")            # Complex reasoning, synthesis, creative writing
-FAST_MODEL = OpenAIResponses(id="gpt-4o-mini")          # Simple tasks, pattern matching (fastest/cheapest)
-REASONING_MODEL = OpenAIResponses(id="gpt-4o")          # Analysis, complex reasoning tasks
-EXTRACTION_MODEL = OpenAIResponses(id="gpt-4o-mini")    # Data extraction, entity extraction (cheapest)
+DEFAULT_MODEL = OpenAIResponses(id="gpt-4o", timeout=AGENT_CALL_TIMEOUT)            # Complex reasoning, synthesis, creative writing
+FAST_MODEL = OpenAIResponses(id="gpt-4o-mini", timeout=AGENT_CALL_TIMEOUT)          # Simple tasks, pattern matching (fastest/cheapest)
+REASONING_MODEL = OpenAIResponses(id="gpt-4o", timeout=AGENT_CALL_TIMEOUT)          # Analysis, complex reasoning tasks
+EXTRACTION_MODEL = OpenAIResponses(id="gpt-4o-mini", timeout=AGENT_CALL_TIMEOUT)    # Data extraction, entity extraction (cheapest)
+
+# Fake LLM backend (LLM_BACKEND=fake): same model ids, so rate limits, cascades and
+# pricing behave as in production, but responses are generated locally
+if LLM_BACKEND == "fake":
+    from utils.fake_model import FakeModel
+
+    FAKE_MODEL_SETTINGS = {
+        "latency": float(os.getenv("FAKE_LLM_LATENCY", "2.0")),                # Mean seconds per call
+        "latency_jitter": float(os.getenv("FAKE_LLM_LATENCY_JITTER", "1.0")),  # +/- seconds
+        "output_tokens": int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "0")),        # 0 = estimate from output
+        "list_items": int(os.getenv("FAKE_LLM_LIST_ITEMS", "3")),
+    }
+    DEFAULT_MODEL = FakeModel(id="gpt-4o", **FAKE_MODEL_SETTINGS)
+    FAST_MODEL = FakeModel(id="gpt-4o-mini", **FAKE_MODEL_SETTINGS)
+    REASONING_MODEL = FakeModel(id="gpt-4o", **FAKE_MODEL_SETTINGS)
+    EXTRACTION_MODEL = FakeModel(id="gpt-4o-mini", **FAKE_MODEL_SETTINGS)
 
 # Legacy constant (kept for compatibility)
 OPENAI_MODEL = "gpt-4o"
 
+# Model Pricing (USD per 1M tokens) - used for per-step cost telemetry
+MODEL_PRICING = {
+    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-5.1": {"input": 1.25, "output": 10.00},
+}
+
+# Model Cascades
+# Agents listed here run on the first (fast) model. If the structured output fails the
+# step's validation checks (empty lists, missing fields, too few items) the call is
+# repeated on the next (strong) model. Escalation rates are recorded per agent.
+MODEL_CASCADE_ENABLED = os.getenv("MODEL_CASCADE_ENABLED", "true").lower() == "true"
+AGENT_MODEL_CASCADES = {
+    "Homepage Analyst": [FAST_MODEL, DEFAULT_MODEL],
+    "Company Profile Analyst": [FAST_MODEL, REASONING_MODEL],
+    "Pain Point Analyst": [FAST_MODEL, REASONING_MODEL],
+    "Strategic Buyer Persona Analyst": [FAST_MODEL, REASONING_MODEL],
+    "Sales Playbook Orchestrator": [FAST_MODEL, DEFAULT_MODEL],
+    "Email Sequence Specialist": [FAST_MODEL, DEFAULT_MODEL],
+    "Talk Track Specialist": [FAST_MODEL, DEFAULT_MODEL],
+    "Battle Card Specialist": [FAST_MODEL, DEFAULT_MODEL],
+}
+
+# Agent Retries
+# A failed agent call (API error, timeout, or output that fails the step's validation)
+# is retried on its own with jittered exponential backoff instead of aborting the run.
+# Invalid output is re-asked with a repair note; errors that look size-related are
+# retried with the input shrunk by AGENT_RETRY_INPUT_SHRINK.
+AGENT_MAX_RETRIES = int(os.getenv("AGENT_MAX_RETRIES", "2"))
+AGENT_RETRY_BASE_DELAY = 2.0       # Seconds before the first retry (doubles each retry)
+AGENT_RETRY_MAX_DELAY = 30.0       # Cap on any single backoff delay
+AGENT_RETRY_INPUT_SHRINK = 0.6     # Fraction of the input kept when retrying oversized calls
+
+# Run Deadline
+# Each run gets a time budget, visible to every step (override per run with
+# WorkflowInput.deadline_seconds; 0 = no deadline). As the deadline approaches, steps
+# cut work instead of overrunning, and each cut is recorded in the run telemetry.
+# Thresholds are the seconds left below which each degradation applies.
+RUN_DEADLINE_SECONDS = int(os.getenv("RUN_DEADLINE_SECONDS", "0"))
+DEADLINE_THRESHOLDS = {
+    "reduce_scrape_pages": 90,  # Step 5: scrape only DEADLINE_SCRAPE_PAGE_FRACTION of the selected pages
+    "fast_models": 60,          # All agents: FAST_MODEL only, no cascade escalation
+    "no_retries": 30,           # All agents: failed or rejected calls are not retried
+    "fewer_personas": 45,       # Step 8: emails and talk tracks for DEADLINE_MIN_PERSONAS personas only
+    "skip_battle_cards": 40,    # Step 8: battle cards are skipped
+}
+DEADLINE_SCRAPE_PAGE_FRACTION = 0.5
+DEADLINE_MIN_PERSONAS = 1
+
+# Token Budgets
+# Every agent call gets an input token budget. Scraped pages are packed into it by
+# page priority, and any prompt that is still too large is truncated before sending.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-5.1": 400000,
+}
+DEFAULT_CONTEXT_WINDOW = 128000
+OUTPUT_TOKEN_RESERVE = 16000       # Room for structured output (max output tokens for gpt-4o)
+PROMPT_OVERHEAD_TOKENS = 1000      # Instructions + task text wrapped around packed page content
+MIN_TRUNCATED_PAGE_TOKENS = 500    # Below this a page is dropped rather than truncated
+MAX_INPUT_TOKENS_PER_CALL = int(os.getenv("MAX_INPUT_TOKENS_PER_CALL", "60000"))  # Caps latency per call
+# With RATE_LIMIT_ENABLED, budgets are further capped at the model's TPM (MODEL_RATE_LIMITS)
+# minus RATE_LIMIT_OUTPUT_TOKEN_ESTIMATE, so a single call fits in its rate limit bucket.
+
+# Per-agent input budgets (override the model-derived budget above)
+AGENT_INPUT_TOKEN_BUDGETS = {
+    "Homepage Analyst": 15000,
+    "Strategic URL Selector": 20000,
+}
+
+# Metrics
+# Prometheus metrics served by serve.py at /metrics (requires prometheus-client)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Rate Limiting
+# All agent calls reserve estimated tokens from a per-model token bucket before sending.
+# Defaults match OpenAI Tier 1 limits - raise them to match your account's tier.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+MODEL_RATE_LIMITS = {
+    "gpt-4o": {"rpm": 500, "tpm": 30000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "gpt-5.1": {"rpm": 500, "tpm": 500000},
+}
+DEFAULT_RATE_LIMIT = {"rpm": 500, "tpm": 30000}
+RATE_LIMIT_OUTPUT_TOKEN_ESTIMATE = 2000  # Reserved per call for output, corrected after the call
+RATE_LIMIT_DB_URL = os.getenv("RATE_LIMIT_DB_URL")  # postgresql://... shares buckets across processes
+
+# Firecrawl API base URL (point at benchmarks/mock_firecrawl_server.py for offline load tests)
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+
 # Scraping Configuration
 SCRAPE_WAIT_TIME = 2000  # Wait 2 seconds for page load (in milliseconds)
-DEFAULT_SCRAPE_FORMATS = ['markdown', 'html']
-BATCH_SCRAPE_FORMAT = ['markdown']  # Only markdown for batch to save tokens
+
+# Scrape formats each stage consumes - scrapes request only these. HTML roughly
+# doubles the payload, so only the prospect homepage requests it (its structured data
+# is parsed in Step 2 and the HTML dropped); other stages fetch it on demand
+# (utils/firecrawl_helpers.fetch_page_html).
+STAGE_SCRAPE_FORMATS = {
+    "homepage": ['markdown'],                       # Step 2 -> Homepage Analyst
+    "prospect_homepage": ['markdown', 'rawHtml'],   # Step 2 -> structured data prefill (rawHtml keeps <script> tags)
+    "batch": ['markdown'],                          # Step 5 -> vendor extractors and prospect analysts
+}
+DEFAULT_SCRAPE_FORMATS = STAGE_SCRAPE_FORMATS["homepage"]
+BATCH_SCRAPE_FORMAT = STAGE_SCRAPE_FORMATS["batch"]
+
+# Batch Scrape Polling
+# Job status is polled quickly at first and less often while the job runs (the interval
+# grows by BATCH_POLL_BACKOFF per poll, but never past the job's projected finish time).
+# Once BATCH_EARLY_EXIT_FRACTION of the pages are done, stragglers get
+# BATCH_STRAGGLER_CUTOFF more seconds; then the job is cancelled and the pages finished
+# so far are used. Each job's progress timeline is recorded in the step telemetry.
+BATCH_POLL_INITIAL_INTERVAL = 0.25  # Seconds
+BATCH_POLL_MAX_INTERVAL = 5.0       # Seconds
+BATCH_POLL_BACKOFF = 1.5
+BATCH_EARLY_EXIT_FRACTION = float(os.getenv("BATCH_EARLY_EXIT_FRACTION", "0.9"))  # 1.0 = always wait for every page
+BATCH_STRAGGLER_CUTOFF = float(os.getenv("BATCH_STRAGGLER_CUTOFF", "15"))        # Seconds
+
+# Firecrawl Circuit Breaker
+# When CIRCUIT_FAILURE_RATE of the Firecrawl calls in the last CIRCUIT_WINDOW_SECONDS
+# failed or were slow (at least CIRCUIT_MIN_CALLS calls), calls are rejected without
+# reaching Firecrawl for CIRCUIT_OPEN_SECONDS, then one trial call decides whether to
+# close again (see utils/circuit_breaker.py). Rejected and failed calls fall back to the
+# last successfully scraped copy of each page (and any cached URL map), when there is one.
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_WINDOW_SECONDS = 60
+CIRCUIT_MIN_CALLS = 5
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_OPEN_SECONDS = int(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+# Slower calls count as failures; a batch counts only once it reaches its own timeout
+CIRCUIT_SLOW_CALL_SECONDS = {"map": 30, "scrape": 30, "batch_scrape": BATCH_SCRAPE_TIMEOUT}
+FIRECRAWL_FALLBACK_CACHE = os.getenv("FIRECRAWL_FALLBACK_CACHE", "true").lower() == "true"  # Keep last good copies
+# Last good copies are written in the background, only when a page changed, and pruned to
+# the newest FALLBACK_CACHE_MAX_PAGES copies no older than FALLBACK_CACHE_MAX_AGE seconds.
+FALLBACK_CACHE_MAX_AGE = int(os.getenv("FALLBACK_CACHE_MAX_AGE", "2592000"))  # 30 days
+FALLBACK_CACHE_MAX_PAGES = int(os.getenv("FALLBACK_CACHE_MAX_PAGES", "5000"))
+FALLBACK_CACHE_REFRESH_SECONDS = 86400  # Unchanged pages are rewritten at most this often
+FALLBACK_CACHE_PRUNE_EVERY = 200  # Page writes between prunes
 
 # Scraping Performance - Use cached data for 500% faster scraping
 SCRAPE_MAX_AGE = 172800000  # 48 hours in milliseconds (2 days)
                             # Firecrawl will use cached data if available
                             # Set to 0 to force fresh scrapes
 
+# Markdown Minification (applied to scraped pages before they reach the agents)
+MINIFY_MARKDOWN = os.getenv("MINIFY_MARKDOWN", "true").lower() == "true"
+MINIFY_KEEP_IMAGE_ALT = True        # Customer extractor uses logo alt text
+MINIFY_MAX_LINK_URL_LENGTH = 120    # Longer link targets are dropped (text is kept)
+# Minified pages are cached in RESULT_CACHE_DIR/minified/ by content hash (pruned like the
+# fallback page cache), so unchanged pages aren't re-minified after a restart or by other processes
+MINIFY_CACHE = os.getenv("MINIFY_CACHE", "true").lower() == "true"
+
 # URL Mapping Configuration
 MAX_URLS_TO_MAP = 5000  # Maximum URLs to discover per domain
+MAP_CACHE_TTL = int(os.getenv("MAP_CACHE_TTL", "86400"))  # Seconds a domain's URL map is reused (0 = always map)
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "output/cache")  # Local cache (see utils/result_cache.py)
+
+# Stale-While-Revalidate
+# Cached URL maps (MAP_CACHE_TTL) and Firecrawl cached pages (SCRAPE_MAX_AGE) up to
+# SWR_GRACE_SECONDS past their TTL are used right away while a refresh runs in the
+# background (see utils/revalidation.py); older ones are refetched before use. Step
+# outputs and run metadata report the freshness of what was served.
+STALE_WHILE_REVALIDATE = os.getenv("STALE_WHILE_REVALIDATE", "true").lower() == "true"
+SWR_GRACE_SECONDS = int(os.getenv("SWR_GRACE_SECONDS", "43200"))  # 12 hours
+SWR_REFRESH_WORKERS = 2  # Background refresh threads
 
 # URL Prioritization Configuration
 MAX_URLS_FOR_PRIORITIZATION = 200  # Maximum URLs to send to prioritization agent
+# Vendor and prospect URLs are prioritized by two concurrent calls, and each company's
+# selection is cached in RESULT_CACHE_DIR/url_selection/ (keyed by domain, URL list and
+# model), so a vendor's selection is reused across its prospects.
+URL_SELECTION_CACHE_TTL = int(os.getenv("URL_SELECTION_CACHE_TTL", "86400"))  # Seconds (0 = always prioritize)
+
+# Speculative Scraping
+# While the URL prioritizer runs, up to SPECULATIVE_SCRAPE_MAX_URLS top-level section pages
+# per company that it almost always selects (/about, /customers, /pricing, ...) are already
+# batch scraped; Step 5 only scrapes the remaining selections (see utils/speculative_scrape.py).
+SPECULATIVE_SCRAPE = os.getenv("SPECULATIVE_SCRAPE", "true").lower() == "true"
+SPECULATIVE_SCRAPE_MAX_URLS = 4  # Per company
+
+# Vendor Extraction
+# A regex/lexicon pre-pass (utils/evidence_candidates.py) finds proof point and reference
+# customer candidates across all vendor pages; their extractors validate and enrich the
+# candidates instead of searching every page, so they get a smaller page context.
+EXTRACTION_MODE = "full"               # "full": page context fills each agent's input budget; "compact": capped;
+                                       # "deterministic": compact, and proof points/customers come from the pre-pass alone
+COMPACT_PAGE_CONTEXT_TOKENS = 12000    # Page context cap per agent call in "compact"/"deterministic" mode
+CANDIDATE_PAGE_CONTEXT_TOKENS = 16000  # Page context cap for extractors given pre-pass candidates
+
+# Incremental Extraction
+# Vendor page hashes and extracted elements are stored per domain after each run. A rerun
+# of the same vendor (same profile) only re-extracts from pages that changed and carries
+# the other elements over (see utils/incremental_extraction.py).
+INCREMENTAL_EXTRACTION = os.getenv("INCREMENTAL_EXTRACTION", "true").lower() == "true"
+EXTRACTION_STATE_DIR = os.getenv("EXTRACTION_STATE_DIR", "output/extraction_state")
+
+# Cache Warmer
+# Keeps watchlist domains warm between runs (python warm_cache.py, or in-process in serve.py
+# with WARM_IN_PROCESS): URL maps, Firecrawl's page cache and vendor intel packs (Step 6
+# elements, re-extracted from changed pages only) are refreshed once they enter the last
+# WARM_REFRESH_MARGIN of their TTL. Work only starts in the off-peak hours and stops when the
+# hour's Firecrawl page budget is spent; domains left over are warmed in the next window.
+WARM_WATCHLIST = [d.strip() for d in os.getenv("WARM_WATCHLIST", "").split(",") if d.strip()]
+WARM_WATCHLIST_FILE = os.getenv("WARM_WATCHLIST_FILE", "")  # One domain per line, added to WARM_WATCHLIST
+WARM_OFF_PEAK_HOURS = os.getenv("WARM_OFF_PEAK_HOURS", "1-6")  # Local hours, e.g. "22-24,0-6"
+WARM_REFRESH_MARGIN = float(os.getenv("WARM_REFRESH_MARGIN", "0.2"))  # Fraction of the TTL
+WARM_PAGES_PER_HOUR = int(os.getenv("WARM_PAGES_PER_HOUR", "200"))  # Firecrawl pages (a map counts as one)
+WARM_INTEL_PACKS = os.getenv("WARM_INTEL_PACKS", "true").lower() == "true"  # Re-extract changed pages (LLM calls)
+WARM_IN_PROCESS = os.getenv("WARM_IN_PROCESS", "false").lower() == "true"  # Background thread in serve.py
+WARM_CHECK_INTERVAL = 600  # Seconds between in-process warm passes
+
+# Company Profile Prefill
+# Company facts found in the prospect homepage's structured data (JSON-LD, OpenGraph,
+# meta tags) prefill the company profile, and the analyst only fills the rest. When
+# every field in STRUCTURED_DATA_COMPLETE_FIELDS is known, the analyst isn't called.
+STRUCTURED_DATA_PREFILL = os.getenv("STRUCTURED_DATA_PREFILL", "true").lower() == "true"
+STRUCTURED_DATA_COMPLETE_FIELDS = ["company_name", "what_they_do", "industry", "company_size"]
+
+# Playbook Generation
+PLAYBOOK_PERSONA_COUNT = 3      # Priority personas that get email sequences and talk tracks
+PERSONA_MATCH_THRESHOLD = 0.7   # Minimum title match score (0-1) for a priority persona (utils/persona_index.py)
+
+# Execution Profiles
+# Named quality/latency trade-offs, selectable per run (WorkflowInput.profile or
+# --profile on the CLI), so interactive requests and overnight batch jobs can share
+# one server. Settings a profile leaves out use the module-level constants above:
+#   max_urls_to_map, max_urls_for_prioritization, max_urls_to_scrape: page limits
+#   scrape_wait_time: homepage scrape wait (ms)
+#   models: agent name -> model (replaces the agent's own model and its cascade)
+#   extraction_mode: "full", "compact" or "deterministic" (see Vendor Extraction)
+#   persona_count: personas that get email sequences and talk tracks
+#   deadline_seconds: run deadline when the request doesn't set one (see Run Deadline)
+DEFAULT_PROFILE = os.getenv("DEFAULT_PROFILE", "balanced")
+EXECUTION_PROFILES = {
+    # Interactive: fewest pages, fast model everywhere, finish within ~2 minutes
+    "fast": {
+        "max_urls_to_map": 500,
+        "max_urls_for_prioritization": 60,
+        "max_urls_to_scrape": 16,
+        "scrape_wait_time": 0,
+        "models": {
+            name: FAST_MODEL for name in [
+                "Homepage Analyst",
+                "Company Profile Analyst",
+                "Pain Point Analyst",
+                "Strategic Buyer Persona Analyst",
+                "Sales Playbook Orchestrator",
+                "Email Sequence Specialist",
+                "Talk Track Specialist",
+                "Battle Card Specialist",
+            ]
+        },
+        "extraction_mode": "deterministic",
+        "persona_count": 1,
+        "deadline_seconds": 120,
+    },
+    # The defaults above: model cascades, 50 pages, top 3 personas
+    "balanced": {},
+    # Overnight batch: more pages, strong models without cascades, more personas
+    "thorough": {
+        "max_urls_for_prioritization": 400,
+        "max_urls_to_scrape": 80,
+        "scrape_wait_time": 4000,
+        "models": {
+            "Homepage Analyst": DEFAULT_MODEL,
+            "Offerings Extractor": DEFAULT_MODEL,
+            "Case Study Extractor": DEFAULT_MODEL,
+            "Proof Points Extractor": DEFAULT_MODEL,
+            "Value Proposition Extractor": DEFAULT_MODEL,
+            "Reference Customer Extractor": DEFAULT_MODEL,
+            "Use Case Extractor": DEFAULT_MODEL,
+            "Vendor ICP Persona Extractor": DEFAULT_MODEL,
+            "Competitive Differentiator Extractor": DEFAULT_MODEL,
+            "Company Profile Analyst": REASONING_MODEL,
+            "Pain Point Analyst": REASONING_MODEL,
+            "Strategic Buyer Persona Analyst": REASONING_MODEL,
+            "Sales Playbook Orchestrator": DEFAULT_MODEL,
+            "Email Sequence Specialist": DEFAULT_MODEL,
+            "Talk Track Specialist": DEFAULT_MODEL,
+            "Battle Card Specialist": DEFAULT_MODEL,
+        },
+        "persona_count": 5,
+    },
+}
+
+# Record/Replay (offline runs and benchmarks)
+# "record": call Firecrawl and OpenAI as usual and save every response to REPLAY_DIR
+# "replay": serve saved responses instead of calling the services (no credits used)
+# Replayed calls sleep for their recorded latency x REPLAY_LATENCY_SCALE (0 = instant).
+REPLAY_MODE = os.getenv("REPLAY_MODE", "off").lower()  # off | record | replay
+REPLAY_DIR = os.getenv("REPLAY_DIR", "benchmarks/fixtures/replay")
+REPLAY_LATENCY_SCALE = float(os.getenv("REPLAY_LATENCY_SCALE", "1.0"))
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
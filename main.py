@@ -3,12 +3,14 @@ Playbook AI - Main Entry Point
 CLI for running the complete sales intelligence pipeline (all 4 phases).
 
 Usage:
-    python main.py <vendor_domain> <prospect_domain>
+    python main.py <vendor_domain> <prospect_domain> [--profile NAME] [--deadline SECONDS]
 
 Examples (all formats accepted):
     python main.py gong.io sendoso.com
     python main.py https://gong.io https://sendoso.com
     python main.py www.gong.io www.sendoso.com
+    python main.py gong.io sendoso.com --profile fast   # fast | balanced | thorough
+    python main.py gong.io sendoso.com --deadline 120   # Degrade gracefully to finish in ~2 min
 
 All domain formats are automatically normalized to https://
 
@@ -22,6 +24,12 @@ import time
 from datetime import datetime, timedelta
 from agno.workflow import Workflow, Step, Parallel
 from models.workflow_input import WorkflowInput
+from utils.telemetry import collect_step_contents, collect_run_telemetry
+from utils.rate_limiter import get_rate_limiter_stats
+from utils.circuit_breaker import get_circuit_breaker_stats
+from utils.revalidation import get_revalidation_stats
+from utils.agent_runner import get_escalation_stats, get_retry_stats
+from utils.profiles import describe_profile, resolve_profile_name
 
 # Import Phase 1 step executors
 from steps.step1_domain_validation import validate_vendor_domain, validate_prospect_domain
@@ -39,7 +47,8 @@ from steps.step6_vendor_extraction import (
     extract_customers,
     extract_use_cases,
     extract_personas,
-    extract_differentiators
+    extract_differentiators,
+    index_vendor_entities
 )
 
 # Import Phase 3 step executors (Step 7)
@@ -67,18 +76,14 @@ workflow = Workflow(
     steps=[
         # Phase 1: Intelligence Gathering (Steps 1-5)
 
-        # Step 1: Parallel domain validation
+        # Steps 1-2: Domain mapping and homepage scraping, all four in parallel
+        # (homepage scrapes only need the input domains, so they overlap the map calls)
         Parallel(
             Step(name="validate_vendor", executor=validate_vendor_domain),
             Step(name="validate_prospect", executor=validate_prospect_domain),
-            name="parallel_validation"
-        ),
-
-        # Step 2: Parallel homepage scraping
-        Parallel(
             Step(name="scrape_vendor_home", executor=scrape_vendor_homepage),
             Step(name="scrape_prospect_home", executor=scrape_prospect_homepage),
-            name="parallel_homepage_scraping"
+            name="parallel_discovery"
         ),
 
         # Step 3: Parallel homepage analysis
@@ -109,6 +114,9 @@ workflow = Workflow(
             name="vendor_element_extraction"
         ),
 
+        # Step 6b: Merge customers and personas found by several extractors
+        Step(name="index_vendor_entities", executor=index_vendor_entities),
+
         # Phase 3: Prospect Analysis (Step 7)
 
         # Step 7a: Prospect context analysis (2 parallel analysts)
@@ -143,16 +151,26 @@ workflow = Workflow(
 def main():
     """Main entry point for complete sales intelligence pipeline."""
 
-    # Parse command line arguments
-    if len(sys.argv) < 3:
+    # Parse command line arguments (optional flags: --profile NAME, --deadline SECONDS)
+    args = sys.argv[1:]
+    options = {}
+    for flag in ("--profile", "--deadline"):
+        if flag in args:
+            index = args.index(flag)
+            options[flag] = args[index + 1] if index + 1 < len(args) else ""
+            del args[index:index + 2]
+
+    if len(args) < 2:
         print("=" * 80)
         print("PLAYBOOK AI - SALES INTELLIGENCE PIPELINE")
         print("=" * 80)
-        print("\nUsage: python main.py <vendor_domain> <prospect_domain>")
+        print("\nUsage: python main.py <vendor_domain> <prospect_domain> [--profile fast|balanced|thorough] [--deadline SECONDS]")
         print("\nExamples (all formats work):")
         print("  python main.py gong.io sendoso.com")
         print("  python main.py https://gong.io https://sendoso.com")
         print("  python main.py www.gong.io www.sendoso.com")
+        print("  python main.py gong.io sendoso.com --profile fast")
+        print("  python main.py gong.io sendoso.com --deadline 120")
         print("\nThis runs all 4 phases:")
         print("  Phase 1: Intelligence Gathering (Steps 1-5)")
         print("  Phase 2: Vendor GTM Extraction (Step 6)")
@@ -165,8 +183,10 @@ def main():
     # This accepts flexible inputs: sendoso.com, www.sendoso.com, https://sendoso.com
     try:
         validated_input = WorkflowInput(
-            vendor_domain=sys.argv[1],
-            prospect_domain=sys.argv[2]
+            vendor_domain=args[0],
+            prospect_domain=args[1],
+            profile=options.get("--profile"),
+            deadline_seconds=options.get("--deadline")
         )
         vendor_domain = validated_input.vendor_domain
         prospect_domain = validated_input.prospect_domain
@@ -175,7 +195,7 @@ def main():
         print("❌ INVALID DOMAIN INPUT")
         print("=" * 80)
         print(f"\nError: {str(e)}")
-        print("\nPlease provide valid domain names.")
+        print("\nPlease provide valid domain names (and a valid --profile / --deadline, if given).")
         print("\nExamples:")
         print("  python main.py gong.io sendoso.com")
         print("  python main.py https://gong.io https://sendoso.com")
@@ -187,7 +207,8 @@ def main():
     print("PLAYBOOK AI - SALES INTELLIGENCE PIPELINE")
     print("=" * 80)
     print(f"\n📊 Vendor:   {vendor_domain}")
-    print(f"🎯 Prospect: {prospect_domain}\n")
+    print(f"🎯 Prospect: {prospect_domain}")
+    print(f"⚙️  Profile:  {resolve_profile_name(validated_input.profile)}\n")
     print("=" * 80)
     print("\n🚀 Starting Complete Workflow (All 4 Phases)...")
     print("   Phase 1: Intelligence Gathering")
@@ -199,7 +220,9 @@ def main():
     # Prepare workflow input
     workflow_input = {
         "vendor_domain": vendor_domain,
-        "prospect_domain": prospect_domain
+        "prospect_domain": prospect_domain,
+        "profile": validated_input.profile,
+        "deadline_seconds": validated_input.deadline_seconds
     }
 
     try:
@@ -258,6 +281,31 @@ def main():
         os.makedirs(vendor_dir, exist_ok=True)
         os.makedirs(prospect_dir, exist_ok=True)
 
+        # Telemetry recorded by every instrumented step (removed from research files)
+        all_step_contents = collect_step_contents(result.step_results)
+        run_telemetry = collect_run_telemetry(all_step_contents)
+        telemetry_totals = run_telemetry["totals"]
+        # Incremental extraction summaries per Step 6 extractor (also removed from research files)
+        incremental_extraction = {}
+        for step_name, content in all_step_contents.items():
+            if isinstance(content, dict):
+                content.pop("telemetry", None)
+                if "incremental" in content:
+                    incremental_extraction[step_name] = content.pop("incremental")
+
+        # Freshness of the cached maps and pages the run used (stale ones are refreshing in the background)
+        discovery = {}
+        for step_name in ("validate_vendor", "validate_prospect", "scrape_vendor_home", "scrape_prospect_home"):
+            if isinstance(all_step_contents.get(step_name), dict):
+                discovery.update(all_step_contents[step_name])
+        freshness = {
+            key: discovery.get(key) for key in (
+                "vendor_map_freshness", "prospect_map_freshness", "vendor_homepage_freshness", "prospect_homepage_freshness"
+            )
+        }
+        freshness["stale_pages"] = telemetry_totals["stale_pages"]
+        freshness["background_refreshes"] = get_revalidation_stats()
+
         # === EXTRACT ALL STEP CONTENT ===
 
         # Step 6: Vendor extraction (8 extractors)
@@ -265,10 +313,10 @@ def main():
         case_studies = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_case_studies") or {}
         proof_points = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_proof_points") or {}
         value_props = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_value_props") or {}
-        customers = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_customers") or {}
         use_cases = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_use_cases") or {}
         personas = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_personas") or {}
         differentiators = get_parallel_substep_content(result.step_results, "vendor_element_extraction", "extract_differentiators") or {}
+        entity_index = get_step_content_by_name(result.step_results, "index_vendor_entities") or {}
 
         # Step 7: Prospect analysis (3 analysts)
         company_profile = get_parallel_substep_content(result.step_results, "prospect_context_analysis", "analyze_company") or {}
@@ -291,10 +339,11 @@ def main():
             json.dump(offerings, f, indent=2)
 
         # customer_evidence.json - merge: case_studies + proof_points + customers
+        # (customers deduplicated across case studies, testimonials and reference customers by Step 6b)
         customer_evidence = {
             "case_studies": case_studies.get("case_studies", []) if isinstance(case_studies, dict) else [],
             "proof_points": proof_points.get("proof_points", []) if isinstance(proof_points, dict) else [],
-            "customers": customers.get("customers", []) if isinstance(customers, dict) else []
+            "customers": entity_index.get("customers", []) if isinstance(entity_index, dict) else []
         }
         with open(f"{vendor_dir}/customer_evidence.json", "w") as f:
             json.dump(customer_evidence, f, indent=2)
@@ -349,6 +398,10 @@ def main():
             playbook["talk_tracks"] = sales_playbook.get("talk_tracks", [])
             playbook["battle_cards"] = sales_playbook.get("battle_cards", [])
 
+        # Work cut to meet the run deadline, so readers know what is missing and why
+        if run_telemetry["degradations"]:
+            playbook["degradations"] = run_telemetry["degradations"]
+
         with open(f"{run_dir}/playbook.json", "w") as f:
             json.dump(playbook, f, indent=2)
 
@@ -362,9 +415,27 @@ def main():
             "workflow_name": workflow.name,
             "workflow_version": "2.0.0",
             "status": "completed",
+            "profile": describe_profile(validated_input.profile),
+            "token_usage": {
+                "input_tokens": telemetry_totals["input_tokens"],
+                "output_tokens": telemetry_totals["output_tokens"],
+                "total_tokens": telemetry_totals["total_tokens"],
+                "cost_usd": telemetry_totals["cost_usd"]
+            },
+            "telemetry_totals": telemetry_totals,
+            "steps": run_telemetry["steps"],
+            "degradations": run_telemetry["degradations"],
+            "incremental_extraction": incremental_extraction,
+            "freshness": freshness,
+            "rate_limits": get_rate_limiter_stats(),
+            "circuit_breakers": get_circuit_breaker_stats(),
+            "model_cascades": get_escalation_stats(),
+            "agent_retries": get_retry_stats(),
             "inputs": {
                 "vendor_domain": vendor_domain,
-                "prospect_domain": prospect_domain
+                "prospect_domain": prospect_domain,
+                "profile": validated_input.profile,
+                "deadline_seconds": validated_input.deadline_seconds
             },
             "outputs": {
                 "vendor_name": playbook.get("vendor_name", ""),
@@ -407,6 +478,13 @@ def main():
         print(f"   • research/prospect/ - Raw prospect analysis (1 file)")
 
         print(f"\n⏱️  Duration: {duration_seconds:.1f} seconds")
+        print(f"🔢 Tokens: {telemetry_totals['input_tokens']:,} input + {telemetry_totals['output_tokens']:,} output (~${telemetry_totals['cost_usd']:.2f})")
+
+        # Slowest steps first - where to look when a run is slow
+        slowest_steps = sorted(run_telemetry["steps"].items(), key=lambda item: item[1]["duration_seconds"], reverse=True)
+        print(f"🐢 Slowest steps: " + ", ".join(f"{name} {step['duration_seconds']:.1f}s" for name, step in slowest_steps[:3]))
+        if run_telemetry["degradations"]:
+            print(f"⏰ Deadline degradations: " + "; ".join(item["detail"] for item in run_telemetry["degradations"]))
 
         print(f"\n📊 Playbook Stats:")
         print(f"   • Vendor: {playbook.get('vendor_name', 'Unknown')}")
@@ -5,7 +5,9 @@ Supports AgentOS API integration with structured input schemas.
 """
 
 from pydantic import BaseModel, Field, field_validator
+from typing import Optional
 from utils.workflow_helpers import normalize_domain
+from utils.profiles import resolve_profile_name
 
 
 class WorkflowInput(BaseModel):
@@ -32,6 +34,15 @@ class WorkflowInput(BaseModel):
     prospect_domain: str = Field(
         description="Prospect's website domain (e.g., 'outreach.io' or 'https://outreach.io')"
     )
+    profile: Optional[str] = Field(
+        default=None,
+        description="Execution profile: 'fast', 'balanced' or 'thorough' (default: DEFAULT_PROFILE)"
+    )
+    deadline_seconds: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Run time budget in seconds; steps cut work as it runs out (default: RUN_DEADLINE_SECONDS, 0 = no deadline)"
+    )
 
     @field_validator('vendor_domain', 'prospect_domain', mode='before')
     @classmethod
@@ -41,6 +52,12 @@ class WorkflowInput(BaseModel):
             raise ValueError(f"{info.field_name} is required")
         return normalize_domain(v)
 
+    @field_validator('profile')
+    @classmethod
+    def validate_profile(cls, v):
+        """Reject profiles not defined in config.EXECUTION_PROFILES"""
+        return resolve_profile_name(v) if v else None
+
 
 # Example usage:
 # from models.workflow_input import WorkflowInput
@@ -48,7 +65,9 @@ class WorkflowInput(BaseModel):
 # # User can provide flexible input
 # user_input = WorkflowInput(
 #     vendor_domain="sendoso.com",           # Auto-normalized to https://sendoso.com
-#     prospect_domain="www.outreach.io"      # Auto-normalized to https://outreach.io
+#     prospect_domain="www.outreach.io",     # Auto-normalized to https://outreach.io
+#     profile="fast",                        # Optional: fast | balanced | thorough
+#     deadline_seconds=120                   # Optional: degrade gracefully to finish in ~2 minutes
 # )
 #
 # # Use with workflow (Pydantic v2 model_dump() replaces custom to_workflow_dict())
@@ -9,6 +9,7 @@ API Endpoints:
     POST /workflows/playbook-ai-sales-intelligence-pipeline/runs
     GET  /docs (OpenAPI documentation)
     GET  /health (Health check)
+    GET  /metrics (Prometheus metrics)
     GET  /config (AgentOS configuration)
 
 Example API Call:
@@ -21,10 +22,20 @@ Example API Call:
 
 Control Plane UI:
     http://localhost:8080
+
+Cache Warming:
+    WARM_IN_PROCESS=true WARM_WATCHLIST=gong.io,sendoso.com python serve.py
+    (or run python warm_cache.py from a scheduler - see warm_cache.py)
 """
 
 from agno.os import AgentOS
+from fastapi import Request
+from fastapi.responses import PlainTextResponse, Response
 from main import workflow
+from utils.circuit_breaker import get_circuit_breaker_stats
+from utils.metrics import render_metrics, track_run
+from warm_cache import start_background_warmer
+import config
 import os
 
 # Initialize AgentOS with the complete sales intelligence workflow
@@ -37,16 +48,42 @@ agent_os = AgentOS(
 # Get the FastAPI app
 app = agent_os.get_app()
 
+# Keep watchlist domains warm from this process. Only the server process starts
+# the warmer, not the reloader that runs this file as __main__.
+if config.WARM_IN_PROCESS and __name__ != "__main__":
+    start_background_warmer()
+
 # Add custom health check endpoint
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring"""
+    """Health check endpoint for monitoring ("degraded" while a circuit breaker is not closed)"""
+    circuits = get_circuit_breaker_stats()
     return {
-        "status": "healthy",
+        "status": "healthy" if all(stats["state"] == "closed" for stats in circuits.values()) else "degraded",
         "service": "playbook-ai-api",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "circuits": circuits
     }
 
+# Count workflow runs in flight (POST .../runs). Streaming runs are counted
+# until the response starts, so the gauge is a lower bound for them.
+@app.middleware("http")
+async def track_in_flight_runs(request: Request, call_next):
+    if request.method == "POST" and request.url.path.endswith("/runs"):
+        with track_run():
+            return await call_next(request)
+    return await call_next(request)
+
+# Prometheus metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: step/agent latency, Firecrawl, tokens, cache, retries, failures, in-flight runs, circuit state"""
+    try:
+        payload, content_type = render_metrics()
+    except ImportError as e:
+        return PlainTextResponse(str(e), status_code=503)
+    return Response(content=payload, media_type=content_type)
+
 if __name__ == "__main__":
     print("\n" + "=" * 80)
     print("PLAYBOOK AI - SALES INTELLIGENCE API SERVER")
@@ -60,6 +97,8 @@ if __name__ == "__main__":
     print(f"   http://localhost:8080")
     print(f"\n💊 Health Check:")
     print(f"   http://localhost:8080/health")
+    print(f"\n📈 Metrics:")
+    print(f"   http://localhost:8080/metrics")
     print("\n" + "=" * 80 + "\n")
 
     agent_os.serve(app="serve:app", reload=True, port=8080)
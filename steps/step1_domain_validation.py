@@ -7,8 +7,10 @@ Runs in parallel for both domains.
 from agno.workflow.types import StepInput, StepOutput
 from utils.firecrawl_helpers import map_website
 from utils.workflow_helpers import validate_single_domain, create_error_response, create_success_response
+from utils.telemetry import instrument_step
 
 
+@instrument_step
 def validate_vendor_domain(step_input: StepInput) -> StepOutput:
     """
     Validate vendor domain and map all URLs.
@@ -35,7 +37,7 @@ def validate_vendor_domain(step_input: StepInput) -> StepOutput:
 
         # Map the website
         print(f"🔍 Mapping vendor domain: {vendor_domain}")
-        result = map_website(vendor_domain)  # Uses config.MAX_URLS_TO_MAP (5000)
+        result = map_website(vendor_domain)  # Uses the run profile's max_urls_to_map
 
         if not result["success"]:
             error_msg = f"Failed to map vendor domain: {result.get('error', 'Unknown error')}"
@@ -46,13 +48,15 @@ def validate_vendor_domain(step_input: StepInput) -> StepOutput:
         return create_success_response({
             "vendor_domain": vendor_domain,
             "vendor_urls": result["urls"],
-            "vendor_total_urls": result["total_urls"]
+            "vendor_total_urls": result["total_urls"],
+            "vendor_map_freshness": {"freshness": result.get("freshness"), "age_seconds": result.get("age_seconds")}
         })
 
     except Exception as e:
         return create_error_response(f"Vendor domain validation failed: {str(e)}")
 
 
+@instrument_step
 def validate_prospect_domain(step_input: StepInput) -> StepOutput:
     """
     Validate prospect domain and map all URLs.
@@ -79,7 +83,7 @@ def validate_prospect_domain(step_input: StepInput) -> StepOutput:
 
         # Map the website
         print(f"🔍 Mapping prospect domain: {prospect_domain}")
-        result = map_website(prospect_domain)  # Uses config.MAX_URLS_TO_MAP (5000)
+        result = map_website(prospect_domain)  # Uses the run profile's max_urls_to_map
 
         if not result["success"]:
             error_msg = f"Failed to map prospect domain: {result.get('error', 'Unknown error')}"
@@ -90,7 +94,8 @@ def validate_prospect_domain(step_input: StepInput) -> StepOutput:
         return create_success_response({
             "prospect_domain": prospect_domain,
             "prospect_urls": result["urls"],
-            "prospect_total_urls": result["total_urls"]
+            "prospect_total_urls": result["total_urls"],
+            "prospect_map_freshness": {"freshness": result.get("freshness"), "age_seconds": result.get("age_seconds")}
         })
 
     except Exception as e:
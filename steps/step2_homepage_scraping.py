@@ -1,103 +1,109 @@
 """
 Step 2: Homepage Scraping
 Scrapes vendor and prospect homepages.
-Runs in parallel for both homepages.
+The prospect homepage's structured data (JSON-LD, OpenGraph, meta tags) is parsed
+here, so Step 7 can prefill the company profile without carrying HTML forward.
+Runs in the same parallel block as Step 1 domain mapping: the scrapes only need
+the domains from the workflow input, so both network waits overlap.
 """
 
 from agno.workflow.types import StepInput, StepOutput
 from utils.firecrawl_helpers import scrape_url
-from utils.workflow_helpers import get_parallel_step_content, create_error_response, create_success_response
+from utils.structured_data import extract_structured_data
+from utils.workflow_helpers import validate_single_domain, create_error_response, create_success_response
+from utils.telemetry import instrument_step
+import config
 
 
+@instrument_step
 def scrape_vendor_homepage(step_input: StepInput) -> StepOutput:
     """
     Scrape vendor homepage.
 
     Args:
-        step_input: StepInput with access to Step 1 validate_vendor output
+        step_input: StepInput containing vendor_domain in input
 
     Returns:
-        StepOutput with vendor homepage content (markdown, html, metadata)
+        StepOutput with vendor homepage content (markdown, metadata)
     """
     try:
-        # Get vendor validation data from parallel block (automatically deserializes)
-        vendor_data = get_parallel_step_content(step_input, "parallel_validation", "validate_vendor")
-        if not vendor_data:
-            return create_error_response("Step 1 vendor validation failed: no data returned")
-
-        # Type check - should be dict after deserialization
-        if not isinstance(vendor_data, dict):
-            return create_error_response(f"Step 1 vendor validation failed: expected dict, got {type(vendor_data).__name__}: {str(vendor_data)[:100]}")
-
-        if "error" in vendor_data:
-            return create_error_response(f"Step 1 vendor validation failed: {vendor_data['error']}")
-
-        vendor_domain = vendor_data.get("vendor_domain")
+        # Domain comes straight from the (already normalized) workflow input, not Step 1
+        vendor_domain = getattr(step_input.input, 'vendor_domain', None)
         if not vendor_domain:
-            return create_error_response("Step 1 vendor validation failed: no vendor_domain in data")
+            return create_error_response("vendor_domain not provided in workflow input")
+
+        is_valid, error_msg = validate_single_domain(vendor_domain, "vendor_domain")
+        if not is_valid:
+            return create_error_response(error_msg)
 
         print(f"📄 Scraping vendor homepage: {vendor_domain}")
-        result = scrape_url(vendor_domain, formats=['markdown', 'html'])
+        result = scrape_url(vendor_domain, formats=config.STAGE_SCRAPE_FORMATS["homepage"])
 
         if not result.get("success"):
             error_msg = f"Failed to scrape vendor homepage: {result.get('error', 'Unknown error')}"
             return create_error_response(error_msg)
 
-        markdown_content = result.get('markdown', '')
-        print(f"✅ Scraped vendor homepage ({len(markdown_content)} chars)")
+        # Agents only ever see the minified markdown (images, tracking links and junk stripped)
+        markdown_content = result.get('minified_markdown') or result.get('markdown', '')
+        print(f"✅ Scraped vendor homepage ({len(markdown_content)} chars, {len(result.get('markdown', ''))} before minification)")
 
         return create_success_response({
             "vendor_domain": vendor_domain,
             "vendor_homepage_markdown": markdown_content,
-            "vendor_homepage_html": result.get("html", ""),
-            "vendor_homepage_metadata": result.get("metadata", {})
+            "vendor_homepage_raw_chars": len(result.get("markdown", "")),  # Before minification
+            "vendor_homepage_metadata": result.get("metadata", {}),
+            "vendor_homepage_freshness": {"freshness": result.get("freshness"), "age_seconds": result.get("age_seconds")}
         })
     except Exception as e:
         return create_error_response(f"Error scraping vendor homepage: {str(e)}")
 
 
+@instrument_step
 def scrape_prospect_homepage(step_input: StepInput) -> StepOutput:
     """
     Scrape prospect homepage.
 
     Args:
-        step_input: StepInput with access to Step 1 validate_prospect output
+        step_input: StepInput containing prospect_domain in input
 
     Returns:
-        StepOutput with prospect homepage content (markdown, html, metadata)
+        StepOutput with prospect homepage content (markdown, metadata, structured data)
     """
     try:
-        # Get prospect validation data from parallel block (automatically deserializes)
-        prospect_data = get_parallel_step_content(step_input, "parallel_validation", "validate_prospect")
-        if not prospect_data:
-            return create_error_response("Step 1 prospect validation failed: no data returned")
-
-        # Type check - should be dict after deserialization
-        if not isinstance(prospect_data, dict):
-            return create_error_response(f"Step 1 prospect validation failed: expected dict, got {type(prospect_data).__name__}")
-
-        if "error" in prospect_data:
-            return create_error_response(f"Step 1 prospect validation failed: {prospect_data['error']}")
-
-        prospect_domain = prospect_data.get("prospect_domain")
+        # Domain comes straight from the (already normalized) workflow input, not Step 1
+        prospect_domain = getattr(step_input.input, 'prospect_domain', None)
         if not prospect_domain:
-            return create_error_response("Step 1 prospect validation failed: no prospect_domain in data")
+            return create_error_response("prospect_domain not provided in workflow input")
+
+        is_valid, error_msg = validate_single_domain(prospect_domain, "prospect_domain")
+        if not is_valid:
+            return create_error_response(error_msg)
 
         print(f"📄 Scraping prospect homepage: {prospect_domain}")
-        result = scrape_url(prospect_domain, formats=['markdown', 'html'])
+        stage = "prospect_homepage" if config.STRUCTURED_DATA_PREFILL else "homepage"
+        result = scrape_url(prospect_domain, formats=config.STAGE_SCRAPE_FORMATS[stage])
 
         if not result.get("success"):
             error_msg = f"Failed to scrape prospect homepage: {result.get('error', 'Unknown error')}"
             return create_error_response(error_msg)
 
-        markdown_content = result.get('markdown', '')
-        print(f"✅ Scraped prospect homepage ({len(markdown_content)} chars)")
+        # Agents only ever see the minified markdown (images, tracking links and junk stripped)
+        markdown_content = result.get('minified_markdown') or result.get('markdown', '')
+        print(f"✅ Scraped prospect homepage ({len(markdown_content)} chars, {len(result.get('markdown', ''))} before minification)")
+
+        structured_data = {}
+        if config.STRUCTURED_DATA_PREFILL:
+            structured_data = extract_structured_data(result.get("raw_html", ""), result.get("metadata", {}))
+            known = [field for field in structured_data if field != "sources"]
+            print(f"🧩 Structured data: {', '.join(known) or 'none found'}")
 
         return create_success_response({
             "prospect_domain": prospect_domain,
             "prospect_homepage_markdown": markdown_content,
-            "prospect_homepage_html": result.get("html", ""),
-            "prospect_homepage_metadata": result.get("metadata", {})
+            "prospect_homepage_raw_chars": len(result.get("markdown", "")),  # Before minification
+            "prospect_homepage_metadata": result.get("metadata", {}),
+            "prospect_structured_data": structured_data,
+            "prospect_homepage_freshness": {"freshness": result.get("freshness"), "age_seconds": result.get("age_seconds")}
         })
     except Exception as e:
         return create_error_response(f"Error scraping prospect homepage: {str(e)}")
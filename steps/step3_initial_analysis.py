@@ -7,20 +7,24 @@ Runs in parallel for both homepages.
 from agno.workflow.types import StepInput, StepOutput
 from agents.homepage_analyst import homepage_analyst
 from utils.workflow_helpers import get_parallel_step_content, create_error_response, create_success_response
+from utils.agent_runner import run_agent
+from utils.output_validation import require_text
+from utils.telemetry import instrument_step
 
 
+@instrument_step
 def analyze_vendor_homepage(step_input: StepInput) -> StepOutput:
     """
     Analyze vendor homepage with AI.
 
     Args:
-        step_input: StepInput with access to Step 2 parallel_homepage_scraping output
+        step_input: StepInput with access to Step 2 scrape_vendor_home output
 
     Returns:
         StepOutput with vendor homepage analysis
     """
     # Get vendor homepage data from parallel block
-    vendor_homepage_data = get_parallel_step_content(step_input, "parallel_homepage_scraping", "scrape_vendor_home")
+    vendor_homepage_data = get_parallel_step_content(step_input, "parallel_discovery", "scrape_vendor_home")
 
     if not vendor_homepage_data or "error" in vendor_homepage_data:
         return create_error_response(f"Step 2 vendor scraping failed: {vendor_homepage_data.get('error', 'no data returned')}")
@@ -33,8 +37,10 @@ def analyze_vendor_homepage(step_input: StepInput) -> StepOutput:
     print(f"🤖 Analyzing vendor homepage with AI...")
 
     try:
-        response = homepage_analyst.run(
-            input=f"Analyze this homepage:\n\n{markdown_content}"
+        response = run_agent(
+            homepage_analyst,
+            f"Analyze this homepage:\n\n{markdown_content}",
+            validate=require_text(200)
         )
 
         print(f"✅ Vendor homepage analyzed")
@@ -47,18 +53,19 @@ def analyze_vendor_homepage(step_input: StepInput) -> StepOutput:
         return create_error_response(f"AI analysis failed ({type(e).__name__}): {str(e)}")
 
 
+@instrument_step
 def analyze_prospect_homepage(step_input: StepInput) -> StepOutput:
     """
     Analyze prospect homepage with AI.
 
     Args:
-        step_input: StepInput with access to Step 2 parallel_homepage_scraping output
+        step_input: StepInput with access to Step 2 scrape_prospect_home output
 
     Returns:
         StepOutput with prospect homepage analysis
     """
     # Get prospect homepage data from parallel block
-    prospect_homepage_data = get_parallel_step_content(step_input, "parallel_homepage_scraping", "scrape_prospect_home")
+    prospect_homepage_data = get_parallel_step_content(step_input, "parallel_discovery", "scrape_prospect_home")
 
     if not prospect_homepage_data or "error" in prospect_homepage_data:
         return create_error_response(f"Step 2 prospect scraping failed: {prospect_homepage_data.get('error', 'no data returned')}")
@@ -71,8 +78,10 @@ def analyze_prospect_homepage(step_input: StepInput) -> StepOutput:
     print(f"🤖 Analyzing prospect homepage with AI...")
 
     try:
-        response = homepage_analyst.run(
-            input=f"Analyze this homepage:\n\n{markdown_content}"
+        response = run_agent(
+            homepage_analyst,
+            f"Analyze this homepage:\n\n{markdown_content}",
+            validate=require_text(200)
         )
 
         print(f"✅ Prospect homepage analyzed")
@@ -1,15 +1,29 @@
 """
 Step 4: URL Prioritization
 Selects the most valuable URLs to scrape from both vendor and prospect websites.
-Sequential step (runs after parallel homepage analysis).
+Sequential step (runs after parallel homepage analysis). Each company is
+prioritized by its own agent call; the two calls run concurrently and retry
+independently, and each selection is cached (config.URL_SELECTION_CACHE_TTL) so
+a vendor's selection is reused across prospects.
 """
 
 from agno.workflow.types import StepInput, StepOutput
-from agents.url_prioritizer import url_prioritizer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from agents.url_prioritizer import PrioritizedURL, url_prioritizer
 from utils.workflow_helpers import get_parallel_step_content, create_error_response, create_success_response
-from config import MAX_URLS_FOR_PRIORITIZATION
-
-
+from utils.agent_runner import run_agent
+from utils.output_validation import require_items
+from utils.result_cache import entry_age, get_entry, put_entry
+from utils.telemetry import instrument_step
+from utils.profiles import get_profile_model, get_profile_setting
+from utils.speculative_scrape import pick_speculative_urls, start_speculative_scrape
+import contextvars
+import hashlib
+import config
+
+
+@instrument_step
 def prioritize_urls(step_input: StepInput) -> StepOutput:
     """
     Prioritize URLs from both companies using AI.
@@ -21,8 +35,8 @@ def prioritize_urls(step_input: StepInput) -> StepOutput:
         StepOutput with selected URLs for both companies
     """
     # Get URLs from Step 1 using helper function
-    vendor_data = get_parallel_step_content(step_input, "parallel_validation", "validate_vendor")
-    prospect_data = get_parallel_step_content(step_input, "parallel_validation", "validate_prospect")
+    vendor_data = get_parallel_step_content(step_input, "parallel_discovery", "validate_vendor")
+    prospect_data = get_parallel_step_content(step_input, "parallel_discovery", "validate_prospect")
 
     if not vendor_data or not isinstance(vendor_data, dict):
         return create_error_response("Vendor validation failed: no data")
@@ -44,42 +58,125 @@ def prioritize_urls(step_input: StepInput) -> StepOutput:
 
     print(f"🎯 Prioritizing {len(vendor_urls)} vendor URLs and {len(prospect_urls)} prospect URLs...")
 
-    # Prepare input for agent - limit URLs to avoid token overflow
-    prompt = f"""
-VENDOR URLs ({len(vendor_urls)} total):
-{chr(10).join(vendor_urls[:MAX_URLS_FOR_PRIORITIZATION])}
-
-PROSPECT URLs ({len(prospect_urls)} total):
-{chr(10).join(prospect_urls[:MAX_URLS_FOR_PRIORITIZATION])}
-
-Select the top 10-15 most valuable URLs from each company for sales intelligence gathering.
-"""
-
-    try:
-        # Run agent
-        response = url_prioritizer.run(input=prompt)
-        result = response.content
+    companies = {
+        "vendor": (vendor_data.get("vendor_domain", ""), vendor_urls),
+        "prospect": (prospect_data.get("prospect_domain", ""), prospect_urls)
+    }
+
+    # Cached selections need no LLM call (so there is no latency to hide with a speculative scrape)
+    selections: Dict[str, List[Dict]] = {}
+    sources: Dict[str, str] = {}
+    for role, (domain, urls) in companies.items():
+        cached = _cached_selection(role, domain, urls)
+        if cached is not None:
+            print(f"♻️  Reusing cached {role} URL selection for {domain}")
+            selections[role], sources[role] = cached, "cache"
+    pending = {role: company for role, company in companies.items() if role not in selections}
+
+    # Start scraping the near-certain picks now, so the scrape overlaps the LLM calls
+    speculative_urls = []
+    if config.SPECULATIVE_SCRAPE:
+        speculative_urls = [url for _, urls in pending.values() for url in pick_speculative_urls(urls)]
+        if start_speculative_scrape(speculative_urls):
+            print(f"🏎️  Speculatively scraping {len(speculative_urls)} likely picks while the prioritizer runs")
+
+    # Vendor and prospect are prioritized by separate calls, run concurrently
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="url-prioritizer") as pool:
+        futures = {
+            role: pool.submit(contextvars.copy_context().run, _select_company_urls, role, domain, urls)
+            for role, (domain, urls) in pending.items()
+        }
+
+    errors = []
+    for role, future in futures.items():
+        try:
+            selections[role], sources[role] = future.result()
+        except Exception as e:
+            errors.append(f"{role} ({type(e).__name__}): {e}")
+
+    if errors:
+        return create_error_response(f"URL prioritization failed: {'; '.join(errors)}")
+
+    vendor_selected = [item["url"] for item in selections["vendor"]]
+    prospect_selected = [item["url"] for item in selections["prospect"]]
+
+    print(f"✅ Selected {len(vendor_selected)} vendor URLs ({sources['vendor']}) and {len(prospect_selected)} prospect URLs ({sources['prospect']})")
+
+    return create_success_response({
+        "vendor_selected_urls": vendor_selected,
+        "prospect_selected_urls": prospect_selected,
+        "vendor_url_details": selections["vendor"],
+        "prospect_url_details": selections["prospect"],
+        "url_selection_sources": sources,
+        "speculative_urls": speculative_urls
+    })
+
+
+def _candidate_urls(urls: List[str]) -> List[str]:
+    """URLs sent to the prioritizer (limited to avoid token overflow)"""
+    return urls[:get_profile_setting("max_urls_for_prioritization")]
+
+
+def _selection_cache_key(role: str, domain: str, candidates: List[str]) -> str:
+    """Cache key of a company's selection: same domain, URL list and model -> same selection"""
+    model = get_profile_model(url_prioritizer.name) or url_prioritizer.model
+    url_digest = hashlib.sha256("\n".join(candidates).encode()).hexdigest()[:16]
+    return f"{role}|{domain}|{getattr(model, 'id', model)}|{url_digest}"
+
+
+def _cached_selection(role: str, domain: str, urls: List[str]) -> Optional[List[Dict]]:
+    """A company's cached selection within URL_SELECTION_CACHE_TTL, or None"""
+    entry = get_entry("url_selection", _selection_cache_key(role, domain, _candidate_urls(urls)))
+    if entry and entry_age(entry) < config.URL_SELECTION_CACHE_TTL:
+        return entry["value"]
+    return None
+
+
+def _select_company_urls(role: str, domain: str, urls: List[str]) -> Tuple[List[Dict], str]:
+    """
+    Select the most valuable URLs of one company with the prioritizer agent (and cache the selection).
 
-        # Validate response structure
-        if not hasattr(result, 'vendor_selected_urls') or not hasattr(result, 'prospect_selected_urls'):
-            return create_error_response("Agent returned unexpected response structure")
+    Args:
+        role: "vendor" or "prospect"
+        domain: Company domain (part of the cache key)
+        urls: Mapped URLs of the company
 
-        if not result.vendor_selected_urls or not result.prospect_selected_urls:
-            return create_error_response("Agent returned empty URL lists")
+    Returns:
+        Tuple of (selected URL details as dicts, source: "agent" or "heuristic")
 
-        # Extract URLs from structured output
-        vendor_selected = [item.url for item in result.vendor_selected_urls]
-        prospect_selected = [item.url for item in result.prospect_selected_urls]
+    Raises:
+        ValueError: If neither the agent nor the section-page fallback selected any URL
+    """
+    candidates = _candidate_urls(urls)
 
-        print(f"✅ Selected {len(vendor_selected)} vendor URLs and {len(prospect_selected)} prospect URLs")
+    prompt = f"""
+{role.upper()} URLs ({len(urls)} total):
+{chr(10).join(candidates)}
 
-        # Serialize Pydantic models to dicts for workflow compatibility
-        return create_success_response({
-            "vendor_selected_urls": vendor_selected,
-            "prospect_selected_urls": prospect_selected,
-            "vendor_url_details": [item.model_dump() for item in result.vendor_selected_urls],
-            "prospect_url_details": [item.model_dump() for item in result.prospect_selected_urls]
-        })
+Select the top 10-15 most valuable URLs from this {role}'s website for sales intelligence gathering.
+"""
 
-    except Exception as e:
-        return create_error_response(f"URL prioritization failed ({type(e).__name__}): {str(e)}")
+    response = run_agent(url_prioritizer, prompt, validate=require_items("selected_urls"))
+    result = response.content
+    selected = getattr(result, "selected_urls", None)
+
+    if selected:
+        details = [item.model_dump() for item in selected]
+        if config.URL_SELECTION_CACHE_TTL > 0:
+            put_entry("url_selection", _selection_cache_key(role, domain, candidates), details)
+        return details, "agent"
+
+    # The agent kept returning nothing: fall back to the top-level section pages
+    fallback = pick_speculative_urls(candidates, limit=len(candidates))
+    if not fallback:
+        raise ValueError("agent returned an empty URL list")
+    print(f"⚠️  {role.capitalize()} prioritizer returned no URLs, using {len(fallback)} section pages")
+    return [
+        PrioritizedURL(
+            url=url,
+            page_type="section",
+            priority=rank,
+            reasoning="Top-level section page (prioritizer returned no selection)"
+        ).model_dump()
+        for rank, url in enumerate(fallback, start=1)
+    ], "heuristic"
@@ -1,15 +1,46 @@
 """
 Step 5: Batch Scraping
 Batch scrapes all selected URLs from vendor and prospect websites.
-Sequential step (runs after URL prioritization).
+Sequential step (runs after URL prioritization). Homepages selected by the
+prioritizer are reused from Step 2 instead of being scraped again.
 """
 
 from agno.workflow.types import StepInput, StepOutput
 from utils.firecrawl_helpers import batch_scrape_urls
-from utils.workflow_helpers import validate_previous_step_data, create_error_response, create_success_response
+from utils.workflow_helpers import get_parallel_step_content, validate_previous_step_data, create_error_response, create_success_response
+from utils.telemetry import attach_firecrawl_calls, instrument_step
+from utils.speculative_scrape import take_speculative_scrape
+from utils.deadline import should_degrade
+from utils.profiles import get_profile_setting
+from typing import Dict, List
+from urllib.parse import urlparse
 import config
 
 
+def _is_homepage(url: str, domain: str) -> bool:
+    """True if `url` is the root page of `domain` (ignoring scheme, www. and a trailing slash)"""
+    page, root = urlparse(url), urlparse(domain)
+    same_host = page.netloc.lower().removeprefix("www.") == root.netloc.lower().removeprefix("www.")
+    return same_host and not page.path.strip("/") and not page.query
+
+
+def _reusable_homepages(step_input: StepInput, urls: List[str]) -> Dict[str, Dict]:
+    """Map selected homepage URLs to the page Step 2 already scraped for them (minified markdown + raw size)"""
+    homepages = {}
+    for side in ("vendor", "prospect"):
+        homepage_data = get_parallel_step_content(step_input, "parallel_discovery", f"scrape_{side}_home") or {}
+        domain = homepage_data.get(f"{side}_domain")
+        markdown = homepage_data.get(f"{side}_homepage_markdown")
+        if not domain or not markdown:
+            continue
+        page = {"minified_markdown": markdown, "raw_chars": homepage_data.get(f"{side}_homepage_raw_chars", len(markdown))}
+        for url in urls:
+            if _is_homepage(url, domain):
+                homepages[url] = page
+    return homepages
+
+
+@instrument_step
 def batch_scrape_selected_pages(step_input: StepInput) -> StepOutput:
     """
     Batch scrape all selected URLs from vendor and prospect.
@@ -30,40 +61,82 @@ def batch_scrape_selected_pages(step_input: StepInput) -> StepOutput:
     if not is_valid:
         return create_error_response(error_msg)
 
-    vendor_urls = url_data.get("vendor_selected_urls", [])
-    prospect_urls = url_data.get("prospect_selected_urls", [])
+    # Page priorities (1 = highest) from the prioritizer drive token budget packing downstream
+    vendor_priorities = {item["url"]: item["priority"] for item in url_data.get("vendor_url_details", [])}
+    prospect_priorities = {item["url"]: item["priority"] for item in url_data.get("prospect_url_details", [])}
+
+    # Highest priority first, so limiting below keeps the most valuable pages
+    vendor_urls = sorted(url_data.get("vendor_selected_urls", []), key=lambda url: vendor_priorities.get(url, 10))
+    prospect_urls = sorted(url_data.get("prospect_selected_urls", []), key=lambda url: prospect_priorities.get(url, 10))
 
     # Combine and limit total URLs
     all_urls = vendor_urls + prospect_urls
+    max_urls = get_profile_setting("max_urls_to_scrape")
+
+    # Short on run time: scrape fewer pages so Steps 6-8 still finish
+    reduced_max_urls = max(int(min(len(all_urls), max_urls) * config.DEADLINE_SCRAPE_PAGE_FRACTION), 2)
+    if reduced_max_urls < len(all_urls) and should_degrade(
+        "reduce_scrape_pages", f"scraping {reduced_max_urls} of {len(all_urls)} selected pages"
+    ):
+        max_urls = reduced_max_urls
 
-    if len(all_urls) > config.MAX_URLS_TO_SCRAPE:
-        print(f"⚠️  Too many URLs ({len(all_urls)}), limiting to {config.MAX_URLS_TO_SCRAPE}")
+    if len(all_urls) > max_urls:
+        print(f"⚠️  Too many URLs ({len(all_urls)}), limiting to {max_urls}")
         # Take proportionally from each
-        vendor_limit = int(config.MAX_URLS_TO_SCRAPE * len(vendor_urls) / len(all_urls))
-        prospect_limit = config.MAX_URLS_TO_SCRAPE - vendor_limit
+        vendor_limit = int(max_urls * len(vendor_urls) / len(all_urls))
+        prospect_limit = max_urls - vendor_limit
         vendor_urls = vendor_urls[:vendor_limit]
         prospect_urls = prospect_urls[:prospect_limit]
         all_urls = vendor_urls + prospect_urls
 
-    print(f"📚 Batch scraping {len(all_urls)} URLs ({len(vendor_urls)} vendor + {len(prospect_urls)} prospect)...")
+    # Homepages were already scraped in Step 2 - no need to fetch them again
+    reused_homepages = _reusable_homepages(step_input, all_urls)
+    urls_to_scrape = [url for url in all_urls if url not in reused_homepages]
+    if reused_homepages:
+        print(f"♻️  Reusing {len(reused_homepages)} homepage(s) scraped in Step 2")
+
+    # Pages Step 4 started scraping while the prioritizer ran are collected after the remaining batch
+    speculative = take_speculative_scrape()
+    speculated = [url for url in urls_to_scrape if speculative and speculative.covers(url)]
+    urls_to_scrape = [url for url in urls_to_scrape if url not in speculated]
+    if speculated:
+        print(f"🏎️  {len(speculated)} selected URLs were already scraped speculatively in Step 4")
+
+    print(f"📚 Batch scraping {len(urls_to_scrape)} URLs ({len(vendor_urls)} vendor + {len(prospect_urls)} prospect selected)...")
     print(f"⏱️  This may take up to {config.BATCH_SCRAPE_TIMEOUT} seconds...")
 
     try:
         # Batch scrape
-        result = batch_scrape_urls(all_urls, formats=['markdown'])
+        result = batch_scrape_urls(urls_to_scrape, formats=config.STAGE_SCRAPE_FORMATS["batch"]) if urls_to_scrape else {"success": True, "results": {}}
 
         if not result["success"]:
             error_msg = f"Batch scraping failed: {result.get('error', 'Unknown error')}"
             return create_error_response(error_msg)
 
-        scraped_results = result["results"]
+        scraped_results = dict(result["results"])
+
+        speculative_pages = {}
+        if speculated:
+            speculative_pages = speculative.pages_for(speculated)
+            attach_firecrawl_calls(speculative.firecrawl_calls)
+            scraped_results.update(speculative_pages)
+
+            # Pages the speculative scrape didn't return (or all of them, if it failed) are fetched now
+            missing = [url for url in speculated if url not in speculative_pages]
+            if missing:
+                retry = batch_scrape_urls(missing, formats=config.STAGE_SCRAPE_FORMATS["batch"])
+                scraped_results.update(retry["results"] if retry["success"] else {})
+        elif speculative and speculative.done():
+            attach_firecrawl_calls(speculative.firecrawl_calls)  # None selected; never wait for a running scrape
+        scraped_results.update(reused_homepages)
 
         # Separate vendor and prospect content
         vendor_content = {}
         prospect_content = {}
 
+        raw_chars = 0
         for url, data in scraped_results.items():
-            markdown = data.get("markdown", "")
+            markdown = data.get("minified_markdown") or data.get("markdown", "")
             if not markdown:
                 print(f"    Warning: No markdown content for {url}")
                 continue
@@ -71,6 +144,9 @@ def batch_scrape_selected_pages(step_input: StepInput) -> StepOutput:
                 vendor_content[url] = markdown
             elif url in prospect_urls:
                 prospect_content[url] = markdown
+            else:
+                continue
+            raw_chars += data.get("raw_chars") or len(data.get("markdown") or markdown)
 
         print(f"✅ Scraped {len(vendor_content)} vendor pages and {len(prospect_content)} prospect pages")
 
@@ -80,18 +156,26 @@ def batch_scrape_selected_pages(step_input: StepInput) -> StepOutput:
 
         print(f"📊 Vendor content: {total_vendor_chars:,} characters")
         print(f"📊 Prospect content: {total_prospect_chars:,} characters")
+        print(f"📊 Minification saved {raw_chars - total_vendor_chars - total_prospect_chars:,} characters")
 
         return create_success_response({
             "vendor_content": vendor_content,
             "prospect_content": prospect_content,
             "vendor_urls_scraped": list(vendor_content.keys()),
             "prospect_urls_scraped": list(prospect_content.keys()),
+            "vendor_page_priorities": {url: vendor_priorities.get(url, 10) for url in vendor_content},
+            "prospect_page_priorities": {url: prospect_priorities.get(url, 10) for url in prospect_content},
             "total_scraped": len(scraped_results),
             "stats": {
                 "vendor_pages": len(vendor_content),
                 "prospect_pages": len(prospect_content),
                 "vendor_chars": total_vendor_chars,
-                "prospect_chars": total_prospect_chars
+                "prospect_chars": total_prospect_chars,
+                "raw_chars": raw_chars,
+                "homepages_reused": len(reused_homepages),
+                "stale_pages": len(result.get("stale_urls", [])),  # Served from cache while refreshing
+                "speculative_pages_used": len(speculative_pages),
+                "speculative_pages_discarded": len(speculative.urls) - len(speculated) if speculative else 0
             }
         })
 
@@ -3,9 +3,21 @@ Step 6: Vendor Element Extraction
 Extracts 8 key GTM elements from vendor content using specialized AI agents.
 Runs in parallel for efficiency: offerings, case studies, testimonials, clients,
 differentiators, objections, buyer personas, and competitors.
+
+Proof points and reference customers start from a pattern pre-pass over the pages
+being extracted (utils/evidence_candidates.py): their extractors validate and enrich the candidates
+with a smaller page context, and the "deterministic" extraction mode skips them.
+
+Step 6b then merges customers and personas mentioned by several extractors into
+one entity index (utils/entity_index.py) that downstream prompts use.
+
+Extractors only read the pages that changed since the vendor's previous run and
+carry over the rest of their elements (utils/incremental_extraction.py); Step 6b
+stores this run's page hashes and elements for the next run.
 """
 
 from agno.workflow.types import StepInput, StepOutput
+from typing import Dict, List, Optional, Set
 from agents.vendor_specialists.offerings_extractor import offerings_extractor
 from agents.vendor_specialists.case_study_extractor import case_study_extractor
 from agents.vendor_specialists.proof_points_extractor import proof_points_extractor
@@ -14,9 +26,41 @@ from agents.vendor_specialists.customer_extractor import customer_extractor
 from agents.vendor_specialists.use_case_extractor import use_case_extractor
 from agents.vendor_specialists.persona_extractor import persona_extractor
 from agents.vendor_specialists.differentiator_extractor import differentiator_extractor
-from utils.workflow_helpers import create_error_response
+from utils.entity_index import build_entity_index
+from utils.workflow_helpers import create_error_response, create_success_response, get_parallel_step_content
+from utils.agent_runner import run_agent
+from utils.incremental_extraction import ExtractionPlan, plan_extraction, save_state
+from utils.evidence_candidates import find_customer_candidates, find_proof_point_candidates, format_candidates
+from utils.output_validation import all_of, require_lists
+from utils.profiles import get_profile_setting
+from utils.telemetry import collect_run_telemetry, collect_step_contents, instrument_step
+import config
+
+
+# Step 6 extractor step names and the element kind each one produces
+_VENDOR_ELEMENT_STEPS = [
+    ("extract_offerings", "offerings"),
+    ("extract_case_studies", "case_studies"),
+    ("extract_proof_points", "proof_points"),
+    ("extract_value_props", "value_propositions"),
+    ("extract_customers", "reference_customers"),
+    ("extract_use_cases", "use_cases"),
+    ("extract_personas", "vendor_icp_personas"),
+    ("extract_differentiators", "differentiators"),
+]
+
+
+def _vendor_domain(step_input: StepInput) -> Optional[str]:
+    return getattr(step_input.input, "vendor_domain", None)
+
+
+def _reused_output(plan: ExtractionPlan, label: str) -> StepOutput:
+    """Step output reusing the previous run's elements (no vendor page changed)"""
+    print(f"♻️  No vendor pages changed since the last run - reusing {len(plan.carried)} {label}")
+    return StepOutput(content={plan.kind: plan.carried, "incremental": plan.summary()}, success=True)
 
 
+@instrument_step
 def extract_offerings(step_input: StepInput) -> StepOutput:
     """Extract all product/service offerings"""
     try:
@@ -32,32 +76,36 @@ def extract_offerings(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty offerings")
             return StepOutput(content={"offerings": []}, success=True)
 
-        # Combine all content with URL labels
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "offerings", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "offerings")
 
-        print(f"🔍 Extracting offerings from {len(vendor_content)} vendor pages...")
+        # Combine content with URL labels, packed into the agent's token budget by page priority
+        full_content = plan.page_context(offerings_extractor, scrape_data.get("vendor_page_priorities"))
+
+        print(f"🔍 Extracting offerings from {len(plan.pages)} vendor pages...")
 
         # Run agent
-        response = offerings_extractor.run(
-            input=f"Extract all offerings from this content:\n\n{full_content}"
+        response = run_agent(
+            offerings_extractor,
+            f"Extract all offerings from this content:\n\n{full_content}",
+            validate=all_of(require_lists("offerings"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'offerings'):
             return create_error_response("Agent failed to extract offerings")
 
-        offerings = response.content.offerings
+        offerings = plan.merge([o.model_dump() for o in response.content.offerings])
         print(f"✅ Found {len(offerings)} offerings")
 
-        return StepOutput(content={"offerings": [o.model_dump() for o in offerings]}, success=True)
+        return StepOutput(content={"offerings": offerings, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Offerings extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_case_studies(step_input: StepInput) -> StepOutput:
     """Extract all case studies"""
     try:
@@ -72,30 +120,34 @@ def extract_case_studies(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty case studies")
             return StepOutput(content={"case_studies": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "case_studies", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "case studies")
+
+        full_content = plan.page_context(case_study_extractor, scrape_data.get("vendor_page_priorities"))
 
-        print(f"📚 Extracting case studies from {len(vendor_content)} vendor pages...")
+        print(f"📚 Extracting case studies from {len(plan.pages)} vendor pages...")
 
-        response = case_study_extractor.run(
-            input=f"Extract all case studies:\n\n{full_content}"
+        response = run_agent(
+            case_study_extractor,
+            f"Extract all case studies:\n\n{full_content}",
+            validate=all_of(require_lists("case_studies"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'case_studies'):
             return create_error_response("Agent failed to extract case studies")
 
-        case_studies = response.content.case_studies
+        case_studies = plan.merge([cs.model_dump() for cs in response.content.case_studies])
         print(f"✅ Found {len(case_studies)} case studies")
 
-        return StepOutput(content={"case_studies": [cs.model_dump() for cs in case_studies]}, success=True)
+        return StepOutput(content={"case_studies": case_studies, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Case studies extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_proof_points(step_input: StepInput) -> StepOutput:
     """Extract all proof points"""
     try:
@@ -110,30 +162,44 @@ def extract_proof_points(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty proof points")
             return StepOutput(content={"proof_points": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "proof_points", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "proof points")
+
+        candidates = find_proof_point_candidates(plan.pages)
 
-        print(f"🏆 Extracting proof points from {len(vendor_content)} vendor pages...")
+        if get_profile_setting("extraction_mode") == "deterministic":
+            proof_points = plan.merge(candidates)
+            print(f"✅ Found {len(proof_points)} proof points (pattern pre-pass, no LLM)")
+            return StepOutput(content={"proof_points": proof_points, "incremental": plan.summary()}, success=True)
 
-        response = proof_points_extractor.run(
-            input=f"Extract all proof points:\n\n{full_content}"
+        full_content = plan.page_context(
+            proof_points_extractor, scrape_data.get("vendor_page_priorities"),
+            max_tokens=config.CANDIDATE_PAGE_CONTEXT_TOKENS if candidates else None
+        )
+
+        print(f"🏆 Extracting proof points from {len(plan.pages)} vendor pages ({len(candidates)} candidates)...")
+
+        response = run_agent(
+            proof_points_extractor,
+            f"Extract all proof points:\n\n{format_candidates(candidates, 'proof points')}{full_content}",
+            validate=all_of(require_lists("proof_points"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'proof_points'):
             return create_error_response("Agent failed to extract proof points")
 
-        proof_points = response.content.proof_points
+        proof_points = plan.merge([pp.model_dump() for pp in response.content.proof_points])
         print(f"✅ Found {len(proof_points)} proof points")
 
-        return StepOutput(content={"proof_points": [pp.model_dump() for pp in proof_points]}, success=True)
+        return StepOutput(content={"proof_points": proof_points, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Proof points extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_value_props(step_input: StepInput) -> StepOutput:
     """Extract all value propositions"""
     try:
@@ -148,30 +214,34 @@ def extract_value_props(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty value propositions")
             return StepOutput(content={"value_propositions": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "value_propositions", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "value propositions")
+
+        full_content = plan.page_context(value_prop_extractor, scrape_data.get("vendor_page_priorities"))
 
-        print(f"💎 Extracting value propositions from {len(vendor_content)} vendor pages...")
+        print(f"💎 Extracting value propositions from {len(plan.pages)} vendor pages...")
 
-        response = value_prop_extractor.run(
-            input=f"Extract all value propositions:\n\n{full_content}"
+        response = run_agent(
+            value_prop_extractor,
+            f"Extract all value propositions:\n\n{full_content}",
+            validate=all_of(require_lists("value_propositions"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'value_propositions'):
             return create_error_response("Agent failed to extract value propositions")
 
-        value_props = response.content.value_propositions
+        value_props = plan.merge([vp.model_dump() for vp in response.content.value_propositions])
         print(f"✅ Found {len(value_props)} value propositions")
 
-        return StepOutput(content={"value_propositions": [vp.model_dump() for vp in value_props]}, success=True)
+        return StepOutput(content={"value_propositions": value_props, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Value propositions extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_customers(step_input: StepInput) -> StepOutput:
     """Extract all reference customers"""
     try:
@@ -186,30 +256,44 @@ def extract_customers(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty customers")
             return StepOutput(content={"reference_customers": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "reference_customers", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "reference customers")
 
-        print(f"🏢 Extracting reference customers from {len(vendor_content)} vendor pages...")
+        candidates = find_customer_candidates(plan.pages)
 
-        response = customer_extractor.run(
-            input=f"Extract all reference customers:\n\n{full_content}"
+        if get_profile_setting("extraction_mode") == "deterministic":
+            customers = plan.merge(candidates)
+            print(f"✅ Found {len(customers)} reference customers (pattern pre-pass, no LLM)")
+            return StepOutput(content={"reference_customers": customers, "incremental": plan.summary()}, success=True)
+
+        full_content = plan.page_context(
+            customer_extractor, scrape_data.get("vendor_page_priorities"),
+            max_tokens=config.CANDIDATE_PAGE_CONTEXT_TOKENS if candidates else None
+        )
+
+        print(f"🏢 Extracting reference customers from {len(plan.pages)} vendor pages ({len(candidates)} candidates)...")
+
+        response = run_agent(
+            customer_extractor,
+            f"Extract all reference customers:\n\n{format_candidates(candidates, 'reference customers')}{full_content}",
+            validate=all_of(require_lists("reference_customers"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'reference_customers'):
             return create_error_response("Agent failed to extract reference customers")
 
-        customers = response.content.reference_customers
+        customers = plan.merge([c.model_dump() for c in response.content.reference_customers])
         print(f"✅ Found {len(customers)} reference customers")
 
-        return StepOutput(content={"reference_customers": [c.model_dump() for c in customers]}, success=True)
+        return StepOutput(content={"reference_customers": customers, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Reference customers extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_use_cases(step_input: StepInput) -> StepOutput:
     """Extract all use cases"""
     try:
@@ -224,30 +308,34 @@ def extract_use_cases(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty use cases")
             return StepOutput(content={"use_cases": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "use_cases", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "use cases")
+
+        full_content = plan.page_context(use_case_extractor, scrape_data.get("vendor_page_priorities"))
 
-        print(f"🎯 Extracting use cases from {len(vendor_content)} vendor pages...")
+        print(f"🎯 Extracting use cases from {len(plan.pages)} vendor pages...")
 
-        response = use_case_extractor.run(
-            input=f"Extract all use cases:\n\n{full_content}"
+        response = run_agent(
+            use_case_extractor,
+            f"Extract all use cases:\n\n{full_content}",
+            validate=all_of(require_lists("use_cases"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'use_cases'):
             return create_error_response("Agent failed to extract use cases")
 
-        use_cases = response.content.use_cases
+        use_cases = plan.merge([uc.model_dump() for uc in response.content.use_cases])
         print(f"✅ Found {len(use_cases)} use cases")
 
-        return StepOutput(content={"use_cases": [uc.model_dump() for uc in use_cases]}, success=True)
+        return StepOutput(content={"use_cases": use_cases, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Use cases extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_personas(step_input: StepInput) -> StepOutput:
     """
     Extract vendor's ICP (Ideal Customer Profile) personas
@@ -267,30 +355,34 @@ def extract_personas(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty ICP personas")
             return StepOutput(content={"vendor_icp_personas": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "vendor_icp_personas", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "vendor ICP personas")
 
-        print(f"👥 Extracting vendor ICP personas from {len(vendor_content)} vendor pages...")
+        full_content = plan.page_context(persona_extractor, scrape_data.get("vendor_page_priorities"))
 
-        response = persona_extractor.run(
-            input=f"Extract vendor's ICP (Ideal Customer Profile) personas - the types of buyers they typically sell to:\n\n{full_content}"
+        print(f"👥 Extracting vendor ICP personas from {len(plan.pages)} vendor pages...")
+
+        response = run_agent(
+            persona_extractor,
+            f"Extract vendor's ICP (Ideal Customer Profile) personas - the types of buyers they typically sell to:\n\n{full_content}",
+            validate=all_of(require_lists("target_personas"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'target_personas'):
             return create_error_response("Agent failed to extract personas")
 
-        personas = response.content.target_personas
+        personas = plan.merge([p.model_dump() for p in response.content.target_personas])
         print(f"✅ Found {len(personas)} vendor ICP personas")
 
-        return StepOutput(content={"vendor_icp_personas": [p.model_dump() for p in personas]}, success=True)
+        return StepOutput(content={"vendor_icp_personas": personas, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Vendor ICP personas extraction failed: {str(e)}")
 
 
+@instrument_step
 def extract_differentiators(step_input: StepInput) -> StepOutput:
     """Extract all competitive differentiators"""
     try:
@@ -305,25 +397,89 @@ def extract_differentiators(step_input: StepInput) -> StepOutput:
             print("⚠️  No vendor content found - returning empty differentiators")
             return StepOutput(content={"differentiators": []}, success=True)
 
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in vendor_content.items()
-        ])
+        plan = plan_extraction(_vendor_domain(step_input), "differentiators", vendor_content)
+        if plan.reuse_all:
+            return _reused_output(plan, "differentiators")
+
+        full_content = plan.page_context(differentiator_extractor, scrape_data.get("vendor_page_priorities"))
 
-        print(f"⚡ Extracting differentiators from {len(vendor_content)} vendor pages...")
+        print(f"⚡ Extracting differentiators from {len(plan.pages)} vendor pages...")
 
-        response = differentiator_extractor.run(
-            input=f"Extract all competitive differentiators:\n\n{full_content}"
+        response = run_agent(
+            differentiator_extractor,
+            f"Extract all competitive differentiators:\n\n{full_content}",
+            validate=all_of(require_lists("differentiators"))
         )
 
         # Validate agent response
         if not response.content or not hasattr(response.content, 'differentiators'):
             return create_error_response("Agent failed to extract differentiators")
 
-        differentiators = response.content.differentiators
+        differentiators = plan.merge([d.model_dump() for d in response.content.differentiators])
         print(f"✅ Found {len(differentiators)} differentiators")
 
-        return StepOutput(content={"differentiators": [d.model_dump() for d in differentiators]}, success=True)
+        return StepOutput(content={"differentiators": differentiators, "incremental": plan.summary()}, success=True)
 
     except Exception as e:
         return create_error_response(f"Differentiators extraction failed: {str(e)}")
+
+
+def _save_extraction_state(step_input: StepInput, vendor_domain: str, vendor_content: Dict[str, str],
+                           vendor_elements: Dict[str, List[Dict]], covered_pages: List[Set[str]],
+                           page_priorities: Optional[Dict[str, int]]) -> None:
+    """Store this run as the next run's diff base, unless its extraction was cut short"""
+    mode = get_profile_setting("extraction_mode")
+    if mode != "full":
+        print(f"ℹ️  Not saving extraction state ({mode} extraction mode)")
+        return
+    degradations = collect_run_telemetry(collect_step_contents((step_input.previous_step_outputs or {}).values()))["degradations"]
+    if degradations:
+        print(f"ℹ️  Not saving extraction state ({len(degradations)} deadline degradation(s) this run)")
+        return
+
+    # Pages cut from any extractor's budget stay "changed", so the next run extracts them
+    covered = set.intersection(*covered_pages) if covered_pages else set()
+    pages = {url: markdown for url, markdown in vendor_content.items() if url in covered}
+    if len(pages) < len(vendor_content):
+        print(f"ℹ️  {len(vendor_content) - len(pages)} vendor page(s) weren't fully extracted - they'll be re-read next run")
+    save_state(vendor_domain, pages, vendor_elements, page_priorities)
+
+
+@instrument_step
+def index_vendor_entities(step_input: StepInput) -> StepOutput:
+    """
+    Step 6b: Merge customers and personas found by several extractors.
+
+    Customers from case studies, testimonials and reference customers, and
+    personas from ICP personas and use cases, are deduplicated into one entity
+    each (with aliases and merged sources). Also stores this run's vendor page
+    hashes and elements for incremental extraction on the next run.
+    """
+    try:
+        vendor_elements = {}
+        covered_pages = []
+        for step_name, key in _VENDOR_ELEMENT_STEPS:
+            content = get_parallel_step_content(step_input, "vendor_element_extraction", step_name) or {}
+            if key in content:
+                vendor_elements[key] = content[key]
+                covered_pages.append(set((content.get("incremental") or {}).get("pages_covered", [])))
+
+        index = build_entity_index(vendor_elements)
+        stats = index["stats"]
+        print(
+            f"🗂️  Entity index: {stats['customer_mentions']} customer mentions -> {stats['customers']} customers, "
+            f"{stats['persona_mentions']} persona mentions -> {stats['personas']} personas"
+        )
+
+        # Only a complete set of elements is a valid base for the next run's diff
+        scrape_data = step_input.get_step_content("batch_scrape") or {}
+        vendor_content = scrape_data.get("vendor_content", {})
+        vendor_domain = _vendor_domain(step_input)
+        if config.INCREMENTAL_EXTRACTION and vendor_domain and vendor_content and len(vendor_elements) == len(_VENDOR_ELEMENT_STEPS):
+            _save_extraction_state(step_input, vendor_domain, vendor_content, vendor_elements, covered_pages,
+                                   scrape_data.get("vendor_page_priorities"))
+
+        return create_success_response(index)
+
+    except Exception as e:
+        return create_error_response(f"Entity indexing failed: {str(e)}")
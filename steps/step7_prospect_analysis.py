@@ -2,12 +2,37 @@ from agno.workflow.types import StepInput, StepOutput
 from agents.prospect_specialists.company_analyst import company_analyst
 from agents.prospect_specialists.pain_point_analyst import pain_point_analyst
 from agents.prospect_specialists.buyer_persona_analyst import buyer_persona_analyst
+from models.common import Source
+from models.prospect_intelligence import CompanyProfile
 from utils.workflow_helpers import get_parallel_step_content, create_error_response
-import json
-
-
+from utils.agent_runner import run_agent
+from utils.output_validation import all_of, require_fields, require_items
+from utils.structured_data import known_profile_fields
+from utils.telemetry import instrument_step
+from utils.token_budget import build_page_context, fit_json_sections, get_prompt_context_budget
+import config
+
+
+def _structured_data_source(homepage_data: dict) -> Source:
+    """Source citing the prospect homepage's structured data (Step 2 output)"""
+    domain = homepage_data.get("prospect_domain", "")
+    structured = homepage_data.get("prospect_structured_data") or {}
+    return Source(
+        url=f"https://{domain}" if domain and "://" not in domain else domain,
+        page_type="homepage",
+        excerpt=f"Structured data ({', '.join(structured.get('sources', []))})"
+    )
+
+
+@instrument_step
 def analyze_company_profile(step_input: StepInput) -> StepOutput:
-    """Extract minimal company profile from prospect content"""
+    """
+    Extract minimal company profile from prospect content.
+
+    Fields found in the prospect homepage's structured data (parsed in Step 2)
+    are prefilled and the analyst is told not to re-derive them; if they cover
+    config.STRUCTURED_DATA_COMPLETE_FIELDS the analyst isn't called at all.
+    """
     try:
         # Get prospect content from Step 5
         scrape_data = step_input.get_step_content("batch_scrape")
@@ -20,17 +45,39 @@ def analyze_company_profile(step_input: StepInput) -> StepOutput:
         if not prospect_content:
             return create_error_response("No prospect content available")
 
-        # Combine prospect content
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in prospect_content.items()
-        ])
+        homepage_data = get_parallel_step_content(step_input, "parallel_discovery", "scrape_prospect_home") or {}
+        structured = homepage_data.get("prospect_structured_data") or {}
+        known = known_profile_fields(structured) if config.STRUCTURED_DATA_PREFILL else {}
+        prefill = {"known_fields": sorted(known), "analyst_skipped": False}
+
+        if known and all(field in known for field in config.STRUCTURED_DATA_COMPLETE_FIELDS):
+            company_profile = CompanyProfile(**known, sources=[_structured_data_source(homepage_data)])
+            prefill["analyst_skipped"] = True
+            print(f"✅ Company profile from structured data: {company_profile.company_name} (analyst skipped)")
 
-        print(f"🏢 Analyzing company profile from {len(prospect_content)} prospect pages...")
+            return StepOutput(
+                content={"company_profile": company_profile.model_dump(), "prefill": prefill},
+                success=True
+            )
+
+        # Combine prospect content, packed into the agent's token budget by page priority
+        full_content = build_page_context(prospect_content, company_analyst, scrape_data.get("prospect_page_priorities"))
+
+        known_section = ""
+        if known:
+            known_lines = "\n".join(f"- {field}: {value}" for field, value in known.items())
+            known_section = (
+                f"KNOWN FIELDS (from the homepage's structured data - use these values as-is, "
+                f"don't re-derive them; focus on the remaining fields):\n{known_lines}\n\n"
+            )
+
+        print(f"🏢 Analyzing company profile from {len(prospect_content)} prospect pages ({len(known)} fields prefilled)...")
 
         # Run agent
-        response = company_analyst.run(
-            input=f"Extract company profile from this content:\n\n{full_content}"
+        response = run_agent(
+            company_analyst,
+            f"{known_section}Extract company profile from this content:\n\n{full_content}",
+            validate=all_of(require_fields("company_profile.company_name", "company_profile.what_they_do"))
         )
 
         # Validate agent response
@@ -38,10 +85,16 @@ def analyze_company_profile(step_input: StepInput) -> StepOutput:
             return create_error_response("Agent failed to extract company profile")
 
         company_profile = response.content.company_profile
+        if known:
+            # Structured data is authoritative for the fields it provides
+            company_profile = company_profile.model_copy(update={
+                **known,
+                "sources": [*company_profile.sources, _structured_data_source(homepage_data)]
+            })
         print(f"✅ Company profile extracted: {company_profile.company_name}")
 
         return StepOutput(
-            content={"company_profile": company_profile.model_dump()},
+            content={"company_profile": company_profile.model_dump(), "prefill": prefill},
             success=True
         )
 
@@ -49,6 +102,7 @@ def analyze_company_profile(step_input: StepInput) -> StepOutput:
         return create_error_response(f"Error analyzing company profile: {str(e)}")
 
 
+@instrument_step
 def analyze_pain_points(step_input: StepInput) -> StepOutput:
     """Infer prospect pain points from their content"""
     try:
@@ -63,17 +117,16 @@ def analyze_pain_points(step_input: StepInput) -> StepOutput:
         if not prospect_content:
             return create_error_response("No prospect content found - cannot analyze pain points")
 
-        # Combine prospect content
-        full_content = "\n\n---\n\n".join([
-            f"URL: {url}\n\n{content}"
-            for url, content in prospect_content.items()
-        ])
+        # Combine prospect content, packed into the agent's token budget by page priority
+        full_content = build_page_context(prospect_content, pain_point_analyst, scrape_data.get("prospect_page_priorities"))
 
         print(f"💡 Inferring pain points from {len(prospect_content)} prospect pages...")
 
         # Run agent
-        response = pain_point_analyst.run(
-            input=f"Infer pain points from this company's content:\n\n{full_content}"
+        response = run_agent(
+            pain_point_analyst,
+            f"Infer pain points from this company's content:\n\n{full_content}",
+            validate=all_of(require_items("pain_points"))
         )
 
         # Validate agent response
@@ -92,6 +145,7 @@ def analyze_pain_points(step_input: StepInput) -> StepOutput:
         return create_error_response(f"Error analyzing pain points: {str(e)}")
 
 
+@instrument_step
 def identify_buyer_personas(step_input: StepInput) -> StepOutput:
     """
     Identify target buyer personas at the prospect company (ABM buying committee)
@@ -109,9 +163,11 @@ def identify_buyer_personas(step_input: StepInput) -> StepOutput:
         vendor_case_studies = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_case_studies")
         vendor_value_props = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_value_props")
         vendor_use_cases = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_use_cases")
-        vendor_personas = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_personas")
         vendor_differentiators = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_differentiators")
 
+        # Personas merged across ICP personas and use cases (Step 6b)
+        entity_index = step_input.get_step_content("index_vendor_entities") or {}
+
         # Get prospect intelligence from Step 7a (prospect_context_analysis Parallel block)
         company_data = get_parallel_step_content(step_input, "prospect_context_analysis", "analyze_company")
         pain_points_data = get_parallel_step_content(step_input, "prospect_context_analysis", "analyze_pain_points")
@@ -125,7 +181,7 @@ def identify_buyer_personas(step_input: StepInput) -> StepOutput:
             "case_studies": vendor_case_studies.get("case_studies", []) if vendor_case_studies else [],
             "value_propositions": vendor_value_props.get("value_propositions", []) if vendor_value_props else [],
             "use_cases": vendor_use_cases.get("use_cases", []) if vendor_use_cases else [],
-            "vendor_icp_personas": vendor_personas.get("vendor_icp_personas", []) if vendor_personas else [],
+            "vendor_icp_personas": entity_index.get("personas", []),
             "differentiators": vendor_differentiators.get("differentiators", []) if vendor_differentiators else []
         }
 
@@ -138,7 +194,11 @@ def identify_buyer_personas(step_input: StepInput) -> StepOutput:
         print(f"   Vendor elements: {sum(len(v) if isinstance(v, list) else 1 for v in vendor_intelligence.values())} items")
         print(f"   Prospect context: {len(prospect_intelligence['pain_points'])} pain points identified")
 
-        # Build comprehensive prompt
+        # Build comprehensive prompt (context fitted into the agent's budget ahead of the task)
+        context = fit_json_sections(
+            {"vendor": vendor_intelligence, "prospect": prospect_intelligence},
+            get_prompt_context_budget(buyer_persona_analyst)
+        )
         prompt = f"""
 ABM CONTEXT:
 This is an Account-Based Marketing motion. You are identifying the buying committee at a SPECIFIC prospect company.
@@ -146,10 +206,10 @@ This is an Account-Based Marketing motion. You are identifying the buying commit
 - PROSPECT = the target account (the company vendor wants as a customer)
 
 VENDOR INTELLIGENCE (what the vendor offers):
-{json.dumps(vendor_intelligence, indent=2)}
+{context["vendor"]}
 
 PROSPECT INTELLIGENCE (the target account):
-{json.dumps(prospect_intelligence, indent=2)}
+{context["prospect"]}
 
 YOUR TASK:
 Identify the 3-5 KEY BUYER PERSONAS at the PROSPECT company that the VENDOR should target for sales outreach.
@@ -170,7 +230,11 @@ Make this actionable - these are the specific people at this account that sales
 """
 
         # Run agent
-        response = buyer_persona_analyst.run(input=prompt)
+        response = run_agent(
+            buyer_persona_analyst,
+            prompt,
+            validate=all_of(require_items("target_buyer_personas"))
+        )
 
         # Validate agent response
         if not response or not response.content or not response.content.target_buyer_personas:
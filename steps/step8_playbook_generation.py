@@ -9,44 +9,20 @@ from agents.playbook_specialists.email_sequence_writer import email_sequence_wri
 from agents.playbook_specialists.talk_track_creator import talk_track_creator
 from agents.playbook_specialists.battle_card_builder import battle_card_builder
 from utils.workflow_helpers import get_parallel_step_content, create_error_response, create_success_response
+from utils.agent_runner import run_agent
+from utils.output_validation import all_of, require_fields, require_items
+from utils.telemetry import instrument_step, collect_step_contents, collect_run_telemetry
+from utils.deadline import should_degrade
+from utils.persona_index import get_persona_index
+from utils.profiles import get_profile_setting
+from utils.token_budget import fit_json_sections, get_prompt_context_budget
+import config
 import json
 import traceback
 from datetime import datetime
-from difflib import SequenceMatcher
-
-
-def find_matching_persona(persona_title: str, all_personas: list, threshold: float = 0.7) -> dict:
-    """
-    Find a persona using fuzzy string matching.
-
-    Args:
-        persona_title: The persona title to search for
-        all_personas: List of persona dictionaries with 'persona_title' field
-        threshold: Similarity threshold (0-1), default 0.7 (70% match)
-
-    Returns:
-        Matching persona dict, or None if no match above threshold
-    """
-    best_match = None
-    best_score = 0
-
-    for persona in all_personas:
-        # Calculate similarity ratio
-        similarity = SequenceMatcher(None,
-                                    persona_title.lower(),
-                                    persona["persona_title"].lower()).ratio()
-
-        if similarity > best_score:
-            best_score = similarity
-            best_match = persona
-
-    # Return match only if above threshold
-    if best_score >= threshold:
-        return best_match
-
-    return None
 
 
+@instrument_step
 def generate_playbook_summary(step_input: StepInput) -> StepOutput:
     """
     Step 8a: Generate executive summary and identify priority personas
@@ -60,10 +36,11 @@ def generate_playbook_summary(step_input: StepInput) -> StepOutput:
         case_studies_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_case_studies")
         value_props_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_value_props")
         use_cases_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_use_cases")
-        personas_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_personas")
         differentiators_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_differentiators")
         proof_points_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_proof_points")
-        customers_data = get_parallel_step_content(step_input, "vendor_element_extraction", "extract_customers")
+
+        # Customers and personas merged across extractors (Step 6b)
+        entity_index = step_input.get_step_content("index_vendor_entities") or {}
 
         if not offerings_data:
             return create_error_response("No vendor extraction results available")
@@ -74,10 +51,10 @@ def generate_playbook_summary(step_input: StepInput) -> StepOutput:
             "case_studies": case_studies_data.get("case_studies", []) if case_studies_data else [],
             "value_propositions": value_props_data.get("value_propositions", []) if value_props_data else [],
             "use_cases": use_cases_data.get("use_cases", []) if use_cases_data else [],
-            "vendor_icp_personas": personas_data.get("vendor_icp_personas", []) if personas_data else [],  # Vendor's typical buyers (ICP)
+            "vendor_icp_personas": entity_index.get("personas", []),  # Vendor's typical buyers (ICP)
             "differentiators": differentiators_data.get("differentiators", []) if differentiators_data else [],
             "proof_points": proof_points_data.get("proof_points", []) if proof_points_data else [],
-            "customers": customers_data.get("reference_customers", []) if customers_data else []
+            "customers": entity_index.get("customers", [])  # Deduplicated across case studies, testimonials and logos
         }
 
         # Get prospect buyer personas from Step 7b (specific personas at THIS prospect company to target)
@@ -108,6 +85,12 @@ def generate_playbook_summary(step_input: StepInput) -> StepOutput:
         # Extract exact persona titles for orchestrator to use
         available_persona_titles = [p["persona_title"] for p in target_personas]
 
+        # Fit the context into the agent's budget so the instructions below are never cut
+        context = fit_json_sections(
+            {"vendor": vendor_intel, "prospect": prospect_intel},
+            get_prompt_context_budget(playbook_orchestrator)
+        )
+
         prompt = f"""
 ABM CONTEXT:
 This is an Account-Based Marketing playbook for a specific account.
@@ -116,10 +99,10 @@ This is an Account-Based Marketing playbook for a specific account.
 - This playbook helps {vendor_name}'s sales reps sell TO {prospect_name}
 
 VENDOR INTELLIGENCE (what {vendor_name} offers):
-{json.dumps(vendor_intel, indent=2)}
+{context["vendor"]}
 
 PROSPECT INTELLIGENCE (the target account - {prospect_name}):
-{json.dumps(prospect_intel, indent=2)}
+{context["prospect"]}
 
 AVAILABLE PERSONA TITLES (from prospect analysis):
 {json.dumps(available_persona_titles, indent=2)}
@@ -150,7 +133,15 @@ Provide:
 """
 
         # Run orchestrator
-        response = playbook_orchestrator.run(input=prompt)
+        response = run_agent(
+            playbook_orchestrator,
+            prompt,
+            validate=all_of(
+                require_fields("executive_summary"),
+                require_items("priority_personas", 1),
+                require_items("quick_wins")
+            )
+        )
 
         summary_data = response.content
         print(f"✅ Playbook summary generated")
@@ -174,9 +165,10 @@ Provide:
         return create_error_response(f"Error generating playbook summary: {str(e)}")
 
 
+@instrument_step
 def generate_email_sequences(step_input: StepInput) -> StepOutput:
     """
-    Step 8b: Generate 4-touch email sequences for top 3 personas
+    Step 8b: Generate 4-touch email sequences for the top priority personas (3 by default)
 
     ABM Context: Creates emails FROM vendor sales reps TO prospect stakeholders
     """
@@ -187,41 +179,54 @@ def generate_email_sequences(step_input: StepInput) -> StepOutput:
         if not summary or not summary.get("priority_personas"):
             return create_error_response("No playbook summary available")
 
-        priority_personas = summary["priority_personas"][:3]  # Top 3
+        persona_limit = min(get_profile_setting("persona_count"), len(summary["priority_personas"]))
+        if persona_limit > config.DEADLINE_MIN_PERSONAS and should_degrade(
+            "fewer_personas", f"email sequences for top {config.DEADLINE_MIN_PERSONAS} persona(s) only"
+        ):
+            persona_limit = config.DEADLINE_MIN_PERSONAS
+
+        priority_personas = summary["priority_personas"][:persona_limit]
         vendor_intel = summary["vendor_intelligence"]
         prospect_intel = summary["prospect_intelligence"]
 
-        # Find full persona data
-        all_personas = prospect_intel["target_buyer_personas"]
+        # Find full persona data (index shared with the talk track step)
+        persona_index = get_persona_index(prospect_intel["target_buyer_personas"])
 
         sequences = []
 
         for persona_title in priority_personas:
-            # Find matching persona using fuzzy matching
-            persona_data = find_matching_persona(persona_title, all_personas)
+            # Find the matching persona (ranked fuzzy title lookup)
+            match = persona_index.best_match(persona_title)
 
-            if not persona_data:
+            if not match:
                 print(f"⚠️  Persona data not found for {persona_title} (no fuzzy match)")
                 continue
 
+            persona_data, score = match
+
             # Show matched title if different from searched title
             matched_title = persona_data["persona_title"]
             if matched_title != persona_title:
-                print(f"✉️  Generating 4-touch email sequence for {persona_title} (matched: {matched_title})...")
+                print(f"✉️  Generating 4-touch email sequence for {persona_title} (matched: {matched_title}, score {score:.2f})...")
             else:
                 print(f"✉️  Generating 4-touch email sequence for {persona_title}...")
 
+            context = fit_json_sections(
+                {"persona": persona_data, "vendor": vendor_intel, "pain_points": prospect_intel["pain_points"]},
+                get_prompt_context_budget(email_sequence_writer)
+            )
+
             prompt = f"""
 TARGET PERSONA:
-{json.dumps(persona_data, indent=2)}
+{context["persona"]}
 
 VENDOR INTELLIGENCE:
-{json.dumps(vendor_intel, indent=2)}
+{context["vendor"]}
 
 PROSPECT CONTEXT:
 Company: {prospect_intel['company_profile'].get('company_name')}
 Industry: {prospect_intel['company_profile'].get('industry')}
-Pain Points: {json.dumps(prospect_intel['pain_points'], indent=2)}
+Pain Points: {context["pain_points"]}
 
 TASK:
 Create a 4-touch email sequence over 14 days for this persona.
@@ -229,7 +234,7 @@ Follow the pain→value→follow-up→breakup framework.
 Day 1, Day 3, Day 7, Day 14.
 """
 
-            response = email_sequence_writer.run(input=prompt)
+            response = run_agent(email_sequence_writer, prompt, validate=all_of(require_items("email_sequences", 1)))
             sequences.extend(response.content.email_sequences)
 
             seq_count = len(response.content.email_sequences)
@@ -248,9 +253,10 @@ Day 1, Day 3, Day 7, Day 14.
         return create_error_response(f"Error generating email sequences: {str(e)}")
 
 
+@instrument_step
 def generate_talk_tracks(step_input: StepInput) -> StepOutput:
     """
-    Step 8c: Generate talk tracks for top 3 personas
+    Step 8c: Generate talk tracks for the top priority personas (3 by default)
 
     ABM Context: Creates scripts for vendor sales reps calling prospect stakeholders
     """
@@ -260,37 +266,50 @@ def generate_talk_tracks(step_input: StepInput) -> StepOutput:
         if not summary:
             return create_error_response("No playbook summary available")
 
-        priority_personas = summary["priority_personas"][:3]
+        persona_limit = min(get_profile_setting("persona_count"), len(summary["priority_personas"]))
+        if persona_limit > config.DEADLINE_MIN_PERSONAS and should_degrade(
+            "fewer_personas", f"talk tracks for top {config.DEADLINE_MIN_PERSONAS} persona(s) only"
+        ):
+            persona_limit = config.DEADLINE_MIN_PERSONAS
+
+        priority_personas = summary["priority_personas"][:persona_limit]
         vendor_intel = summary["vendor_intelligence"]
         prospect_intel = summary["prospect_intelligence"]
-        all_personas = prospect_intel["target_buyer_personas"]
+        persona_index = get_persona_index(prospect_intel["target_buyer_personas"])
 
         talk_tracks = []
 
         for persona_title in priority_personas:
-            # Find matching persona using fuzzy matching
-            persona_data = find_matching_persona(persona_title, all_personas)
+            # Find the matching persona (ranked fuzzy title lookup)
+            match = persona_index.best_match(persona_title)
 
-            if not persona_data:
+            if not match:
                 print(f"⚠️  Persona data not found for {persona_title} (no fuzzy match)")
                 continue
 
+            persona_data, score = match
+
             # Show matched title if different from searched title
             matched_title = persona_data["persona_title"]
             if matched_title != persona_title:
-                print(f"🎯 Generating talk tracks for {persona_title} (matched: {matched_title})...")
+                print(f"🎯 Generating talk tracks for {persona_title} (matched: {matched_title}, score {score:.2f})...")
             else:
                 print(f"🎯 Generating talk tracks for {persona_title}...")
 
+            context = fit_json_sections(
+                {"persona": persona_data, "vendor": vendor_intel, "prospect": prospect_intel},
+                get_prompt_context_budget(talk_track_creator)
+            )
+
             prompt = f"""
 TARGET PERSONA:
-{json.dumps(persona_data, indent=2)}
+{context["persona"]}
 
 VENDOR INTELLIGENCE:
-{json.dumps(vendor_intel, indent=2)}
+{context["vendor"]}
 
 PROSPECT CONTEXT:
-{json.dumps(prospect_intel, indent=2)}
+{context["prospect"]}
 
 TASK:
 Create comprehensive talk tracks for this persona including:
@@ -301,7 +320,7 @@ Create comprehensive talk tracks for this persona including:
 - Value mapping (connect vendor capabilities to persona pain points)
 """
 
-            response = talk_track_creator.run(input=prompt)
+            response = run_agent(talk_track_creator, prompt, validate=all_of(require_items("talk_tracks", 1)))
             talk_tracks.extend(response.content.talk_tracks)
 
             print(f"   ✅ Talk track created")
@@ -319,6 +338,7 @@ Create comprehensive talk tracks for this persona including:
         return create_error_response(f"Error generating talk tracks: {str(e)}")
 
 
+@instrument_step
 def generate_battle_cards(step_input: StepInput) -> StepOutput:
     """
     Step 8d: Generate battle cards (objection handling, competitive positioning)
@@ -331,17 +351,26 @@ def generate_battle_cards(step_input: StepInput) -> StepOutput:
         if not summary:
             return create_error_response("No playbook summary available")
 
+        # Short on run time: battle cards are the least essential component
+        if should_degrade("skip_battle_cards", "battle cards skipped"):
+            return StepOutput(content={"battle_cards": []}, success=True)
+
         vendor_intel = summary["vendor_intelligence"]
         prospect_intel = summary["prospect_intelligence"]
 
         print(f"⚔️  Generating battle cards...")
 
+        context = fit_json_sections(
+            {"vendor": vendor_intel, "prospect": prospect_intel},
+            get_prompt_context_budget(battle_card_builder)
+        )
+
         prompt = f"""
 VENDOR INTELLIGENCE:
-{json.dumps(vendor_intel, indent=2)}
+{context["vendor"]}
 
 PROSPECT INTELLIGENCE:
-{json.dumps(prospect_intel, indent=2)}
+{context["prospect"]}
 
 TASK:
 Create battle cards for the sales team:
@@ -354,7 +383,7 @@ Be specific and actionable.
 Include exact talk tracks.
 """
 
-        response = battle_card_builder.run(input=prompt)
+        response = run_agent(battle_card_builder, prompt, validate=all_of(require_items("battle_cards", 2)))
         battle_cards = response.content.battle_cards
 
         print(f"✅ {len(battle_cards)} battle cards generated")
@@ -372,6 +401,7 @@ Include exact talk tracks.
         return create_error_response(f"Error generating battle cards: {str(e)}")
 
 
+@instrument_step
 def assemble_final_playbook(step_input: StepInput) -> StepOutput:
     """
     Step 8e: Assemble all playbook components into final deliverable
@@ -429,8 +459,11 @@ def assemble_final_playbook(step_input: StepInput) -> StepOutput:
         print(f"   • Quick Wins: {len(final_playbook['quick_wins'])}")
         print(f"=" * 60)
 
+        # Telemetry for every step so far, so API callers get it with the result
+        run_telemetry = collect_run_telemetry(collect_step_contents((step_input.previous_step_outputs or {}).values()))
+
         return StepOutput(
-            content={"sales_playbook": final_playbook},
+            content={"sales_playbook": final_playbook, "run_telemetry": run_telemetry},
             success=True
         )
 
@@ -0,0 +1,285 @@
+"""
+Agent Runner
+Single entry point for every agent call in the pipeline.
+
+run_agent() enforces the agent's input token budget (so a call never fails on
+context overflow), waits for rate limit capacity (so concurrent calls don't
+burst into 429s) and records per-call token usage for the running step.
+
+Agents listed in config.AGENT_MODEL_CASCADES run on the fast model first and
+only escalate to the strong model when the output fails the caller's
+validation checks (see utils/output_validation.py). Calls that error or keep
+failing validation are retried with jittered backoff, so one flaky call does
+not abort the whole run. When the run deadline is close (see utils/deadline.py)
+agents drop to the fast model and failed calls are no longer retried.
+"""
+
+from agno.agent import Agent
+from typing import Any, Dict, List, Optional, Tuple
+from utils.deadline import should_degrade
+from utils.profiles import get_profile_model
+from utils.output_validation import Validator
+from utils.rate_limiter import get_rate_limiter
+from utils.replay import ReplayMissError, run_agent_with_replay
+from utils.telemetry import estimate_cost, get_run_key, record_agent_call
+from utils.token_budget import estimate_tokens, get_input_token_budget, truncate_middle
+import random
+import threading
+import time
+import config
+
+
+# Agent copies bound to cascade models, keyed by (agent name, model id)
+_cascade_agents: Dict[Tuple[str, str], Agent] = {}
+
+# Per-agent cascade outcomes: runs, and how many escalated past the first model
+_escalation_stats: Dict[str, Dict[str, int]] = {}
+
+# Per-agent retry outcomes: runs, retries, runs that failed every attempt, time spent retrying
+_retry_stats: Dict[str, Dict] = {}
+
+# Error messages that suggest the request was too large to complete
+_SIZE_ERROR_HINTS = ("context_length", "maximum context", "too many tokens", "request too large", "timed out", "timeout")
+_lock = threading.Lock()
+
+
+def _model_id(model: Any) -> str:
+    return getattr(model, "id", str(model))
+
+
+def _agent_for_model(agent: Agent, model: Any) -> Agent:
+    """Get a copy of `agent` bound to `model` (agents are module-level singletons, never mutate them)"""
+    if _model_id(model) == _model_id(agent.model):
+        return agent
+
+    key = (agent.name, _model_id(model))
+    with _lock:
+        if key not in _cascade_agents:
+            _cascade_agents[key] = agent.deep_copy(update={"model": model})
+        return _cascade_agents[key]
+
+
+def _record_escalation(agent_name: str, escalated: bool) -> None:
+    with _lock:
+        stats = _escalation_stats.setdefault(agent_name, {"runs": 0, "escalations": 0})
+        stats["runs"] += 1
+        stats["escalations"] += int(escalated)
+
+
+def get_escalation_stats() -> Dict[str, Dict]:
+    """
+    Get model cascade escalation rates per agent for this process.
+
+    Returns:
+        Dict mapping agent name -> {runs, escalations, escalation_rate}
+    """
+    with _lock:
+        return {
+            name: {**stats, "escalation_rate": round(stats["escalations"] / stats["runs"], 3)}
+            for name, stats in _escalation_stats.items()
+        }
+
+
+def _run_once(agent: Agent, input: str, cascade_level: int, attempt: int = 0, **kwargs: Any) -> Any:
+    """Run one agent call within its token budget and rate limits, recording usage"""
+    budget = get_input_token_budget(agent)
+    estimated_input_tokens = estimate_tokens(input)
+    truncated = estimated_input_tokens > budget
+
+    if truncated:
+        print(f"✂️  {agent.name}: prompt is ~{estimated_input_tokens:,} tokens, trimming its context to {budget:,}")
+        input = truncate_middle(input, budget)  # Keeps the trailing task instructions
+
+    model_id = _model_id(agent.model)
+
+    # Reserve estimated tokens before sending; corrected once actual usage is known
+    limiter = get_rate_limiter(model_id) if config.RATE_LIMIT_ENABLED else None
+    input_estimate = min(estimated_input_tokens, budget)
+    queue_seconds, reserved_tokens = 0.0, 0
+    if limiter:
+        queue_seconds, reserved_tokens = limiter.acquire(
+            input_estimate + config.RATE_LIMIT_OUTPUT_TOKEN_ESTIMATE, run_key=get_run_key()
+        )
+    if queue_seconds >= 1:
+        print(f"⏳ {agent.name}: waited {queue_seconds:.1f}s for {model_id} rate limit capacity")
+
+    start_time = time.time()
+    try:
+        response = run_agent_with_replay(agent, input, **kwargs)
+    except Exception:
+        if limiter:
+            limiter.adjust(input_estimate - reserved_tokens)  # No output was produced
+        raise
+    duration_seconds = round(time.time() - start_time, 2)
+
+    metrics = getattr(response, "metrics", None)
+    input_tokens = getattr(metrics, "input_tokens", 0) or 0
+    output_tokens = getattr(metrics, "output_tokens", 0) or 0
+
+    if limiter and (input_tokens or output_tokens):
+        limiter.adjust(input_tokens + output_tokens - reserved_tokens)
+
+    record_agent_call({
+        "agent": agent.name,
+        "model": model_id,
+        "cascade_level": cascade_level,
+        "attempt": attempt,
+        "budget_tokens": budget,
+        "estimated_input_tokens": estimated_input_tokens,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": estimate_cost(model_id, input_tokens, output_tokens),
+        "truncated": truncated,
+        "queue_seconds": round(queue_seconds, 3),
+        "duration_seconds": duration_seconds
+    })
+
+    return response
+
+
+def _backoff_delay(retry: int) -> float:
+    """Full-jitter exponential backoff, so concurrent retries don't fire in lockstep"""
+    ceiling = min(config.AGENT_RETRY_MAX_DELAY, config.AGENT_RETRY_BASE_DELAY * 2 ** retry)
+    return random.uniform(0, ceiling)
+
+
+def _is_size_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(hint in message for hint in _SIZE_ERROR_HINTS)
+
+
+def _repair_prompt(input: str, problem: str) -> str:
+    return (
+        f"{input}\n\n"
+        f"IMPORTANT: A previous response to this request was rejected ({problem}). "
+        f"Return a complete response that fills every required field of the output schema."
+    )
+
+
+def _shrink_input(input: str) -> str:
+    # Cut the context in the middle, never the task instructions at the end
+    return truncate_middle(input, int(estimate_tokens(input) * config.AGENT_RETRY_INPUT_SHRINK))
+
+
+def _record_retry_stats(agent_name: str, retries: int, retry_seconds: float, failed: bool) -> None:
+    with _lock:
+        stats = _retry_stats.setdefault(agent_name, {"runs": 0, "retries": 0, "failures": 0, "retry_seconds": 0.0})
+        stats["runs"] += 1
+        stats["retries"] += retries
+        stats["failures"] += int(failed)
+        stats["retry_seconds"] = round(stats["retry_seconds"] + retry_seconds, 2)
+
+
+def get_retry_stats() -> Dict[str, Dict]:
+    """
+    Get agent retry counts and latency per agent for this process.
+
+    Returns:
+        Dict mapping agent name -> {runs, retries, failures, retry_seconds}
+    """
+    with _lock:
+        return {name: dict(stats) for name, stats in _retry_stats.items()}
+
+
+def run_agent(agent: Agent, input: str, validate: Optional[Validator] = None, **kwargs: Any) -> Any:
+    """
+    Run an agent within its input token budget and rate limits, recording token usage.
+
+    If the agent has a model cascade (config.AGENT_MODEL_CASCADES) and a
+    validator is given, each model is tried in order until the output passes
+    `validate`. Calls that raise or still fail validation are then retried up
+    to config.AGENT_MAX_RETRIES times on the last model with jittered backoff.
+    Only this agent is re-asked; the rest of the step's work is kept.
+
+    The run's execution profile (see utils/profiles.py) may pin the agent to
+    one model instead. Close to the run deadline, the agent runs on config.FAST_MODEL only and
+    calls are not retried (each degradation is recorded for the step).
+
+    Args:
+        agent: Agno Agent to run
+        input: Prompt text
+        validate: Optional output check (returns None if response.content is acceptable)
+        **kwargs: Extra keyword arguments passed through to agent.run()
+
+    Returns:
+        Agent RunOutput (use response.content for the structured result).
+        If no attempt produced valid output, the last response is returned.
+
+    Raises:
+        Exception: The last error, if every attempt raised
+    """
+    models: List[Any] = [agent.model]
+    profile_model = get_profile_model(agent.name)
+    if profile_model is not None:
+        models = [profile_model]  # The run's profile pins this agent's model
+    elif config.MODEL_CASCADE_ENABLED and validate is not None:
+        models = config.AGENT_MODEL_CASCADES.get(agent.name, models)
+
+    fast_model_id = _model_id(config.FAST_MODEL)
+    if any(_model_id(model) != fast_model_id for model in models):
+        if should_degrade("fast_models", f"{agent.name} limited to {fast_model_id}"):
+            models = [config.FAST_MODEL]
+
+    attempts = models + [models[-1]] * config.AGENT_MAX_RETRIES
+    base_prompt = prompt = input
+    response = None
+    error: Optional[Exception] = None
+    problem: Optional[str] = None
+    retries = 0
+    retry_started = 0.0
+
+    for attempt, model in enumerate(attempts):
+        cascade_level = min(attempt, len(models) - 1)
+
+        if attempt >= len(models):
+            if should_degrade("no_retries", f"{agent.name} not retried"):
+                break
+
+            retries += 1
+            retry_started = retry_started or time.time()
+            reason = f"{type(error).__name__}: {error}" if error else problem
+            delay = _backoff_delay(retries - 1)
+            print(f"🔁 {agent.name}: retry {retries}/{config.AGENT_MAX_RETRIES} in {delay:.1f}s ({reason})")
+            time.sleep(delay)
+
+            if error is not None and _is_size_error(error):
+                base_prompt = prompt = _shrink_input(base_prompt)
+            elif error is None and problem:
+                prompt = _repair_prompt(base_prompt, problem)
+
+        start_time = time.time()
+        try:
+            response = _run_once(_agent_for_model(agent, model), prompt, cascade_level, attempt=attempt, **kwargs)
+        except ReplayMissError:
+            raise  # Retrying can't conjure a missing recording
+        except Exception as e:
+            error, problem = e, None
+            record_agent_call({
+                "agent": agent.name,
+                "model": _model_id(model),
+                "cascade_level": cascade_level,
+                "attempt": attempt,
+                "error": f"{type(e).__name__}: {e}",
+                "duration_seconds": round(time.time() - start_time, 2)
+            })
+        else:
+            error = None
+            problem = validate(response.content) if validate is not None else None
+            if problem is None:
+                break
+
+        if problem and attempt + 1 < len(models):
+            print(f"🔼 {agent.name}: {_model_id(model)} output rejected ({problem}), escalating to {_model_id(models[attempt + 1])}")
+
+    if len(models) > 1:
+        _record_escalation(agent.name, escalated=attempt > 0)
+    retry_seconds = time.time() - retry_started if retries else 0.0
+    _record_retry_stats(agent.name, retries, retry_seconds, failed=error is not None or bool(problem))
+
+    if response is None:
+        raise error
+
+    if error is not None or problem:
+        print(f"⚠️  {agent.name}: no valid output after {retries} retries, using last response")
+
+    return response
@@ -0,0 +1,139 @@
+"""
+Circuit Breaker
+Fails Firecrawl calls fast while Firecrawl is erroring or slow, instead of
+letting every run wait out its timeouts (see utils/firecrawl_helpers.py).
+
+The breaker watches the outcomes of the calls made in the last
+CIRCUIT_WINDOW_SECONDS. A call counts as failed if it raised or returned an
+error, or took longer than CIRCUIT_SLOW_CALL_SECONDS for its operation. Once at
+least CIRCUIT_MIN_CALLS calls are in the window and CIRCUIT_FAILURE_RATE of
+them failed, the circuit opens:
+
+- open: calls are rejected without reaching Firecrawl (callers fall back to
+  cached content) for CIRCUIT_OPEN_SECONDS
+- half_open: one trial call goes through; success closes the circuit, failure
+  opens it again
+
+State is per process and exposed in serve.py's /health and /metrics.
+
+Usage:
+    if not firecrawl_breaker.allow():
+        return fallback()
+    start = time.time()
+    ...  # Firecrawl call
+    firecrawl_breaker.record("scrape", success, time.time() - start)
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import threading
+import time
+import config
+
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Error rate and latency circuit breaker for one downstream service"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._calls: Deque[Tuple[float, bool]] = deque()  # (finished at, failed)
+        self._trial_in_flight = False
+        self._stats = {"rejected": 0, "opened": 0, "failed": 0, "slow": 0}
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - config.CIRCUIT_WINDOW_SECONDS:
+            self._calls.popleft()
+
+    def _open(self, now: float) -> None:
+        if self.state != OPEN:
+            print(f"🔌 {self.name} circuit opened - failing fast for {config.CIRCUIT_OPEN_SECONDS}s")
+            self._stats["opened"] += 1
+        self.state = OPEN
+        self.opened_at = now
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go through (call before every request).
+
+        Returns:
+            False if the circuit is open (or a half-open trial call is already in flight)
+        """
+        if not config.CIRCUIT_BREAKER_ENABLED:
+            return True
+        with self._lock:
+            now = time.time()
+            if self.state == OPEN and now - self.opened_at >= config.CIRCUIT_OPEN_SECONDS:
+                self.state = HALF_OPEN
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._trial_in_flight):
+                self._trial_in_flight = self.state == HALF_OPEN
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record(self, operation: str, success: bool, duration_seconds: float) -> None:
+        """
+        Record the outcome of a call that allow() let through.
+
+        Args:
+            operation: Operation name (a CIRCUIT_SLOW_CALL_SECONDS key, e.g. "scrape")
+            success: False if the call raised or returned an error
+            duration_seconds: Call latency
+        """
+        if not config.CIRCUIT_BREAKER_ENABLED:
+            return
+        slow = duration_seconds > config.CIRCUIT_SLOW_CALL_SECONDS.get(operation, float("inf"))
+        failed = not success or slow
+        with self._lock:
+            now = time.time()
+            self._stats["failed"] += int(not success)
+            self._stats["slow"] += int(slow)
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open(now)
+                else:
+                    print(f"🔌 {self.name} circuit closed - trial call succeeded")
+                    self.state = CLOSED
+                    self._calls.clear()
+                    self._trial_in_flight = False
+                return
+            if self.state == OPEN:
+                return  # A call allowed before the circuit opened
+
+            self._calls.append((now, failed))
+            self._prune(now)
+            failures = sum(1 for _, call_failed in self._calls if call_failed)
+            if len(self._calls) >= config.CIRCUIT_MIN_CALLS and failures / len(self._calls) >= config.CIRCUIT_FAILURE_RATE:
+                self._open(now)
+
+    def snapshot(self) -> Dict:
+        """State and counters (for /health, /metrics and run metadata)"""
+        with self._lock:
+            now = time.time()
+            self._prune(now)
+            state = self.state
+            if state == OPEN and now - self.opened_at >= config.CIRCUIT_OPEN_SECONDS:
+                state = HALF_OPEN  # Next call is the trial
+            return {
+                "state": state,
+                "window_calls": len(self._calls),
+                "window_failures": sum(1 for _, failed in self._calls if failed),
+                "open_seconds_left": round(max(config.CIRCUIT_OPEN_SECONDS - (now - self.opened_at), 0), 1)
+                if state == OPEN else 0,
+                **self._stats
+            }
+
+
+# Process-wide breaker for all Firecrawl operations
+firecrawl_breaker = CircuitBreaker("Firecrawl")
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict]:
+    """Snapshots of every circuit breaker, keyed by service"""
+    return {"firecrawl": firecrawl_breaker.snapshot()}
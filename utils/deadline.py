@@ -0,0 +1,153 @@
+"""
+Run Deadline
+A per-run time budget that every step can see. Instead of overrunning, a run
+degrades gracefully as its deadline approaches: fewer pages are scraped, agents
+fall back to the fast model without retries, fewer personas get emails and talk
+tracks, and battle cards are skipped.
+
+Thresholds (seconds left when each degradation kicks in) live in
+config.DEADLINE_THRESHOLDS. Every degradation is recorded for the step that made
+it, so the run telemetry says exactly what was cut.
+
+Usage:
+    if should_degrade("skip_battle_cards", "battle cards skipped"):
+        return create_success_response({"battle_cards": []})
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+import threading
+import time
+import config
+
+
+class RunDeadline:
+    """Time budget for one workflow run"""
+
+    def __init__(self, seconds: float, started_at: Optional[float] = None):
+        self.seconds = seconds
+        self.started_at = started_at or time.time()
+
+    @property
+    def expires_at(self) -> float:
+        return self.started_at + self.seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (0 once it has passed)"""
+        return max(self.expires_at - time.time(), 0.0)
+
+    def below(self, threshold: str) -> bool:
+        """True if less time is left than config.DEADLINE_THRESHOLDS[threshold]"""
+        return self.remaining() < config.DEADLINE_THRESHOLDS[threshold]
+
+
+# Deadlines of runs in flight, keyed by run key (first step of a run starts the clock)
+_deadlines: Dict[str, RunDeadline] = {}
+_lock = threading.Lock()
+
+# Deadline and degradation records for the step executor currently running in this context
+_current_deadline: ContextVar[Optional[RunDeadline]] = ContextVar("_current_deadline", default=None)
+_degradations: ContextVar[Optional[List[Dict]]] = ContextVar("_degradations", default=None)
+
+
+def start_run_deadline(run_key: str, seconds: Optional[float]) -> Optional[RunDeadline]:
+    """
+    Get the deadline for a run, starting its clock on first use.
+
+    Args:
+        run_key: Workflow run identifier (see utils/telemetry.get_run_key)
+        seconds: Run time budget (None = config.RUN_DEADLINE_SECONDS, 0 = no deadline)
+
+    Returns:
+        RunDeadline, or None if the run has no deadline
+    """
+    if seconds is None:
+        seconds = config.RUN_DEADLINE_SECONDS
+    if not seconds:
+        return None
+
+    now = time.time()
+    with _lock:
+        # Forget runs whose deadline passed long ago (they have finished one way or another)
+        for key in [key for key, deadline in _deadlines.items() if deadline.expires_at + 3600 < now]:
+            del _deadlines[key]
+
+        if run_key not in _deadlines:
+            _deadlines[run_key] = RunDeadline(seconds, now)
+        return _deadlines[run_key]
+
+
+@contextmanager
+def step_deadline(deadline: Optional[RunDeadline], degradations: List[Dict]) -> Iterator[None]:
+    """
+    Make a run deadline visible to the step executor running in this context.
+
+    Args:
+        deadline: The run's deadline (None if it has none)
+        degradations: List that collects the step's degradation records
+    """
+    deadline_token = _current_deadline.set(deadline)
+    degradations_token = _degradations.set(degradations)
+    try:
+        yield
+    finally:
+        _degradations.reset(degradations_token)
+        _current_deadline.reset(deadline_token)
+
+
+def get_deadline() -> Optional[RunDeadline]:
+    """Get the deadline of the run executing the current step (None if it has none)"""
+    return _current_deadline.get()
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left for the current run (None if it has no deadline)"""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline else None
+
+
+def record_degradation(kind: str, detail: str) -> None:
+    """
+    Record work the current step cut to meet the run deadline.
+
+    Args:
+        kind: Degradation type (a config.DEADLINE_THRESHOLDS key)
+        detail: What was cut (e.g. "scraping 25 of 50 pages")
+    """
+    degradations = _degradations.get()
+    if degradations is not None and any(
+        item["kind"] == kind and item["detail"] == detail for item in degradations
+    ):
+        return  # Already recorded for this step (e.g. one agent called per persona)
+
+    remaining = time_remaining()
+    print(f"⏰ Deadline: {detail} ({remaining or 0:.0f}s left)")
+
+    if degradations is not None:
+        degradations.append({
+            "kind": kind,
+            "detail": detail,
+            "seconds_remaining": round(remaining or 0, 1)
+        })
+
+
+def should_degrade(kind: str, detail: str) -> bool:
+    """
+    Check whether the current run is short enough on time to apply a degradation.
+
+    Records the degradation when it applies.
+
+    Args:
+        kind: config.DEADLINE_THRESHOLDS key (e.g. "skip_battle_cards")
+        detail: What is cut if it applies
+
+    Returns:
+        True if the step should degrade
+    """
+    deadline = _current_deadline.get()
+    if deadline is None or not deadline.below(kind):
+        return False
+
+    record_degradation(kind, detail)
+    return True
@@ -0,0 +1,241 @@
+"""
+Entity Index
+Merges the vendor elements Step 6 extracts independently into one entry per
+real-world entity, so downstream prompts and output files list each customer
+and persona once.
+
+- Customers appear in case_studies (customer_name), reference_customers (name)
+  and testimonial proof points (the company at the end of the attribution).
+- Personas appear in vendor_icp_personas (title) and use_cases (target_persona).
+
+Entities are keyed by a normalized name: case, punctuation, legal suffixes
+("Inc.", "Corp") and common title abbreviations ("VP", "CRO") are folded, so
+"Initech, Inc." and "Initech" or "VP of Sales" and "Vice President Sales"
+resolve to the same entity. Every spelling seen is kept as an alias and the
+Source lists of the merged records are combined (one source per URL).
+
+Usage:
+    index = build_entity_index(vendor_elements)
+    index["customers"]  # [{"name": "Initech", "aliases": [...], "evidence": [...], "sources": [...]}]
+"""
+
+from typing import Dict, Iterable, List, Optional
+import re
+
+
+# Company name suffixes that don't distinguish companies
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "plc", "sa", "ag", "bv", "pty", "llp"
+}
+
+# Job title abbreviations, expanded so spelled-out and abbreviated titles match
+TITLE_ABBREVIATIONS = {
+    "vp": "vice president",
+    "svp": "senior vice president",
+    "evp": "executive vice president",
+    "avp": "assistant vice president",
+    "ceo": "chief executive officer",
+    "cfo": "chief financial officer",
+    "coo": "chief operating officer",
+    "cro": "chief revenue officer",
+    "cmo": "chief marketing officer",
+    "cto": "chief technology officer",
+    "cio": "chief information officer",
+    "ciso": "chief information security officer",
+    "cso": "chief sales officer",
+    "cco": "chief customer officer",
+    "revops": "revenue operations",
+    "salesops": "sales operations",
+    "ops": "operations",
+    "sr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "dir": "director",
+    "hr": "human resources",
+    "ae": "account executive",
+    "sdr": "sales development representative",
+    "bdr": "business development representative",
+}
+
+# Words that don't change what a job title means
+_TITLE_STOPWORDS = {"of", "the", "and", "or", "for", "a", "an", "at", "in"}
+
+
+def _tokens(text: str) -> List[str]:
+    text = (text or "").lower().replace("&", " and ")
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def _singular(token: str) -> str:
+    """Crude singular form, applied to both sides of a comparison ("managers" -> "manager")"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for entity matching.
+
+    Args:
+        name: Company name as written (e.g. "Initech, Inc.")
+
+    Returns:
+        Match key (e.g. "initech"), empty if nothing is left
+    """
+    tokens = _tokens(name)
+    if tokens and tokens[0] == "the":
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens = tokens[:-1]
+    return " ".join(tokens)
+
+
+def title_tokens(title: str) -> List[str]:
+    """
+    Normalize a job title into comparable tokens.
+
+    Abbreviations are expanded, stopwords dropped and plurals folded, so
+    "VP of Sales" and "Vice President, Sales" give the same tokens.
+
+    Args:
+        title: Job title as written
+
+    Returns:
+        Normalized tokens in title order
+    """
+    tokens = []
+    for token in _tokens(title):
+        tokens.extend(TITLE_ABBREVIATIONS.get(token, token).split())
+    return [_singular(token) for token in tokens if token not in _TITLE_STOPWORDS]
+
+
+def normalize_title(title: str) -> str:
+    """Match key for a job title (see title_tokens)"""
+    return " ".join(title_tokens(title))
+
+
+def _merge_sources(existing: List[Dict], new: Iterable[Dict]) -> None:
+    """Append sources whose URL isn't already listed"""
+    seen = {source.get("url") for source in existing}
+    for source in new or []:
+        if isinstance(source, dict) and source.get("url") not in seen:
+            existing.append(source)
+            seen.add(source.get("url"))
+
+
+class _Entities:
+    """Entities of one kind, keyed by normalized name"""
+
+    def __init__(self, normalize):
+        self._normalize = normalize
+        self._entities: Dict[str, Dict] = {}
+
+    def add(self, name: str, evidence: str, sources: Iterable[Dict], **fields) -> Optional[Dict]:
+        """Add a mention of an entity, merging it into an existing one with the same key"""
+        key = self._normalize(name)
+        if not key:
+            return None
+
+        name = name.strip()
+        entity = self._entities.setdefault(key, {"name": name, "aliases": [], "evidence": [], "sources": []})
+        if name not in entity["aliases"]:
+            entity["aliases"].append(name)
+        if evidence not in entity["evidence"]:
+            entity["evidence"].append(evidence)
+        for field, value in fields.items():
+            if isinstance(value, list):
+                entity.setdefault(field, [])
+                entity[field].extend(item for item in value if item not in entity[field])
+            elif value and not entity.get(field):
+                entity[field] = value  # First non-empty value wins
+        _merge_sources(entity["sources"], sources)
+        return entity
+
+    def values(self) -> List[Dict]:
+        entities = list(self._entities.values())
+        for entity in entities:
+            # Aliases other than the display name are enough
+            entity["aliases"] = [alias for alias in entity["aliases"] if alias != entity["name"]]
+        return entities
+
+
+def _attributed_company(attribution: Optional[str]) -> Optional[str]:
+    """Company in a testimonial attribution ("Dana Lee, VP of Sales, Initech" -> "Initech")"""
+    parts = [part.strip() for part in (attribution or "").split(",") if part.strip()]
+    return parts[-1] if len(parts) >= 3 else None
+
+
+def build_entity_index(vendor_elements: Dict[str, List[Dict]]) -> Dict:
+    """
+    Merge Step 6 vendor elements into deduplicated customer and persona entities.
+
+    Args:
+        vendor_elements: Dict with any of case_studies, proof_points,
+            reference_customers, vendor_icp_personas and use_cases (lists of dicts)
+
+    Returns:
+        Dict with keys: customers, personas (merged entities, each with name,
+        aliases, evidence, sources and the merged fields) and stats (mentions
+        in vs entities out)
+    """
+    customers = _Entities(normalize_company_name)
+    personas = _Entities(normalize_title)
+    mentions = {"customers": 0, "personas": 0}
+
+    for customer in vendor_elements.get("reference_customers", []):
+        mentions["customers"] += 1
+        customers.add(
+            customer.get("name", ""), "reference", customer.get("sources"),
+            industry=customer.get("industry"), company_size=customer.get("company_size"),
+            relationship=customer.get("relationship"), logo_url=customer.get("logo_url")
+        )
+
+    for case_study in vendor_elements.get("case_studies", []):
+        mentions["customers"] += 1
+        customers.add(
+            case_study.get("customer_name", ""), "case_study", case_study.get("sources"),
+            industry=case_study.get("industry"), company_size=case_study.get("company_size"),
+            relationship="customer", metrics=case_study.get("metrics", [])
+        )
+
+    for proof_point in vendor_elements.get("proof_points", []):
+        if proof_point.get("type") != "testimonial":
+            continue
+        company = _attributed_company(proof_point.get("source_attribution"))
+        if company:
+            mentions["customers"] += 1
+            customers.add(
+                company, "testimonial", proof_point.get("sources"),
+                relationship="customer", testimonials=[proof_point["content"]] if proof_point.get("content") else []
+            )
+
+    for persona in vendor_elements.get("vendor_icp_personas", []):
+        mentions["personas"] += 1
+        personas.add(
+            persona.get("title", ""), "icp", persona.get("sources"),
+            department=persona.get("department"),
+            responsibilities=persona.get("responsibilities", []), pain_points=persona.get("pain_points", [])
+        )
+
+    for use_case in vendor_elements.get("use_cases", []):
+        if use_case.get("target_persona"):
+            mentions["personas"] += 1
+            personas.add(
+                use_case["target_persona"], "use_case", use_case.get("sources"),
+                use_cases=[use_case["title"]] if use_case.get("title") else []
+            )
+
+    merged_customers = customers.values()
+    merged_personas = personas.values()
+    return {
+        "customers": merged_customers,
+        "personas": merged_personas,
+        "stats": {
+            "customer_mentions": mentions["customers"],
+            "customers": len(merged_customers),
+            "persona_mentions": mentions["personas"],
+            "personas": len(merged_personas)
+        }
+    }
@@ -0,0 +1,232 @@
+"""
+Evidence Candidates
+Fast regex/lexicon pre-pass over scraped vendor markdown that finds proof point
+and reference customer candidates before any LLM sees the pages.
+
+- Statistics ("3x faster", "40% shorter ramp", "$4.2M pipeline", "2,000+ teams")
+  are captured with the sentence around them, testimonials from quote +
+  attribution lines and certifications from a compliance lexicon.
+- Customer names come from logo alt text ("(image: Initech logo)" after
+  minification, or raw "![Initech logo](...)"), "Trusted by ..." lists and
+  testimonial attributions ("- Dana Lee, VP of Sales, Initech").
+
+Candidates are shaped like ProofPoint / ReferenceCustomer dicts, with source URL
+and excerpt. Step 6 hands them to the extractors to validate and enrich (so the
+extractors need less page context), or uses them as-is in the "deterministic"
+extraction mode.
+
+Usage:
+    candidates = find_proof_point_candidates(vendor_content)
+    prompt = f"{format_candidates(candidates, 'proof points')}{page_context}"
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import json
+import re
+
+
+# Numeric claims: multipliers, percentages, money and "N+ <things>" counts
+_STATISTIC_PATTERNS = [
+    re.compile(r"\b\d+(?:\.\d+)?\s?[x×](?![\w-])", re.IGNORECASE),
+    re.compile(r"\b\d+(?:\.\d+)?\s?%"),
+    re.compile(r"[$€£]\s?\d[\d,.]*\s?(?:[KMB]\b|million\b|billion\b)?", re.IGNORECASE),
+    re.compile(
+        r"\b\d[\d,.]*\s?[KM]?\+?\s+(?:[\w-]+\s+)?(?:customers|companies|teams|users|businesses|brands|"
+        r"organizations|enterprises|shippers|reps|sellers|countries|integrations|hours|days|weeks|deals)\b",
+        re.IGNORECASE
+    ),
+]
+
+# Prices are not proof ("$49 per user per month")
+_PRICE_PATTERN = re.compile(r"/\s?(?:mo|month|user|seat|yr|year)\b|\bper\s+(?:month|user|seat|year)\b", re.IGNORECASE)
+
+# Compliance and security credentials
+_CERTIFICATION_PATTERN = re.compile(
+    r"\b(SOC\s?2(?:\s+Type\s+(?:I{1,2}|1|2))?|ISO\s?27001|ISO\s?9001|GDPR|HIPAA|PCI[\s-]DSS|CCPA|FedRAMP)\b",
+    re.IGNORECASE
+)
+
+# > "Quote" - Name, Title, Company
+_TESTIMONIAL_PATTERN = re.compile(r'^>?\s*["“](?P<quote>[^"”]{20,})["”]\s*[-—–]\s*(?P<attribution>.+)$')
+
+# Logo images: minified "(image: Initech logo)" or raw "![Initech logo](url)"
+_LOGO_PATTERNS = [
+    re.compile(r"\(image:\s*(?P<name>[^()]+?)\s+logo\)", re.IGNORECASE),
+    re.compile(r"!\[(?P<name>[^\]]+?)\s+logo\]\((?P<url>[^)\s]+)", re.IGNORECASE),
+]
+
+# Lead-ins to customer name lists ("Trusted by Initech, Hooli and Umbrella")
+_CUSTOMER_LIST_PATTERN = re.compile(
+    r"\b(?:trusted by|used by|loved by|customers include|companies like|teams at|chosen by)\s+(?P<names>[^.:!?]+)",
+    re.IGNORECASE
+)
+
+_MARKDOWN_NOISE = re.compile(r"^\s*(?:[-*+>]|\d+\.|#+)\s*|\*\*|__|`")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"“])")
+_MAX_EXCERPT_CHARS = 300
+
+
+def page_type_for_url(url: str) -> str:
+    """Classify a page from its URL path (e.g. "case_study", "pricing", "homepage")"""
+    path = urlsplit(url if "://" in url else f"https://{url}").path.lower().strip("/")
+    if not path:
+        return "homepage"
+    for page_type, keywords in (
+        ("case_study", ("case-stud", "customer", "success", "stories")),
+        ("pricing", ("pricing", "plans")),
+        ("about", ("about", "company")),
+        ("product", ("product", "platform", "features", "solutions")),
+        ("security", ("security", "trust", "compliance")),
+    ):
+        if any(keyword in path for keyword in keywords):
+            return page_type
+    return "other"
+
+
+def _sentences(markdown: str) -> List[str]:
+    """Plain-text sentences of a markdown page (one line may hold several)"""
+    sentences = []
+    for line in markdown.splitlines():
+        if line.startswith("[") and "]: " in line:
+            continue  # Reference-style link target
+        text = _MARKDOWN_NOISE.sub("", line).strip()
+        if text:
+            sentences.extend(part.strip() for part in _SENTENCE_SPLIT.split(text) if part.strip())
+    return sentences
+
+
+def _source(url: str, excerpt: str) -> Dict:
+    return {"url": url, "page_type": page_type_for_url(url), "excerpt": excerpt[:_MAX_EXCERPT_CHARS]}
+
+
+def _add(candidates: Dict[str, Dict], key: str, candidate: Dict) -> None:
+    """Add a candidate, merging sources into an existing one with the same key"""
+    if key in candidates:
+        known_urls = {source["url"] for source in candidates[key]["sources"]}
+        candidates[key]["sources"].extend(s for s in candidate["sources"] if s["url"] not in known_urls)
+    else:
+        candidates[key] = candidate
+
+
+def find_proof_point_candidates(pages: Dict[str, str]) -> List[Dict]:
+    """
+    Find statistic, testimonial and certification proof points by pattern.
+
+    Args:
+        pages: Dict mapping URL -> markdown
+
+    Returns:
+        ProofPoint-shaped dicts (type, content, source_attribution, sources)
+    """
+    candidates: Dict[str, Dict] = {}
+    for url, markdown in pages.items():
+        for line in (markdown or "").splitlines():
+            match = _TESTIMONIAL_PATTERN.match(line.strip())
+            if match:
+                quote = match.group("quote").strip()
+                _add(candidates, quote.lower(), {
+                    "type": "testimonial",
+                    "content": quote,
+                    "source_attribution": match.group("attribution").strip(),
+                    "sources": [_source(url, line.strip())]
+                })
+
+        for sentence in _sentences(markdown or ""):
+            if sentence.lower() in candidates or sentence.startswith(("\"", "“")):
+                continue  # Testimonial already captured
+
+            is_statistic = any(pattern.search(sentence) for pattern in _STATISTIC_PATTERNS)
+            if is_statistic and not _PRICE_PATTERN.search(sentence) and page_type_for_url(url) != "pricing":
+                _add(candidates, sentence.lower(), {
+                    "type": "statistic",
+                    "content": sentence,
+                    "source_attribution": None,
+                    "sources": [_source(url, sentence)]
+                })
+
+            for match in _CERTIFICATION_PATTERN.finditer(sentence):
+                certification = re.sub(r"\s+", " ", match.group(1)).upper().replace("TYPE I", "Type I")
+                _add(candidates, f"certification:{certification.lower()}", {
+                    "type": "certification",
+                    "content": certification,
+                    "source_attribution": None,
+                    "sources": [_source(url, sentence)]
+                })
+
+    return list(candidates.values())
+
+
+def _clean_name(name: str) -> Optional[str]:
+    """Normalize a candidate company name, rejecting obvious non-names"""
+    name = re.sub(r"\s+", " ", name).strip(" ,;-*")
+    if not name or len(name) > 60 or len(name.split()) > 5 or not name[0].isupper() or re.search(r"\d", name):
+        return None
+    return name
+
+
+def find_customer_candidates(pages: Dict[str, str]) -> List[Dict]:
+    """
+    Find reference customer names by pattern.
+
+    Args:
+        pages: Dict mapping URL -> markdown
+
+    Returns:
+        ReferenceCustomer-shaped dicts (name, logo_url, relationship, sources)
+    """
+    candidates: Dict[str, Dict] = {}
+
+    def add(name: Optional[str], url: str, excerpt: str, logo_url: Optional[str] = None) -> None:
+        name = _clean_name(name or "")
+        if name:
+            _add(candidates, name.lower(), {
+                "name": name,
+                "logo_url": logo_url,
+                "industry": None,
+                "company_size": None,
+                "relationship": "customer",
+                "sources": [_source(url, excerpt)]
+            })
+
+    for url, markdown in pages.items():
+        markdown = markdown or ""
+        for pattern in _LOGO_PATTERNS:
+            for match in pattern.finditer(markdown):
+                add(match.group("name"), url, match.group(0), match.groupdict().get("url"))
+
+        for line in markdown.splitlines():
+            text = _MARKDOWN_NOISE.sub("", line).strip()
+            testimonial = _TESTIMONIAL_PATTERN.match(line.strip())
+            if testimonial:
+                # "Dana Lee, VP of Sales, Initech" - the company comes last
+                parts = [part.strip() for part in testimonial.group("attribution").split(",")]
+                if len(parts) >= 3:
+                    add(parts[-1], url, line.strip())
+
+            for match in _CUSTOMER_LIST_PATTERN.finditer(text):
+                for name in re.split(r",|\band\b|&|\|", match.group("names")):
+                    add(name, url, text)
+
+    return list(candidates.values())
+
+
+def format_candidates(candidates: List[Dict], label: str) -> str:
+    """
+    Format candidates as a prompt section for the extractor that validates them.
+
+    Args:
+        candidates: Candidate dicts from find_proof_point_candidates / find_customer_candidates
+        label: What the candidates are (e.g. "proof points")
+
+    Returns:
+        Prompt section ending in a blank line (empty string when there are no candidates)
+    """
+    if not candidates:
+        return ""
+    return (
+        f"CANDIDATE {label.upper()} (found by pattern matching in the full text of the pages below, with source URL "
+        f"and excerpt): verify each one, drop false positives, correct and enrich the fields, and add any "
+        f"{label} the candidates missed from the content below.\n"
+        f"{json.dumps(candidates, ensure_ascii=False)}\n\n"
+    )
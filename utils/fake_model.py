@@ -0,0 +1,176 @@
+"""
+Fake Model
+Deterministic stand-in for the OpenAI models, for load testing serve.py and the
+workflow without paying for LLM calls.
+
+Returns schema-valid JSON for any agent output_schema (e.g. URLSelectionResult,
+EmailSequenceResult) and plain markdown for agents without one. Latency and
+reported token counts are configurable; outputs depend only on the schema and
+the prompt, so repeated runs are identical.
+
+Selected with LLM_BACKEND=fake (see config.py), which swaps DEFAULT_MODEL,
+FAST_MODEL, REASONING_MODEL and EXTRACTION_MODEL for FakeModel instances.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Tuple, Type, Union, get_args, get_origin
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from pydantic import BaseModel
+
+try:
+    from agno.metrics import MessageMetrics as _UsageMetrics  # Agno 3.x
+except ImportError:
+    from agno.models.metrics import Metrics as _UsageMetrics  # Agno 2.x
+
+_URL_RE = re.compile(r"https?://[^\s\"'<>()\[\]]+")
+
+
+def _constraint(field_info: Any, name: str) -> Optional[float]:
+    for item in getattr(field_info, "metadata", []):
+        if hasattr(item, name):
+            return getattr(item, name)
+    return None
+
+
+class FakeOutputBuilder:
+    """Builds deterministic schema-valid values for Pydantic models"""
+
+    def __init__(self, prompt: str, list_items: int):
+        # URLs from the prompt grouped by host in order of appearance, so e.g. the
+        # vendor and prospect URL lists each pick from their own site
+        self.url_groups: Dict[str, List[str]] = {}
+        for url in dict.fromkeys(_URL_RE.findall(prompt)):
+            self.url_groups.setdefault(re.sub(r"^https?://(www\.)?", "", url).split("/")[0], []).append(url)
+        self.list_items = list_items
+        self._urls: List[str] = []
+        self._url_index = 0
+
+    def _next_url(self) -> str:
+        if not self._urls:
+            return "https://example.com"
+        url = self._urls[self._url_index % len(self._urls)]
+        self._url_index += 1
+        return url
+
+    def build(self, schema: Type[BaseModel], index: int = 1) -> Dict:
+        """Build a field dict for `schema`; top-level list fields each draw URLs from the next host"""
+        groups = list(self.url_groups.values())
+        values = {}
+        for position, (name, field_info) in enumerate(schema.model_fields.items()):
+            if index == 1 and groups and get_origin(field_info.annotation) in (list, List):
+                self._urls, self._url_index = groups[position % len(groups)], 0
+            values[name] = self._value(field_info.annotation, name, index, field_info)
+        return values
+
+    def _value(self, annotation: Any, name: str, index: int, field_info: Any = None) -> Any:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if origin is Union:
+            return self._value(next(arg for arg in args if arg is not type(None)), name, index, field_info)
+        if origin is Literal:
+            return args[(index - 1) % len(args)]
+        if origin in (list, List):
+            return [self._value(args[0] if args else str, name, item, None) for item in range(1, self.list_items + 1)]
+        if origin in (dict, Dict):
+            return {f"key_{item}": f"Sample {item}" for item in range(1, self.list_items + 1)}
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return self.build(annotation, index)
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return list(annotation)[0].value
+        if annotation is bool:
+            return True
+        if annotation in (int, float):
+            low = _constraint(field_info, "ge") or 1
+            below = _constraint(field_info, "lt")
+            high = _constraint(field_info, "le") or (below - 1 if below else max(low, 10))
+            return annotation(min(max(index, low), high))
+        if "url" in name:
+            return self._next_url()
+        # Same value for the same position in any list, so cross-references
+        # (e.g. priority_personas -> persona_title) line up
+        return f"Sample {index}"
+
+
+@dataclass
+class FakeModel(Model):
+    """
+    Agno model that returns deterministic fake outputs without network calls.
+
+    Args:
+        id: Model id to report (keep the real id so rate limits and pricing apply)
+        latency: Mean response latency in seconds
+        latency_jitter: Uniform +/- jitter around the mean, in seconds
+        output_tokens: Output tokens to report per call (0 = estimate from the output)
+        list_items: Items to generate for every list field
+        text_chars: Length of plain-text (no output_schema) responses
+    """
+
+    id: str = "fake"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+
+    # Agno then passes the output_schema class itself as response_format
+    supports_native_structured_outputs: bool = True
+
+    latency: float = 1.0
+    latency_jitter: float = 0.0
+    output_tokens: int = 0
+    list_items: int = 3
+    text_chars: int = 2000
+
+    def _respond(self, messages: List[Any], response_format: Any) -> Tuple[ModelResponse, float]:
+        """Build the response and its simulated latency (returned, not stored: concurrent calls share the model)"""
+        prompt = "\n".join(str(message.content or "") for message in messages if getattr(message, "role", None) == "user")
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        output_schema = response_format if isinstance(response_format, type) and issubclass(response_format, BaseModel) else None
+
+        if output_schema is not None:
+            content = json.dumps(FakeOutputBuilder(prompt, self.list_items).build(output_schema))
+        else:
+            paragraph = "Sample analysis of the page content. " * 8
+            content = "## Summary\n\n" + (paragraph * (self.text_chars // len(paragraph) + 1))[:self.text_chars]
+
+        metrics = _UsageMetrics()
+        metrics.input_tokens = len(prompt) // 4
+        metrics.output_tokens = self.output_tokens or len(content) // 4
+        metrics.total_tokens = metrics.input_tokens + metrics.output_tokens
+
+        response = ModelResponse(role="assistant", content=content)
+        response.response_usage = metrics
+        delay = max(self.latency + random.Random(seed).uniform(-1, 1) * self.latency_jitter, 0.0)
+        return response, delay
+
+    def get_request_params(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return {}
+
+    def invoke(self, messages: List[Any], assistant_message: Any = None, response_format: Any = None, **kwargs: Any) -> ModelResponse:
+        response, delay = self._respond(messages, response_format)
+        time.sleep(delay)
+        return response
+
+    async def ainvoke(self, messages: List[Any], assistant_message: Any = None, response_format: Any = None, **kwargs: Any) -> ModelResponse:
+        response, delay = self._respond(messages, response_format)
+        await asyncio.sleep(delay)
+        return response
+
+    def invoke_stream(self, messages: List[Any], assistant_message: Any = None, response_format: Any = None, **kwargs: Any) -> Iterator[ModelResponse]:
+        yield self.invoke(messages, assistant_message, response_format)
+
+    async def ainvoke_stream(self, messages: List[Any], assistant_message: Any = None, response_format: Any = None, **kwargs: Any) -> AsyncIterator[ModelResponse]:
+        yield await self.ainvoke(messages, assistant_message, response_format)
+
+    def _parse_provider_response(self, response: Any, **kwargs: Any) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
@@ -3,73 +3,339 @@ Firecrawl Helper Functions
 Wrapper functions for Firecrawl Python SDK operations.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from firecrawl import Firecrawl
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
+from utils.circuit_breaker import firecrawl_breaker
+from utils.markdown_minifier import cache_minified, cached_minified, minify_cache_key, minify_markdown
+from utils.profiles import get_profile_setting
+from utils.replay import wrap_firecrawl
+from utils.result_cache import entry_age, get_entry, prune, put_entry
+from utils.revalidation import classify_freshness, schedule_refresh
+from utils.telemetry import record_firecrawl_call
+import hashlib
+import threading
+import time
 import config
 
-# Initialize Firecrawl client
-fc = Firecrawl(api_key=config.FIRECRAWL_API_KEY)
+# Initialize Firecrawl client (wrapped for record/replay when config.REPLAY_MODE is set)
+fc = wrap_firecrawl(Firecrawl(api_key=config.FIRECRAWL_API_KEY, api_url=config.FIRECRAWL_API_URL))
 
+# Last good page copies and minified pages are written off the scrape path by one background thread
+_page_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-cache")
+_stored_pages: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()  # URL -> (content digest, written at)
+_cache_writes: Dict[str, int] = {}  # Namespace -> background writes (prune every FALLBACK_CACHE_PRUNE_EVERY)
+_page_store_lock = threading.Lock()
 
-def map_website(domain: str, limit: int = None) -> Dict:
+
+def minify_page_markdown(markdown: str) -> str:
+    """
+    Minify page markdown for LLM input using config settings.
+
+    Minified output is cached by content hash in memory and in the result cache
+    (MINIFY_CACHE), so a page that hasn't changed is minified once across runs
+    and processes.
+
+    Args:
+        markdown: Raw markdown returned by Firecrawl
+
+    Returns:
+        Minified markdown, or the original markdown if MINIFY_MARKDOWN is disabled
+    """
+    if not config.MINIFY_MARKDOWN:
+        return markdown or ""
+    if not markdown:
+        return ""
+
+    return _minify_persisted(markdown, config.MINIFY_KEEP_IMAGE_ALT, config.MINIFY_MAX_LINK_URL_LENGTH)
+
+
+def _minify_persisted(markdown: str, keep_image_alt: bool, max_link_url_length: int) -> str:
+    """Minify, reusing the result cache entry for this content (shared across processes and restarts)"""
+    if not config.MINIFY_CACHE:
+        return minify_markdown(markdown, keep_image_alt=keep_image_alt, max_link_url_length=max_link_url_length)
+
+    key = minify_cache_key(markdown, keep_image_alt=keep_image_alt, max_link_url_length=max_link_url_length)
+    minified = cached_minified(key)
+    if minified is not None:
+        return minified
+
+    entry = get_entry("minified", key)
+    if entry:
+        cache_minified(key, entry["value"])
+        return entry["value"]
+
+    minified = minify_markdown(markdown, keep_image_alt=keep_image_alt, max_link_url_length=max_link_url_length)
+    _page_writer.submit(_write_entry, "minified", key, minified)
+    return minified
+
+
+def _scrape_max_age() -> int:
+    """Oldest Firecrawl cache entry to accept: SCRAPE_MAX_AGE plus the stale-while-revalidate grace (ms)"""
+    if config.STALE_WHILE_REVALIDATE and config.SCRAPE_MAX_AGE > 0:
+        return config.SCRAPE_MAX_AGE + config.SWR_GRACE_SECONDS * 1000
+    return config.SCRAPE_MAX_AGE
+
+
+def page_freshness(metadata: Dict) -> Dict:
+    """
+    Work out how fresh a scraped page is from Firecrawl's cache metadata.
+
+    Args:
+        metadata: Page metadata dict (cache_state, cached_at)
+
+    Returns:
+        Dict with keys: freshness ("fresh" or "stale", see utils/revalidation.py)
+        and age_seconds (0 for pages fetched live, None if unknown)
+    """
+    cached_at = metadata.get("cached_at")
+    if metadata.get("cache_state") != "hit" or not cached_at:
+        return {"freshness": "fresh", "age_seconds": 0}
+    try:
+        cached_at = datetime.fromisoformat(str(cached_at).replace("Z", "+00:00"))
+    except ValueError:
+        return {"freshness": "fresh", "age_seconds": None}
+    if cached_at.tzinfo is None:
+        cached_at = cached_at.replace(tzinfo=timezone.utc)
+    age = max((datetime.now(timezone.utc) - cached_at).total_seconds(), 0.0)
+    return {"freshness": classify_freshness(age, config.SCRAPE_MAX_AGE / 1000), "age_seconds": round(age)}
+
+
+def _revalidate_page(url: str, formats: List[str]) -> None:
+    """Queue a live re-scrape of a stale page, renewing Firecrawl's cached copy for the next run"""
+    if schedule_refresh(f"page:{url}|{','.join(map(str, formats))}", lambda: scrape_url(url, formats=formats, max_age=0)):
+        print(f"🔄 Serving stale cached page, refreshing in the background: {url}")
+
+
+def _page_telemetry(metadata: Dict) -> Dict:
+    """Cache, credit and queue figures Firecrawl reports in page metadata"""
+    return {
+        "cache_hits": int(metadata.get("cache_state") == "hit"),
+        "cache_misses": int(metadata.get("cache_state") == "miss"),
+        "stale_pages": int(page_freshness(metadata)["freshness"] == "stale"),
+        "credits": metadata.get("credits_used") or 0,
+        "queue_seconds": (metadata.get("concurrency_queue_duration_ms") or 0) / 1000
+    }
+
+
+def _reject_call(operation: str, url: str) -> str:
+    """Record a call the open circuit rejected; returns the error message"""
+    error = "Firecrawl circuit open - failing fast"
+    record_firecrawl_call({"operation": operation, "url": url, "error": error, "circuit_open": True, "duration_seconds": 0})
+    return error
+
+
+def _write_entry(namespace: str, key: str, value: Any) -> None:
+    """Store a per-page cache entry (runs on the page writer thread), pruning the namespace now and then"""
+    put_entry(namespace, key, value)
+
+    with _page_store_lock:
+        _cache_writes[namespace] = _cache_writes.get(namespace, 0) + 1
+        prune_now = _cache_writes[namespace] % config.FALLBACK_CACHE_PRUNE_EVERY == 0
+    if prune_now:
+        removed = prune(namespace, max_age_seconds=config.FALLBACK_CACHE_MAX_AGE, max_entries=config.FALLBACK_CACHE_MAX_PAGES)
+        if removed:
+            print(f"🧹 Evicted {removed} old entries from the {namespace} cache")
+
+
+def _write_page(url: str, fields: Dict) -> None:
+    """Merge a page copy into its cache entry (formats missing from `fields` are kept from older copies)"""
+    previous = (get_entry("page", url) or {}).get("value", {})
+    _write_entry("page", url, {**previous, **fields})
+
+
+def _store_page(url: str, page: Dict) -> None:
+    """
+    Keep the last good copy of a page for outages (formats missing from `page` are kept from older copies).
+
+    The copy is written in the background, and only if the page content changed
+    (or the copy is older than FALLBACK_CACHE_REFRESH_SECONDS, so live pages don't age out).
+    """
+    if not config.FIRECRAWL_FALLBACK_CACHE:
+        return
+    fields = {key: page.get(key) for key in ("markdown", "minified_markdown", "html", "raw_html", "metadata") if page.get(key)}
+    content = "\0".join(str(fields.get(key, "")) for key in ("markdown", "html", "raw_html"))
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    now = time.time()
+    with _page_store_lock:
+        stored = _stored_pages.get(url)
+        if stored and stored[0] == digest and now - stored[1] < config.FALLBACK_CACHE_REFRESH_SECONDS:
+            return
+        _stored_pages[url] = (digest, now)
+        _stored_pages.move_to_end(url)
+        while len(_stored_pages) > config.FALLBACK_CACHE_MAX_PAGES:
+            _stored_pages.popitem(last=False)
+
+    _page_writer.submit(_write_page, url, fields)
+
+
+def _fallback_page(url: str) -> Dict:
+    """
+    Last good copy of a page, for when Firecrawl is unavailable.
+
+    Returns:
+        Page dict shaped like a scrape_url result (freshness "fallback"), or {} if there is none
+    """
+    entry = get_entry("page", url) if config.FIRECRAWL_FALLBACK_CACHE else None
+    if not entry:
+        return {}
+    page = entry["value"]
+    return {
+        "success": True,
+        "url": url,
+        "markdown": page.get("markdown", ""),
+        "minified_markdown": page.get("minified_markdown") or minify_page_markdown(page.get("markdown", "")),
+        "html": page.get("html", ""),
+        "raw_html": page.get("raw_html", ""),
+        "metadata": page.get("metadata", {}),
+        "freshness": "fallback",
+        "age_seconds": round(entry_age(entry))
+    }
+
+
+def _fallback_map(domain: str, cache_key: str) -> Dict:
+    """Cached URL map of any age, for when Firecrawl is unavailable ({} if there is none)"""
+    entry = get_entry("map", cache_key)
+    if not entry:
+        return {}
+    print(f"🛟 Firecrawl unavailable - using the cached URL map for {domain} ({entry_age(entry) / 3600:.1f}h old)")
+    return {**entry["value"], "cached": True, "freshness": "fallback", "age_seconds": round(entry_age(entry))}
+
+
+def map_cache_key(domain: str, limit: int) -> str:
+    """Result cache key of a domain's URL map (maps with other limits are cached separately)"""
+    return f"{domain.rstrip('/').lower()}|{limit}"
+
+
+def map_website(domain: str, limit: int = None, use_cache: bool = True) -> Dict:
     """
     Map website to discover all URLs.
 
+    Successful maps are cached locally for config.MAP_CACHE_TTL seconds. A map
+    within the stale-while-revalidate grace past that is still returned, and
+    remapped in the background. While Firecrawl is unavailable (circuit open or
+    the call fails), a cached map of any age is returned.
+
     Args:
         domain: Domain to map (e.g., "https://example.com")
-        limit: Maximum number of URLs to discover (default: from config)
+        limit: Maximum number of URLs to discover (default: from the run profile)
+        use_cache: Return a cached map that is fresh or stale (False = always map)
 
     Returns:
-        Dict with keys: success, domain, urls, total_urls, error (if failed)
+        Dict with keys: success, domain, urls, total_urls, cached, freshness
+        ("fresh", "stale" or "fallback"), age_seconds, error (if failed)
     """
     if limit is None:
-        limit = config.MAX_URLS_TO_MAP
+        limit = get_profile_setting("max_urls_to_map")
 
+    cache_key = map_cache_key(domain, limit)
+    if use_cache and config.MAP_CACHE_TTL > 0:
+        entry = get_entry("map", cache_key)
+        age = entry_age(entry)
+        freshness = classify_freshness(age, config.MAP_CACHE_TTL)
+        if freshness == "stale" and schedule_refresh(
+            f"map:{cache_key}", lambda: map_website(domain, limit=limit, use_cache=False)
+        ):
+            print(f"🔄 Serving stale URL map for {domain} ({age / 3600:.1f}h old), remapping in the background")
+        if freshness != "expired":
+            if freshness == "fresh":
+                print(f"♻️  Using cached URL map for {domain} ({age / 3600:.1f}h old)")
+            return {**entry["value"], "cached": True, "freshness": freshness, "age_seconds": round(age)}
+
+    if not firecrawl_breaker.allow():
+        error = _reject_call("map", domain)
+        return _fallback_map(domain, cache_key) or _failed_map(domain, error)
+
+    start_time = time.time()
     try:
         result = fc.map(url=domain, limit=limit)
+        firecrawl_breaker.record("map", True, time.time() - start_time)
         # Firecrawl returns a MapData object with .links attribute containing LinkResult objects
         link_results = result.links if hasattr(result, 'links') else []
 
         # Extract just the URL strings from LinkResult objects
         urls = [link.url if hasattr(link, 'url') else str(link) for link in link_results]
 
-        return {
+        record_firecrawl_call({
+            "operation": "map",
+            "url": domain,
+            "urls_found": len(urls),
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+
+        result = {
             "success": True,
             "domain": domain,
             "urls": urls,
             "total_urls": len(urls)
         }
+        if config.MAP_CACHE_TTL > 0:
+            put_entry("map", cache_key, result)
+        return {**result, "cached": False, "freshness": "fresh", "age_seconds": 0}
     except Exception as e:
-        return {
-            "success": False,
-            "domain": domain,
+        firecrawl_breaker.record("map", False, time.time() - start_time)
+        record_firecrawl_call({
+            "operation": "map",
+            "url": domain,
             "error": str(e),
-            "urls": [],
-            "total_urls": 0
-        }
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+        return _fallback_map(domain, cache_key) or _failed_map(domain, str(e))
 
 
-def scrape_url(url: str, formats: List[str] = None) -> Dict:
+def _failed_map(domain: str, error: str) -> Dict:
+    """map_website result for a failed map with no cached fallback"""
+    return {
+        "success": False,
+        "domain": domain,
+        "error": error,
+        "urls": [],
+        "total_urls": 0,
+        "cached": False,
+        "freshness": None,
+        "age_seconds": None
+    }
+
+
+def scrape_url(url: str, formats: List[str] = None, max_age: int = None) -> Dict:
     """
     Scrape a single URL.
 
+    A stale cached copy (see page_freshness) is returned as-is and re-scraped in
+    the background. While Firecrawl is unavailable (circuit open or the call
+    fails), the last good copy of the page is returned (freshness "fallback").
+
     Args:
         url: URL to scrape
         formats: List of formats to return (default: from config)
+        max_age: Oldest Firecrawl cache entry to accept, in ms (default: SCRAPE_MAX_AGE
+            plus the stale-while-revalidate grace, 0 = fresh)
 
     Returns:
-        Dict with keys: success, url, markdown, html, metadata, error (if failed)
+        Dict with keys: success, url, markdown, minified_markdown, html, raw_html, metadata,
+        freshness, age_seconds, error (if failed)
+        (markdown/html/raw_html are empty unless requested in `formats`)
     """
     if formats is None:
         formats = config.DEFAULT_SCRAPE_FORMATS
+    if max_age is None:
+        max_age = _scrape_max_age()
+
+    if not firecrawl_breaker.allow():
+        return _scrape_fallback(url, _reject_call("scrape", url))
 
+    start_time = time.time()
     try:
         result = fc.scrape(
             url,
             formats=formats,
-            wait_for=config.SCRAPE_WAIT_TIME,
-            max_age=config.SCRAPE_MAX_AGE  # 500% faster with cached data!
+            wait_for=get_profile_setting("scrape_wait_time"),
+            max_age=max_age  # 500% faster with cached data!
         )
+        firecrawl_breaker.record("scrape", True, time.time() - start_time)
 
         # Firecrawl returns a ScrapeData object with attributes
         metadata = getattr(result, 'metadata', {})
@@ -79,52 +345,193 @@ def scrape_url(url: str, formats: List[str] = None) -> Dict:
         elif metadata and not isinstance(metadata, dict):
             metadata = {}
 
-        return {
+        markdown = getattr(result, 'markdown', "") or ""
+        freshness = page_freshness(metadata)
+        if freshness["freshness"] == "stale":
+            _revalidate_page(url, formats)
+
+        record_firecrawl_call({
+            "operation": "scrape",
+            "url": url,
+            "formats": formats,
+            "pages": 1,
+            **_page_telemetry(metadata),
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+
+        page = {
             "success": True,
             "url": url,
-            "markdown": getattr(result, 'markdown', ""),
-            "html": getattr(result, 'html', ""),
-            "metadata": metadata
+            "markdown": markdown,
+            "minified_markdown": minify_page_markdown(markdown),
+            "html": getattr(result, 'html', "") or "",
+            "raw_html": getattr(result, 'raw_html', "") or "",
+            "metadata": metadata,
+            **freshness
         }
+        _store_page(url, page)
+        return page
     except Exception as e:
-        return {
-            "success": False,
+        firecrawl_breaker.record("scrape", False, time.time() - start_time)
+        record_firecrawl_call({
+            "operation": "scrape",
             "url": url,
+            "formats": formats,
             "error": str(e),
-            "markdown": "",
-            "html": "",
-            "metadata": {}
-        }
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+        return _scrape_fallback(url, str(e))
+
+
+def _scrape_fallback(url: str, error: str) -> Dict:
+    """scrape_url result when Firecrawl is unavailable: the page's last good copy, else the error"""
+    page = _fallback_page(url)
+    if page:
+        print(f"🛟 Firecrawl unavailable ({error}) - using the last good copy of {url}")
+        return page
+    return {
+        "success": False,
+        "url": url,
+        "error": error,
+        "markdown": "",
+        "minified_markdown": "",
+        "html": "",
+        "raw_html": "",
+        "metadata": {},
+        "freshness": None,
+        "age_seconds": None
+    }
+
+
+def fetch_page_html(url: str) -> str:
+    """
+    Fetch a page's HTML on demand.
+
+    Stages scrape only the formats they consume (config.STAGE_SCRAPE_FORMATS),
+    so HTML is never carried in step outputs. Repeat fetches are served from
+    Firecrawl's cache (config.SCRAPE_MAX_AGE).
+
+    Args:
+        url: Page URL
+
+    Returns:
+        HTML content, or "" if the page could not be scraped
+    """
+    result = scrape_url(url, formats=['html'])
+    return result.get("html", "")
 
 
-def batch_scrape_urls(urls: List[str], formats: List[str] = None) -> Dict[str, Dict]:
+def _poll_batch_job(job_id: str, timeout: float, progress: List[Dict]) -> Tuple[Any, str]:
+    """
+    Poll a batch scrape job adaptively (see Batch Scrape Polling in config.py).
+
+    Polls quickly at first and backs off while the job runs. While pages keep
+    finishing, it doesn't sleep past the job's projected finish. Stops when the job finishes, when the
+    stragglers of a mostly finished job pass BATCH_STRAGGLER_CUTOFF, or at `timeout`.
+
+    Args:
+        job_id: Batch scrape job id
+        timeout: Maximum seconds to wait
+        progress: List the job's progress timeline is appended to (one entry per poll)
+
+    Returns:
+        Tuple of (last job status, outcome), where outcome is "completed",
+        "early_exit" or "timeout"
+    """
+    start_time = time.monotonic()
+    interval = config.BATCH_POLL_INITIAL_INTERVAL
+    threshold_reached_at = None
+
+    while True:
+        job = fc.get_batch_scrape_status(job_id)
+        elapsed = time.monotonic() - start_time
+        completed, total = job.completed or 0, job.total or 0
+        progress.append({"seconds": round(elapsed, 2), "completed": completed, "total": total})
+
+        if job.status == "failed":
+            raise RuntimeError(f"Batch scrape job {job_id} failed")
+        if job.status in ("completed", "cancelled"):
+            return job, "completed"
+
+        if total and completed >= total * config.BATCH_EARLY_EXIT_FRACTION:
+            if threshold_reached_at is None:
+                threshold_reached_at = elapsed
+            if elapsed - threshold_reached_at >= config.BATCH_STRAGGLER_CUTOFF:
+                return job, "early_exit"
+        if elapsed >= timeout:
+            return job, "timeout"
+
+        # Don't sleep past the projected finish, the straggler cutoff or the timeout
+        wait = min(interval, timeout - elapsed)
+        if completed > (progress[-2]["completed"] if len(progress) > 1 else 0):
+            wait = min(wait, max(elapsed / completed * (total - completed), config.BATCH_POLL_INITIAL_INTERVAL))
+        if threshold_reached_at is not None:
+            wait = min(wait, threshold_reached_at + config.BATCH_STRAGGLER_CUTOFF - elapsed)
+        time.sleep(max(wait, 0.05))
+
+        interval = min(interval * config.BATCH_POLL_BACKOFF, config.BATCH_POLL_MAX_INTERVAL)
+
+
+def batch_scrape_urls(urls: List[str], formats: List[str] = None, timeout: float = None,
+                      max_age: int = None) -> Dict[str, Dict]:
     """
     Batch scrape multiple URLs.
 
+    The job is polled adaptively and may finish early, leaving the slowest
+    pages out (see _poll_batch_job). Pages finished by the timeout are kept.
+    While Firecrawl is unavailable (circuit open or the job fails), the last
+    good copies of the requested pages are returned (outcome "fallback").
+
     Args:
         urls: List of URLs to scrape
         formats: List of formats to return (default: markdown only)
+        timeout: Maximum seconds to wait (default: config.BATCH_SCRAPE_TIMEOUT)
+        max_age: Oldest Firecrawl cache entry to accept, in ms (default: SCRAPE_MAX_AGE
+            plus the stale-while-revalidate grace, 0 = fresh)
 
     Returns:
-        Dict with keys: success, results, total_scraped, error (if failed)
-        results is a dict mapping URL -> {markdown, metadata}
+        Dict with keys: success, results, total_scraped, outcome, stale_urls, error (if failed or fallback)
+        results is a dict mapping URL -> {markdown, minified_markdown, metadata, freshness, age_seconds}
+        stale_urls lists the pages served from a stale cache entry (re-scraped in the background)
     """
     if formats is None:
         formats = config.BATCH_SCRAPE_FORMAT
+    if timeout is None:
+        timeout = config.BATCH_SCRAPE_TIMEOUT
+    if max_age is None:
+        max_age = _scrape_max_age()
+
+    if not firecrawl_breaker.allow():
+        return _fallback_batch(urls, _reject_call("batch_scrape", f"{len(urls)} urls"))
 
+    start_time = time.time()
+    progress = []
     try:
-        # Use batch_scrape waiter method with wait_timeout parameter
-        job = fc.batch_scrape(
+        started = fc.start_batch_scrape(
             urls,
             formats=formats,
-            poll_interval=config.BATCH_SCRAPE_POLL_INTERVAL,
-            wait_timeout=config.BATCH_SCRAPE_TIMEOUT,  # Note: wait_timeout, not timeout!
-            max_age=config.SCRAPE_MAX_AGE  # 500% faster with cached data!
+            max_age=max_age  # 500% faster with cached data!
         )
+        job, outcome = _poll_batch_job(started.id, timeout, progress)
+
+        if outcome != "completed":
+            # Stop paying for stragglers; the pages finished so far are used
+            try:
+                fc.cancel_batch_scrape(started.id)
+            except Exception as e:
+                print(f"    Warning: could not cancel batch job {started.id}: {e}")
+
+            pages_done = len(job.data or [])
+            if outcome == "timeout" and not pages_done:
+                raise TimeoutError(f"Batch scrape job {started.id} returned no pages within {timeout} seconds")
+            print(f"⏩ Batch scrape {outcome.replace('_', ' ')}: using {job.completed}/{job.total} finished pages")
+        if urls and not job.data:
+            raise RuntimeError(f"Batch scrape job {started.id} returned none of the {len(urls)} pages")
 
         # Convert to dict keyed by URL
         results = {}
-        for doc in job.data:
+        page_telemetry = []
+        for doc in job.data or []:
             # Get URL from metadata
             url = doc.metadata.source_url if hasattr(doc, 'metadata') and doc.metadata else "unknown"
 
@@ -136,21 +543,77 @@ def batch_scrape_urls(urls: List[str], formats: List[str] = None) -> Dict[str, D
                 elif isinstance(doc.metadata, dict):
                     metadata = doc.metadata
 
+            markdown = (doc.markdown if hasattr(doc, 'markdown') else "") or ""
+            page_telemetry.append(_page_telemetry(metadata))
+
             results[url] = {
-                "markdown": doc.markdown if hasattr(doc, 'markdown') else "",
-                "metadata": metadata
+                "markdown": markdown,
+                "minified_markdown": minify_page_markdown(markdown),
+                "metadata": metadata,
+                **page_freshness(metadata)
             }
 
+        firecrawl_breaker.record("batch_scrape", True, time.time() - start_time)
+        for url, page in results.items():
+            _store_page(url, page)
+
+        stale_urls = [url for url, page in results.items() if page["freshness"] == "stale"]
+        for url in stale_urls:
+            _revalidate_page(url, formats)
+
+        record_firecrawl_call({
+            "operation": "batch_scrape",
+            "urls_requested": len(urls),
+            "formats": formats,
+            "pages": len(results),
+            "cache_hits": sum(page["cache_hits"] for page in page_telemetry),
+            "cache_misses": sum(page["cache_misses"] for page in page_telemetry),
+            "stale_pages": len(stale_urls),
+            "credits": getattr(job, 'credits_used', None) or sum(page["credits"] for page in page_telemetry),
+            "outcome": outcome,
+            "polls": len(progress),
+            "progress": progress,
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+
         return {
             "success": True,
             "results": results,
-            "total_scraped": len(results)
+            "total_scraped": len(results),
+            "outcome": outcome,
+            "stale_urls": stale_urls
         }
 
     except Exception as e:
-        return {
-            "success": False,
+        firecrawl_breaker.record("batch_scrape", False, time.time() - start_time)
+        record_firecrawl_call({
+            "operation": "batch_scrape",
+            "urls_requested": len(urls),
+            "formats": formats,
             "error": str(e),
-            "results": {},
-            "total_scraped": 0
-        }
+            "polls": len(progress),
+            "progress": progress,
+            "duration_seconds": round(time.time() - start_time, 2)
+        })
+        return _fallback_batch(urls, str(e))
+
+
+def _fallback_batch(urls: List[str], error: str) -> Dict:
+    """batch_scrape_urls result built from the last good copies of the requested pages"""
+    results = {}
+    for url in urls:
+        page = _fallback_page(url)
+        if page:
+            results[url] = {key: page[key] for key in ("markdown", "minified_markdown", "metadata", "freshness", "age_seconds")}
+
+    if not results:
+        return {"success": False, "error": error, "results": {}, "total_scraped": 0}
+    print(f"🛟 Firecrawl unavailable ({error}) - using last good copies of {len(results)}/{len(urls)} pages")
+    return {
+        "success": True,
+        "results": results,
+        "total_scraped": len(results),
+        "outcome": "fallback",
+        "stale_urls": [],
+        "error": error
+    }
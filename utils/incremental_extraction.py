@@ -0,0 +1,214 @@
+"""
+Incremental Extraction
+Skips vendor extraction work for pages that haven't changed since the vendor's
+previous run.
+
+Each run stores a content hash per scraped vendor page plus every extractor's
+elements (config.EXTRACTION_STATE_DIR, one file per vendor domain). On the next
+run of the same domain and profile, pages are diffed against those hashes:
+
+- No page changed: the extractor's previous elements are reused, no LLM call.
+- Some pages changed: the extractor only reads the changed pages. Previous
+  elements are carried over unless one of their sources is a changed or
+  removed page, and the new elements are merged in.
+
+Elements without sources can't be traced to a page: they are only reused when
+no page changed, and otherwise re-extracted.
+
+Only pages every extractor saw in full are saved: pages cut from an extractor's
+token budget stay "changed" for the next run. Runs that were degraded for the
+deadline or used a compact/deterministic extraction mode don't save state.
+
+Usage:
+    plan = plan_extraction(vendor_domain, "offerings", vendor_content)
+    if plan.reuse_all:
+        return StepOutput(content={"offerings": plan.carried}, success=True)
+    offerings = plan.merge(extract(plan.page_context(offerings_extractor)))
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import hashlib
+import json
+import re
+import time
+import config
+from utils.profiles import get_profile_name
+from utils.token_budget import pack_page_context
+
+
+# Bump when extractor prompts or element schemas change, so old state isn't reused
+STATE_VERSION = 1
+
+# Field that identifies an element of each kind (used to drop duplicates when merging)
+ELEMENT_IDENTITY_FIELDS = {
+    "offerings": "name",
+    "case_studies": "customer_name",
+    "proof_points": "content",
+    "value_propositions": "statement",
+    "reference_customers": "name",
+    "use_cases": "title",
+    "vendor_icp_personas": "title",
+    "differentiators": "statement",
+}
+
+
+def _normalize_url(url: str) -> str:
+    """Compare URLs without scheme, "www." or trailing slash"""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def page_hashes(pages: Dict[str, str]) -> Dict[str, str]:
+    """
+    Hash page contents for change detection.
+
+    Args:
+        pages: Dict mapping URL -> markdown
+
+    Returns:
+        Dict mapping normalized URL -> SHA-256 of the whitespace-normalized content
+    """
+    return {
+        _normalize_url(url): hashlib.sha256(re.sub(r"\s+", " ", content or "").strip().encode()).hexdigest()
+        for url, content in pages.items()
+    }
+
+
+def _state_path(vendor_domain: str) -> Path:
+    return Path(config.EXTRACTION_STATE_DIR) / f"{_normalize_url(vendor_domain).replace('/', '_')}.json"
+
+
+def load_state(vendor_domain: str) -> Optional[Dict]:
+    """
+    Load the extraction state of a vendor's previous run.
+
+    Returns:
+        State dict, or None if there is none usable for the current profile
+    """
+    path = _state_path(vendor_domain)
+    if not path.exists():
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION or state.get("profile") != get_profile_name():
+        return None  # Elements from another profile were extracted with other models and limits
+    return state
+
+
+def save_state(vendor_domain: str, pages: Dict[str, str], elements: Dict[str, List[Dict]],
+               page_priorities: Optional[Dict[str, int]] = None) -> None:
+    """
+    Store a run's page hashes and extracted elements for the next run of the domain.
+
+    Args:
+        vendor_domain: Vendor domain
+        pages: Dict mapping URL -> markdown the elements were extracted from
+        elements: Dict mapping element kind (e.g. "offerings") -> element dicts
+        page_priorities: Dict mapping URL -> prioritizer priority (kept with the
+            page URLs so the cache warmer can re-scrape and re-extract them)
+    """
+    path = _state_path(vendor_domain)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = {
+        "version": STATE_VERSION,
+        "vendor_domain": vendor_domain,
+        "profile": get_profile_name(),
+        "saved_at": time.time(),
+        "pages": page_hashes(pages),
+        "urls": {url: (page_priorities or {}).get(url, 10) for url in pages},
+        "elements": elements,
+    }
+    tmp_path = path.with_suffix(f".{time.time_ns()}.tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, default=str), encoding="utf-8")
+    tmp_path.replace(path)  # Concurrent runs of the same vendor may save at once
+
+
+class ExtractionPlan:
+    """What one extractor has to (re-)extract this run"""
+
+    def __init__(self, kind: str, pages: Dict[str, str], carried: List[Dict],
+                 changed: List[str], removed: List[str], incremental: bool, unchanged: Optional[List[str]] = None):
+        self.kind = kind
+        self.pages = pages          # Pages the extractor should read
+        self.carried = carried      # Previous elements still backed by unchanged pages
+        self.changed = changed      # New or modified page URLs
+        self.removed = removed      # Previously scraped pages missing this run
+        self.incremental = incremental
+        self.unchanged = unchanged or []  # Pages whose previous elements are still valid
+        self.read: List[str] = []   # Changed pages the extractor saw in full (see page_context)
+
+    @property
+    def reuse_all(self) -> bool:
+        """True if no page changed, so the carried elements are the complete result"""
+        return self.incremental and not self.changed
+
+    def page_context(self, agent, priorities: Optional[Dict[str, int]] = None, max_tokens: Optional[int] = None) -> str:
+        """
+        Pack the pages to read into the agent's budget (see utils/token_budget.py),
+        remembering which of them the agent sees in full.
+        """
+        content, self.read = pack_page_context(self.pages, agent, priorities, max_tokens)
+        return content
+
+    def merge(self, new_elements: List[Dict]) -> List[Dict]:
+        """
+        Combine carried-over elements with elements extracted from the changed pages.
+
+        New elements replace carried ones with the same identity (e.g. offering name).
+        """
+        field = ELEMENT_IDENTITY_FIELDS.get(self.kind)
+
+        def identity(element: Dict) -> str:
+            return str(element.get(field, "")).strip().lower() if field else json.dumps(element, sort_keys=True)
+
+        new_identities = {identity(element) for element in new_elements}
+        return [element for element in self.carried if identity(element) not in new_identities] + list(new_elements)
+
+    def summary(self) -> Dict:
+        return {
+            "incremental": self.incremental,
+            "pages_read": len(self.pages),
+            "changed_pages": len(self.changed),
+            "removed_pages": len(self.removed),
+            "carried_elements": len(self.carried),
+            # Pages this extractor's elements are complete for (Step 6b saves only these)
+            "pages_covered": self.unchanged + self.read,
+        }
+
+
+def plan_extraction(vendor_domain: Optional[str], kind: str, pages: Dict[str, str]) -> ExtractionPlan:
+    """
+    Work out which pages an extractor must read, given the vendor's previous run.
+
+    Args:
+        vendor_domain: Vendor domain (None = no incremental extraction)
+        kind: Element kind the extractor produces (an ELEMENT_IDENTITY_FIELDS key)
+        pages: Dict mapping URL -> markdown scraped this run
+
+    Returns:
+        ExtractionPlan (a full extraction when there's no usable previous state)
+    """
+    state = load_state(vendor_domain) if config.INCREMENTAL_EXTRACTION and vendor_domain else None
+    if not state or kind not in state.get("elements", {}):
+        return ExtractionPlan(kind, pages, [], list(pages), [], incremental=False)
+
+    previous = state["pages"]
+    current = page_hashes(pages)
+    changed = [url for url in pages if previous.get(_normalize_url(url)) != current[_normalize_url(url)]]
+    removed = [url for url in previous if url not in current]
+    stale = {_normalize_url(url) for url in changed} | set(removed)
+
+    # Sourceless elements can't be checked against the changed pages: keep them only when nothing changed
+    carried = [
+        element for element in state["elements"][kind]
+        if (element.get("sources") or not changed)
+        and not any(_normalize_url(source.get("url", "")) in stale for source in element.get("sources") or [])
+    ]
+    unchanged = [url for url in pages if url not in changed]
+    return ExtractionPlan(kind, {url: pages[url] for url in changed}, carried, changed, removed,
+                          incremental=True, unchanged=unchanged)
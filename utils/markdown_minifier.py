@@ -0,0 +1,224 @@
+"""
+Markdown Minifier
+Shrinks Firecrawl markdown before it is sent to the agents (Steps 3, 6 and 7).
+
+Firecrawl markdown is full of image references, long CDN URLs, UTM-tagged links,
+base64 fragments and decorative separators. None of it helps the extractors, but
+all of it costs tokens and latency. This module rewrites the markdown into a
+compact form that keeps the readable text:
+
+- Images are dropped, optionally keeping alt text as "(image: Acme logo)" because
+  the customer extractor uses logo alt text to find reference customers.
+- Link targets are cleaned of tracking parameters and rewritten to short
+  reference-style links ("[Pricing][3]") listed once at the end of the page.
+- Base64 blobs, zero-width characters and decorative lines are removed.
+
+This module has no dependency on config.py so it can be used by offline
+benchmarks without API keys.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Number of distinct pages whose minified output is kept in memory (keyed by content hash)
+MINIFY_CACHE_SIZE = 512
+
+# Query parameters that only exist for click tracking
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "hsctatracking", "__hstc", "__hssc", "__hsfp",
+    "ref", "ref_src", "trk", "trkcampaign", "igshid", "si", "_ga", "_gl",
+}
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_")
+
+_ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+_DATA_URI_RE = re.compile(r"data:[\w/+.-]+;base64,[A-Za-z0-9+/=]+")
+_BASE64_RUN_RE = re.compile(r"[A-Za-z0-9+/]{200,}={0,2}")
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+"[^"]*")?\s*\)')
+_LINK_RE = re.compile(r'(?<!!)\[((?:[^\[\]]|\[[^\[\]]*\])*)\]\(\s*<?([^)\s>]*)>?(?:\s+"[^"]*")?\s*\)')
+_AUTOLINK_RE = re.compile(r"<(https?://[^>\s]+)>")
+_DECORATIVE_LINE_RE = re.compile(r"^[\s\-*_=~•·●▪■□◆◇★☆►▶→←↓↑✓✔✗✘>#\\\u2500-\u257f]*$")
+_REPEATED_PUNCT_RE = re.compile(r"([=*_~.•·-])\1{3,}")
+_MULTI_SPACE_RE = re.compile(r"(?<=\S)[ \t]{2,}")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+_minified: "OrderedDict[str, str]" = OrderedDict()  # Content hash -> minified markdown
+_minified_lock = threading.Lock()
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove tracking parameters and fragments from a URL.
+
+    Args:
+        url: URL or relative path taken from a markdown link
+
+    Returns:
+        URL without utm_*/gclid/etc. query parameters and without #fragment
+    """
+    if not url:
+        return ""
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _image_replacement(match: "re.Match", keep_image_alt: bool) -> str:
+    alt = match.group(1).strip()
+    if keep_image_alt and alt:
+        return f"(image: {alt})"
+    return ""
+
+
+def _minify(markdown: str, keep_image_alt: bool, keep_link_targets: bool, max_link_url_length: int) -> str:
+    text = _ZERO_WIDTH_RE.sub("", markdown).replace("\u00a0", " ")
+
+    # Base64 payloads are never useful to the agents
+    text = _DATA_URI_RE.sub("", text)
+    text = _BASE64_RUN_RE.sub("", text)
+
+    # Images first so linked images ([![alt](img)](href)) collapse to plain links
+    text = _IMAGE_RE.sub(lambda m: _image_replacement(m, keep_image_alt), text)
+
+    references: Dict[str, int] = {}
+
+    def link_replacement(match: "re.Match") -> str:
+        label = match.group(1).strip()
+        target = clean_url(match.group(2).strip())
+
+        if not label:
+            return ""
+
+        if (
+            not keep_link_targets
+            or not target
+            or target.startswith(("#", "javascript:"))
+            or len(target) > max_link_url_length
+        ):
+            return label
+
+        if target not in references:
+            references[target] = len(references) + 1
+        return f"[{label}][{references[target]}]"
+
+    text = _LINK_RE.sub(link_replacement, text)
+    text = _AUTOLINK_RE.sub(lambda m: clean_url(m.group(1)), text)
+
+    # Line-level cleanup: decorative rules, trailing backslash line breaks, padding
+    lines: List[str] = []
+    for line in text.split("\n"):
+        line = line.rstrip().rstrip("\\").rstrip()
+        if _DECORATIVE_LINE_RE.match(line):
+            lines.append("")
+            continue
+        line = _REPEATED_PUNCT_RE.sub(r"\1\1\1", line)
+        line = _MULTI_SPACE_RE.sub(" ", line)
+        lines.append(line)
+
+    text = _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+    if references:
+        reference_block = "\n".join(f"[{number}]: {target}" for target, number in references.items())
+        text = f"{text}\n\n{reference_block}"
+
+    return text
+
+
+def minify_cache_key(
+    markdown: str,
+    keep_image_alt: bool = True,
+    keep_link_targets: bool = True,
+    max_link_url_length: int = 120
+) -> str:
+    """Content hash identifying a page and the minify options (key of the minified output)"""
+    options = f"{keep_image_alt}|{keep_link_targets}|{max_link_url_length}"
+    return hashlib.sha256(f"{options}|{markdown}".encode("utf-8")).hexdigest()
+
+
+def cached_minified(key: str) -> Optional[str]:
+    """Minified markdown kept in memory for a minify_cache_key(), or None"""
+    with _minified_lock:
+        minified = _minified.get(key)
+        if minified is not None:
+            _minified.move_to_end(key)
+        return minified
+
+
+def cache_minified(key: str, minified: str) -> None:
+    """Keep minified markdown in memory under its minify_cache_key(), evicting the oldest pages"""
+    with _minified_lock:
+        _minified[key] = minified
+        _minified.move_to_end(key)
+        while len(_minified) > MINIFY_CACHE_SIZE:
+            _minified.popitem(last=False)
+
+
+def minify_markdown(
+    markdown: str,
+    keep_image_alt: bool = True,
+    keep_link_targets: bool = True,
+    max_link_url_length: int = 120
+) -> str:
+    """
+    Minify scraped markdown for LLM input.
+
+    Results are memoized by content hash, so re-minifying the same page
+    (e.g. the homepage in Step 2 and again in Step 5) is free. Only the hash
+    and the minified text are kept; the raw page is not held in memory.
+
+    Args:
+        markdown: Raw markdown from Firecrawl
+        keep_image_alt: Keep image alt text as "(image: alt)" (default: True)
+        keep_link_targets: Keep cleaned link targets as reference links (default: True)
+        max_link_url_length: Links with longer targets keep only their text (default: 120)
+
+    Returns:
+        Minified markdown (empty string for empty input)
+    """
+    if not markdown:
+        return ""
+
+    key = minify_cache_key(markdown, keep_image_alt, keep_link_targets, max_link_url_length)
+    minified = cached_minified(key)
+    if minified is None:
+        minified = _minify(markdown, keep_image_alt, keep_link_targets, max_link_url_length)
+        cache_minified(key, minified)
+    return minified
+
+
+def minify_stats(original: str, minified: str) -> Dict[str, float]:
+    """
+    Summarize how much a page shrank.
+
+    Args:
+        original: Markdown before minification
+        minified: Markdown after minification
+
+    Returns:
+        Dict with keys: original_chars, minified_chars, saved_chars, saved_pct
+    """
+    original_chars = len(original or "")
+    minified_chars = len(minified or "")
+    saved_chars = original_chars - minified_chars
+
+    return {
+        "original_chars": original_chars,
+        "minified_chars": minified_chars,
+        "saved_chars": saved_chars,
+        "saved_pct": round(100 * saved_chars / original_chars, 1) if original_chars else 0.0
+    }
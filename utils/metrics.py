@@ -0,0 +1,185 @@
+"""
+Prometheus Metrics
+Process-wide metrics for the API server, fed by the step telemetry hooks
+(see utils/telemetry.py) and exposed by serve.py at /metrics.
+
+Requires prometheus-client. Without it (or with METRICS_ENABLED=false) every
+function here is a no-op, so the CLI runs without the dependency.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+from utils.circuit_breaker import get_circuit_breaker_stats
+from utils.rate_limiter import get_rate_limiter_stats
+import config
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+except ImportError:
+    CollectorRegistry = None
+
+
+# Latency buckets (seconds): steps range from sub-second validation to multi-minute batch scrapes
+STEP_LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 180, 300, 600)
+AGENT_LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+METRICS_ENABLED = config.METRICS_ENABLED and CollectorRegistry is not None
+
+if METRICS_ENABLED:
+    registry = CollectorRegistry()
+
+    step_latency = Histogram(
+        "playbook_step_duration_seconds", "Step executor wall time",
+        ["step"], buckets=STEP_LATENCY_BUCKETS, registry=registry
+    )
+    agent_latency = Histogram(
+        "playbook_agent_duration_seconds", "Agent call latency (excluding rate limit queueing)",
+        ["agent", "model"], buckets=AGENT_LATENCY_BUCKETS, registry=registry
+    )
+    agent_queue_latency = Histogram(
+        "playbook_agent_queue_seconds", "Time agent calls waited for rate limit capacity",
+        ["model"], buckets=AGENT_LATENCY_BUCKETS, registry=registry
+    )
+    firecrawl_calls = Counter(
+        "playbook_firecrawl_calls_total", "Firecrawl API calls",
+        ["operation", "outcome"], registry=registry
+    )
+    pages_scraped = Counter(
+        "playbook_pages_scraped_total", "Pages returned by Firecrawl scrapes",
+        ["operation"], registry=registry
+    )
+    tokens = Counter(
+        "playbook_tokens_total", "LLM tokens used",
+        ["agent", "model", "direction"], registry=registry
+    )
+    cache_requests = Counter(
+        "playbook_cache_requests_total", "Firecrawl page cache lookups",
+        ["result"], registry=registry
+    )
+    retries = Counter(
+        "playbook_agent_retries_total", "Agent call retries",
+        ["step", "agent"], registry=registry
+    )
+    failures = Counter(
+        "playbook_failures_total", "Failed steps, agent calls and Firecrawl calls",
+        ["step", "kind"], registry=registry
+    )
+    runs_in_flight = Gauge(
+        "playbook_runs_in_flight", "Workflow runs currently executing",
+        registry=registry
+    )
+    queue_depth = Gauge(
+        "playbook_rate_limit_queue_depth", "Agent calls waiting for rate limit capacity",
+        ["model"], registry=registry
+    )
+    circuit_state = Gauge(
+        "playbook_circuit_state", "Circuit breaker state (1 for the current state, 0 otherwise)",
+        ["service", "state"], registry=registry
+    )
+
+
+def observe_step(step: str, duration_seconds: float, success: bool) -> None:
+    """
+    Record a finished step executor.
+
+    Args:
+        step: Step executor name
+        duration_seconds: Step wall time
+        success: Whether the step succeeded
+    """
+    if not METRICS_ENABLED:
+        return
+    step_latency.labels(step).observe(duration_seconds)
+    if not success:
+        failures.labels(step, "step").inc()
+
+
+def observe_agent_call(step: str, record: Dict) -> None:
+    """
+    Record an agent call from its telemetry record (see utils/agent_runner.py).
+
+    Args:
+        step: Step executor name the call ran in
+        record: Agent call record
+    """
+    if not METRICS_ENABLED:
+        return
+    agent, model = record.get("agent", "unknown"), record.get("model", "unknown")
+
+    if record.get("attempt", 0) > record.get("cascade_level", 0):
+        retries.labels(step, agent).inc()
+    if record.get("error"):
+        failures.labels(step, "agent_call").inc()
+        return
+
+    agent_latency.labels(agent, model).observe(record.get("duration_seconds", 0))
+    agent_queue_latency.labels(model).observe(record.get("queue_seconds", 0))
+    tokens.labels(agent, model, "input").inc(record.get("input_tokens", 0))
+    tokens.labels(agent, model, "output").inc(record.get("output_tokens", 0))
+
+
+def observe_firecrawl_call(step: str, record: Dict) -> None:
+    """
+    Record a Firecrawl call from its telemetry record (see utils/firecrawl_helpers.py).
+
+    Args:
+        step: Step executor name the call ran in
+        record: Firecrawl call record
+    """
+    if not METRICS_ENABLED:
+        return
+    operation = record.get("operation", "unknown")
+
+    if record.get("circuit_open"):
+        firecrawl_calls.labels(operation, "rejected").inc()  # Never reached Firecrawl
+        return
+
+    if record.get("error"):
+        firecrawl_calls.labels(operation, "error").inc()
+        failures.labels(step, "firecrawl_call").inc()
+        return
+
+    firecrawl_calls.labels(operation, "success").inc()
+    pages_scraped.labels(operation).inc(record.get("pages", 0))
+    cache_requests.labels("hit").inc(record.get("cache_hits", 0))
+    cache_requests.labels("miss").inc(record.get("cache_misses", 0))
+    cache_requests.labels("stale").inc(record.get("stale_pages", 0))  # Also counted as hits
+
+
+@contextmanager
+def track_run() -> Iterator[None]:
+    """Count a workflow run as in flight for the duration of the block"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    runs_in_flight.inc()
+    try:
+        yield
+    finally:
+        runs_in_flight.dec()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple of (payload, content type)
+
+    Raises:
+        ImportError: If prometheus-client is not installed
+    """
+    if CollectorRegistry is None:
+        raise ImportError("`prometheus-client` not installed. Please install using `pip install prometheus-client`")
+    if not METRICS_ENABLED:
+        return b"", CONTENT_TYPE_LATEST
+
+    # Queue depth is sampled at scrape time from the rate limiters
+    for model_id, stats in get_rate_limiter_stats().items():
+        queue_depth.labels(model_id).set(stats["queue_depth"])
+
+    for service, stats in get_circuit_breaker_stats().items():
+        for state in ("closed", "open", "half_open"):
+            circuit_state.labels(service, state).set(int(stats["state"] == state))
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,132 @@
+"""
+Output Validation
+Small checks on agent structured output, used by run_agent() to decide whether
+to escalate a model cascade to the strong model or retry a failed call.
+
+A validator takes the agent's response.content and returns None when the
+output is acceptable, or a short reason string when it is not.
+
+Usage:
+    run_agent(
+        pain_point_analyst,
+        prompt,
+        validate=all_of(require_items("pain_points", 2))
+    )
+"""
+
+from typing import Any, Callable, Optional
+
+
+Validator = Callable[[Any], Optional[str]]
+
+
+def _get_path(content: Any, path: str) -> Any:
+    value = content
+    for part in path.split("."):
+        if value is None:
+            return None
+        value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+    return value
+
+
+def require_items(field: str, min_items: int = 1) -> Validator:
+    """
+    Require a list field with at least `min_items` entries.
+
+    Args:
+        field: Field name or dotted path (e.g. "vendor_selected_urls")
+        min_items: Minimum number of items (default: 1)
+
+    Returns:
+        Validator function
+    """
+    def check(content: Any) -> Optional[str]:
+        items = _get_path(content, field)
+        if not isinstance(items, list):
+            return f"missing list field '{field}'"
+        if len(items) < min_items:
+            return f"'{field}' has {len(items)} items (expected at least {min_items})"
+        return None
+
+    return check
+
+
+def require_lists(*fields: str) -> Validator:
+    """
+    Require list fields to be present (they may be empty).
+
+    Catches malformed structured output without rejecting pages that
+    genuinely contain nothing to extract.
+
+    Args:
+        *fields: Field names or dotted paths (e.g. "offerings")
+
+    Returns:
+        Validator function
+    """
+    def check(content: Any) -> Optional[str]:
+        missing = [field for field in fields if not isinstance(_get_path(content, field), list)]
+        if missing:
+            return f"missing list fields: {', '.join(missing)}"
+        return None
+
+    return check
+
+
+def require_fields(*fields: str) -> Validator:
+    """
+    Require fields to be present and non-empty.
+
+    Args:
+        *fields: Field names or dotted paths (e.g. "company_profile.company_name")
+
+    Returns:
+        Validator function
+    """
+    def check(content: Any) -> Optional[str]:
+        missing = [field for field in fields if not _get_path(content, field)]
+        if missing:
+            return f"empty required fields: {', '.join(missing)}"
+        return None
+
+    return check
+
+
+def require_text(min_chars: int) -> Validator:
+    """
+    Require plain-text output (agents without output_schema) of a minimum length.
+
+    Args:
+        min_chars: Minimum number of characters
+
+    Returns:
+        Validator function
+    """
+    def check(content: Any) -> Optional[str]:
+        if not isinstance(content, str) or len(content.strip()) < min_chars:
+            return f"text output shorter than {min_chars} characters"
+        return None
+
+    return check
+
+
+def all_of(*validators: Validator) -> Validator:
+    """
+    Combine validators; the first failing check's reason is returned.
+
+    Args:
+        *validators: Validator functions
+
+    Returns:
+        Validator function
+    """
+    def check(content: Any) -> Optional[str]:
+        if content is None:
+            return "agent returned no content"
+        for validator in validators:
+            problem = validator(content)
+            if problem:
+                return problem
+        return None
+
+    return check
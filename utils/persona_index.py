@@ -0,0 +1,165 @@
+"""
+Persona Index
+Ranked fuzzy lookup of prospect buyer personas by title, shared by the Step 8
+email sequence and talk track steps.
+
+The orchestrator is told to repeat persona titles verbatim, but long titles
+("VP / Head of Sales (or Chief Revenue Officer)") still come back reworded.
+Titles are normalized once when the index is built (abbreviations expanded,
+stopwords and plurals folded - see utils/entity_index.title_tokens), and an
+inverted token index narrows each lookup to personas sharing at least one
+token, so lookups stay fast with thousands of personas (batch runs).
+
+Scores (0-1) average token overlap (Dice), containment (the shorter title's
+tokens found in the longer one) and character similarity of the normalized
+titles. Seniority words ("chief", "head", "vice president") count half, so
+"CRO" doesn't match "Chief Marketing Officer" on "chief ... officer" alone.
+Character similarity - the slow part - is only computed for the best
+candidates by token score, with rapidfuzz when installed, difflib otherwise.
+
+Usage:
+    index = get_persona_index(prospect_intel["target_buyer_personas"])
+    persona, score = index.best_match("VP Sales") or (None, 0.0)
+"""
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+import threading
+import config
+from utils.entity_index import title_tokens
+from utils.telemetry import get_run_key
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    # rapidfuzz is optional - fall back to difflib
+    fuzz = None
+
+
+# Title words shared by many unrelated roles, weighted down in token scores
+_SENIORITY_TOKENS = {
+    "chief", "officer", "vice", "president", "head", "director", "manager", "senior",
+    "junior", "executive", "lead", "leader", "global", "principal", "assistant"
+}
+_SENIORITY_WEIGHT = 0.5
+
+# Candidates (by token score) that also get the character similarity score, per result wanted
+_RESCORE_FACTOR = 10
+
+# Indexes built per run (email sequences and talk tracks share one), most recent last
+_MAX_CACHED_INDEXES = 64
+_indexes: "OrderedDict[Tuple[str, str], PersonaIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _weight(tokens: Set[str]) -> float:
+    return sum(_SENIORITY_WEIGHT if token in _SENIORITY_TOKENS else 1.0 for token in tokens)
+
+
+def _text_similarity(a: str, b: str) -> float:
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class PersonaIndex:
+    """Title lookup over a list of persona dicts"""
+
+    def __init__(self, personas: List[Dict], title_field: str = "persona_title"):
+        self.personas = personas
+        self._keys: List[str] = []
+        self._token_sets: List[Set[str]] = []
+        self._exact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        for position, persona in enumerate(personas):
+            tokens = title_tokens(persona.get(title_field, ""))
+            key = " ".join(tokens)
+            self._keys.append(key)
+            self._token_sets.append(set(tokens))
+            self._exact.setdefault(key, position)
+            for token in set(tokens):
+                self._postings.setdefault(token, []).append(position)
+
+    def _token_score(self, tokens: Set[str], position: int) -> float:
+        """Weighted Dice + containment (0-2)"""
+        other = self._token_sets[position]
+        overlap = _weight(tokens & other)
+        dice = 2 * overlap / (_weight(tokens) + _weight(other))
+        containment = overlap / min(_weight(tokens), _weight(other))
+        return dice + containment
+
+    def match(self, title: str, limit: int = 5, threshold: float = 0.0) -> List[Tuple[Dict, float]]:
+        """
+        Find the personas whose titles best match `title`.
+
+        Args:
+            title: Title to look up (e.g. a priority persona from the playbook summary)
+            limit: Maximum number of matches
+            threshold: Minimum score (0-1)
+
+        Returns:
+            (persona, score) pairs, best first
+        """
+        tokens = title_tokens(title)
+        key = " ".join(tokens)
+        if not tokens:
+            return []
+
+        token_set = set(tokens)
+        exact = self._exact.get(key)
+        scores = {exact: 1.0} if exact is not None else {}
+
+        candidates = {position for token in token_set for position in self._postings.get(token, [])}
+        token_scores = sorted(
+            ((self._token_score(token_set, position), position) for position in candidates if position not in scores),
+            key=lambda item: (-item[0], item[1])
+        )
+        for token_score, position in token_scores[:limit * _RESCORE_FACTOR]:
+            scores[position] = round((token_score + _text_similarity(key, self._keys[position])) / 3, 3)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.personas[position], score) for position, score in ranked[:limit] if score >= threshold]
+
+    def best_match(self, title: str, threshold: Optional[float] = None) -> Optional[Tuple[Dict, float]]:
+        """
+        Get the best matching persona and its score.
+
+        Args:
+            title: Title to look up
+            threshold: Minimum score (None = config.PERSONA_MATCH_THRESHOLD)
+
+        Returns:
+            (persona, score), or None if nothing scores above the threshold
+        """
+        if threshold is None:
+            threshold = config.PERSONA_MATCH_THRESHOLD
+        matches = self.match(title, limit=1, threshold=threshold)
+        return matches[0] if matches else None
+
+
+def get_persona_index(personas: List[Dict]) -> PersonaIndex:
+    """
+    Get the persona index for the current run, building it on first use.
+
+    Args:
+        personas: Persona dicts with a "persona_title" field
+
+    Returns:
+        PersonaIndex (shared by every step of the run that passes the same personas)
+    """
+    titles = json.dumps([persona.get("persona_title", "") for persona in personas])
+    cache_key = (get_run_key(), hashlib.sha256(titles.encode()).hexdigest())
+
+    with _lock:
+        index = _indexes.get(cache_key)
+        if index is None:
+            index = _indexes[cache_key] = PersonaIndex(personas)
+            while len(_indexes) > _MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(cache_key)
+        return index
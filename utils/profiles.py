@@ -0,0 +1,119 @@
+"""
+Execution Profiles
+Named quality/latency trade-offs (config.EXECUTION_PROFILES) selected per run,
+so interactive requests and overnight batch jobs can share one server.
+
+A profile bundles page limits, models per agent, extraction mode, persona count
+and scrape wait time. The run's profile is made visible to every step by
+instrument_step; settings a profile leaves out fall back to the module-level
+constants in config.py.
+
+Usage:
+    max_urls = get_profile_setting("max_urls_to_scrape")
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+import config
+
+
+# Profile settings and the module-level config constant each one falls back to
+_DEFAULTS = {
+    "max_urls_to_map": "MAX_URLS_TO_MAP",
+    "max_urls_for_prioritization": "MAX_URLS_FOR_PRIORITIZATION",
+    "max_urls_to_scrape": "MAX_URLS_TO_SCRAPE",
+    "scrape_wait_time": "SCRAPE_WAIT_TIME",
+    "extraction_mode": "EXTRACTION_MODE",
+    "persona_count": "PLAYBOOK_PERSONA_COUNT",
+    "deadline_seconds": "RUN_DEADLINE_SECONDS",
+}
+
+# Name of the profile of the run executing the current step
+_current_profile: ContextVar[Optional[str]] = ContextVar("_current_profile", default=None)
+
+
+def resolve_profile_name(name: Optional[str]) -> str:
+    """
+    Resolve a requested profile name to a configured profile.
+
+    Args:
+        name: Profile name (None = config.DEFAULT_PROFILE)
+
+    Returns:
+        Profile name
+
+    Raises:
+        ValueError: If the profile is not defined in config.EXECUTION_PROFILES
+    """
+    name = (name or config.DEFAULT_PROFILE).strip().lower()
+    if name not in config.EXECUTION_PROFILES:
+        raise ValueError(f"Unknown profile '{name}' (choose from: {', '.join(config.EXECUTION_PROFILES)})")
+    return name
+
+
+@contextmanager
+def step_profile(name: Optional[str]) -> Iterator[None]:
+    """
+    Make a run's profile visible to the step executor running in this context.
+
+    Args:
+        name: Profile name (None = config.DEFAULT_PROFILE)
+    """
+    token = _current_profile.set(resolve_profile_name(name))
+    try:
+        yield
+    finally:
+        _current_profile.reset(token)
+
+
+def get_profile_name() -> str:
+    """Name of the profile of the run executing the current step (default profile outside a step)"""
+    return _current_profile.get() or resolve_profile_name(None)
+
+
+def get_profile_setting(key: str) -> Any:
+    """
+    Get a setting from the current run's profile.
+
+    Args:
+        key: Setting name (e.g. "max_urls_to_scrape")
+
+    Returns:
+        The profile's value, or the config.py constant it falls back to
+    """
+    profile = config.EXECUTION_PROFILES[get_profile_name()]
+    if key in profile:
+        return profile[key]
+    return getattr(config, _DEFAULTS[key])
+
+
+def get_profile_model(agent_name: str) -> Any:
+    """
+    Get the model the current run's profile pins an agent to.
+
+    Args:
+        agent_name: Agent name (e.g. "Pain Point Analyst")
+
+    Returns:
+        Model, or None if the profile keeps the agent's own model and cascade
+    """
+    profile = config.EXECUTION_PROFILES[get_profile_name()]
+    return profile.get("models", {}).get(agent_name)
+
+
+def describe_profile(name: Optional[str] = None) -> Dict:
+    """
+    Get the effective settings of a profile (for run metadata and benchmarks).
+
+    Args:
+        name: Profile name (None = config.DEFAULT_PROFILE)
+
+    Returns:
+        Dict with the profile name, every setting and the pinned model id per agent
+    """
+    name = resolve_profile_name(name)
+    profile = config.EXECUTION_PROFILES[name]
+    settings = {key: profile.get(key, getattr(config, default)) for key, default in _DEFAULTS.items()}
+    settings["models"] = {agent: getattr(model, "id", str(model)) for agent, model in profile.get("models", {}).items()}
+    return {"profile": name, **settings}
@@ -0,0 +1,298 @@
+"""
+Rate Limiter
+Process-wide token-bucket limiter for OpenAI requests-per-minute (RPM) and
+tokens-per-minute (TPM), with optional Postgres-backed buckets shared across
+processes.
+
+One run fires up to 8 concurrent extractor calls, and concurrent API runs
+multiply that. Every agent call reserves its estimated tokens here before it is
+sent, so throughput stays smooth instead of bursting into 429s.
+
+Fairness: waiting calls are queued per run and served round-robin, so one run
+with many queued extractor calls cannot starve another run.
+"""
+
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+import threading
+import time
+import config
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def seconds_until_available(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing / self.refill_per_second, 0.0)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket (may go negative when correcting estimates)"""
+        self._refill()
+        self.tokens -= amount
+
+
+class PostgresTokenBuckets:
+    """
+    Token buckets stored in Postgres so several server processes share one budget.
+
+    Each bucket is a row in the playbook_rate_limits table. Taking tokens is a
+    single transaction with row locks, so concurrent processes never oversubscribe.
+    """
+
+    TABLE = "playbook_rate_limits"
+
+    def __init__(self, db_url: str):
+        try:
+            import psycopg
+        except ImportError:
+            raise ImportError("`psycopg` not installed. Please install using `pip install 'psycopg[binary]'`")
+
+        self._psycopg = psycopg
+        self._db_url = db_url
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                "bucket TEXT PRIMARY KEY, tokens DOUBLE PRECISION NOT NULL, "
+                "capacity DOUBLE PRECISION NOT NULL, refill_per_second DOUBLE PRECISION NOT NULL, "
+                "updated_at DOUBLE PRECISION NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = self._psycopg.connect(self._db_url, autocommit=True)
+            self._local.conn = conn
+        return conn
+
+    def try_take(self, buckets: Dict[str, TokenBucket], amounts: Dict[str, float]) -> float:
+        """
+        Atomically take tokens from several shared buckets.
+
+        Args:
+            buckets: Dict mapping bucket key -> local TokenBucket (capacity/refill definition)
+            amounts: Dict mapping bucket key -> tokens to take
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds to wait before retrying
+        """
+        conn = self._connect()
+        now = time.time()
+
+        with conn.transaction():
+            for key, bucket in buckets.items():
+                conn.execute(
+                    f"INSERT INTO {self.TABLE} (bucket, tokens, capacity, refill_per_second, updated_at) "
+                    "VALUES (%s, %s, %s, %s, %s) ON CONFLICT (bucket) DO NOTHING",
+                    (key, bucket.capacity, bucket.capacity, bucket.refill_per_second, now)
+                )
+
+            rows = conn.execute(
+                f"SELECT bucket, tokens, capacity, refill_per_second, updated_at FROM {self.TABLE} "
+                "WHERE bucket = ANY(%s) ORDER BY bucket FOR UPDATE",
+                (list(buckets),)
+            ).fetchall()
+
+            wait_seconds = 0.0
+            refilled = {}
+            for key, tokens, capacity, refill_per_second, updated_at in rows:
+                refilled[key] = min(capacity, tokens + (now - updated_at) * refill_per_second)
+                missing = min(amounts[key], capacity) - refilled[key]
+                wait_seconds = max(wait_seconds, missing / refill_per_second)
+
+            if wait_seconds > 0:
+                return wait_seconds
+
+            for key, tokens in refilled.items():
+                conn.execute(
+                    f"UPDATE {self.TABLE} SET tokens = %s, updated_at = %s WHERE bucket = %s",
+                    (tokens - amounts[key], now, key)
+                )
+
+        return 0.0
+
+    def adjust(self, key: str, token_delta: float) -> None:
+        """
+        Correct a shared bucket once actual usage is known.
+
+        Args:
+            key: Bucket key (e.g. "gpt-4o:tpm")
+            token_delta: Actual tokens minus taken tokens (negative refunds tokens)
+        """
+        conn = self._connect()
+        with conn.transaction():
+            conn.execute(
+                f"UPDATE {self.TABLE} SET tokens = LEAST(capacity, tokens - %s) WHERE bucket = %s",
+                (token_delta, key)
+            )
+
+
+class RateLimiter:
+    """
+    RPM + TPM limiter for one model, with round-robin fair queueing between runs.
+
+    Usage:
+        limiter = get_rate_limiter("gpt-4o")
+        queue_seconds, reserved_tokens = limiter.acquire(estimated_tokens, run_key=run_id)
+        response = agent.run(...)
+        limiter.adjust(actual_tokens - reserved_tokens)
+    """
+
+    def __init__(self, model_id: str, rpm: int, tpm: int, shared: Optional[PostgresTokenBuckets] = None):
+        self.model_id = model_id
+        self.requests = TokenBucket(rpm, rpm / 60)
+        self.tokens = TokenBucket(tpm, tpm / 60)
+        self.shared = shared
+
+        self._condition = threading.Condition()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._stats = {"calls": 0, "waited_calls": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def _is_next(self, run_key: str, ticket: object) -> bool:
+        first_run = next(iter(self._queues), None)
+        return first_run == run_key and self._queues[run_key][0] is ticket
+
+    def _wait_shared(self, tokens: float) -> None:
+        buckets = {f"{self.model_id}:rpm": self.requests, f"{self.model_id}:tpm": self.tokens}
+        amounts = {f"{self.model_id}:rpm": 1, f"{self.model_id}:tpm": tokens}
+        while True:
+            wait_seconds = self.shared.try_take(buckets, amounts)
+            if wait_seconds <= 0:
+                return
+            time.sleep(min(wait_seconds, 5.0))
+
+    def acquire(self, tokens: int, run_key: str = "default") -> Tuple[float, float]:
+        """
+        Block until one request and `tokens` tokens are available.
+
+        Calls larger than the TPM bucket reserve a full bucket; pass the reserved
+        amount (not the estimate) to adjust() once actual usage is known.
+
+        Args:
+            tokens: Estimated tokens for the call (input + expected output)
+            run_key: Identifier of the workflow run making the call (for fair queueing)
+
+        Returns:
+            Tuple of (seconds spent waiting in the queue, tokens actually reserved)
+        """
+        tokens = min(tokens, self.tokens.capacity)  # Oversized calls wait for a full bucket, never forever
+        start_time = time.monotonic()
+        ticket = object()
+
+        with self._condition:
+            self._queues.setdefault(run_key, deque()).append(ticket)
+
+            while True:
+                wait_seconds = None
+                if self._is_next(run_key, ticket):
+                    wait_seconds = max(
+                        self.requests.seconds_until_available(1),
+                        self.tokens.seconds_until_available(tokens)
+                    )
+                    if wait_seconds <= 0:
+                        break
+                self._condition.wait(timeout=wait_seconds)
+
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+
+            # Round-robin: this run goes to the back of the line
+            self._queues[run_key].popleft()
+            if self._queues[run_key]:
+                self._queues.move_to_end(run_key)
+            else:
+                del self._queues[run_key]
+            self._condition.notify_all()
+
+        if self.shared is not None:
+            self._wait_shared(tokens)
+
+        queue_seconds = time.monotonic() - start_time
+        with self._condition:
+            self._stats["calls"] += 1
+            self._stats["total_wait_seconds"] += queue_seconds
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], queue_seconds)
+            if queue_seconds >= 0.01:
+                self._stats["waited_calls"] += 1
+
+        return queue_seconds, tokens
+
+    def adjust(self, token_delta: float) -> None:
+        """
+        Correct the token bucket (and the shared bucket, if any) once actual usage is known.
+
+        Args:
+            token_delta: Actual tokens minus the tokens acquire() reserved (negative refunds tokens)
+        """
+        with self._condition:
+            self.tokens.consume(token_delta)
+            self._condition.notify_all()
+
+        if self.shared is not None and token_delta:
+            self.shared.adjust(f"{self.model_id}:tpm", token_delta)
+
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for capacity"""
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict:
+        """Queue wait metrics for this limiter"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["queue_depth"] = sum(len(queue) for queue in self._queues.values())
+        stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+_shared_buckets: Optional[PostgresTokenBuckets] = None
+
+
+def get_rate_limiter(model_id: str) -> RateLimiter:
+    """
+    Get the process-wide limiter for a model (created on first use).
+
+    Limits come from config.MODEL_RATE_LIMITS. If config.RATE_LIMIT_DB_URL is
+    set, buckets are shared across processes through Postgres.
+
+    Args:
+        model_id: OpenAI model id (e.g. "gpt-4o")
+
+    Returns:
+        RateLimiter for the model
+    """
+    global _shared_buckets
+
+    with _limiters_lock:
+        if model_id not in _limiters:
+            if config.RATE_LIMIT_DB_URL and _shared_buckets is None:
+                _shared_buckets = PostgresTokenBuckets(config.RATE_LIMIT_DB_URL)
+
+            limits = config.MODEL_RATE_LIMITS.get(model_id, config.DEFAULT_RATE_LIMIT)
+            _limiters[model_id] = RateLimiter(model_id, limits["rpm"], limits["tpm"], shared=_shared_buckets)
+
+        return _limiters[model_id]
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict]:
+    """Queue wait metrics for every model limiter in this process"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.model_id: limiter.stats() for limiter in limiters}
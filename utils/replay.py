@@ -0,0 +1,231 @@
+"""
+Record/Replay
+Captures Firecrawl and agent responses to disk and serves them back later, so the
+full workflow can run offline (benchmarks, CI) without network calls or credits.
+
+Controlled by config.REPLAY_MODE:
+    off     - normal operation
+    record  - call the real services and save every response to config.REPLAY_DIR
+    replay  - serve saved responses, sleeping for the recorded latency scaled by
+              config.REPLAY_LATENCY_SCALE
+
+Recordings are keyed by a hash of the request (Firecrawl operation + arguments,
+or agent name + prompt), one JSON file per call:
+    <REPLAY_DIR>/firecrawl/<operation>-<hash>.json
+    <REPLAY_DIR>/agents/<agent-name>-<hash>.json
+
+Usage:
+    REPLAY_MODE=record python main.py gong.io sendoso.com
+    REPLAY_MODE=replay python -m benchmarks.bench_workflow gong.io sendoso.com
+"""
+
+from firecrawl.v2.types import BatchScrapeJob, BatchScrapeResponse, Document, MapData
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import re
+import time
+import config
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when no recording exists for a request"""
+
+
+def _key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _path(kind: str, name: str, key: str) -> Path:
+    return Path(config.REPLAY_DIR) / kind / f"{_slug(name)}-{key}.json"
+
+
+def _save(path: Path, recording: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(recording, indent=2, default=str), encoding="utf-8")
+    tmp_path.replace(path)  # Parallel steps may record concurrently
+
+
+def _load(path: Path, sleep: bool = True) -> Dict:
+    if not path.exists():
+        raise ReplayMissError(f"No recording at {path} (record one with REPLAY_MODE=record)")
+    recording = json.loads(path.read_text(encoding="utf-8"))
+    if sleep:
+        time.sleep(recording.get("duration_seconds", 0) * config.REPLAY_LATENCY_SCALE)
+    return recording
+
+
+def _dump(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+class ReplayFirecrawl:
+    """
+    Drop-in wrapper for the Firecrawl client's map/scrape/batch_scrape and the
+    batch job calls (start_batch_scrape, get_batch_scrape_status, cancel_batch_scrape).
+
+    In record mode calls pass through to the real client and responses are
+    saved; in replay mode the real client is never called.
+
+    Batch jobs are keyed by their request, not the job id (which changes every
+    run). Each status poll overwrites the job's recording, so it ends up holding
+    the last status seen, timed from the start of the job (marked "cancelled" if
+    the job was abandoned). Replay serves that status on the first poll, after
+    the recorded job duration.
+    """
+
+    def __init__(self, client: Any, mode: str):
+        self._client = client
+        self._mode = mode
+        # Job id -> (recording key, start time) for batch jobs started by this process
+        self._batch_jobs: Dict[str, tuple] = {}
+
+    def _call(self, operation: str, result_type: Callable[[Dict], Any], args: Dict, call: Callable[[], Any]) -> Any:
+        path = _path("firecrawl", operation, _key(operation, args))
+
+        if self._mode == "replay":
+            recording = _load(path)
+            if "error" in recording:
+                raise RuntimeError(recording["error"])
+            return result_type(recording["response"])
+
+        start_time = time.time()
+        try:
+            result = call()
+        except Exception as e:
+            _save(path, {"operation": operation, "args": args, "error": str(e),
+                         "duration_seconds": round(time.time() - start_time, 3)})
+            raise
+        _save(path, {"operation": operation, "args": args, "response": _dump(result),
+                     "duration_seconds": round(time.time() - start_time, 3)})
+        return result
+
+    def map(self, url: str, **kwargs: Any) -> Any:
+        return self._call("map", MapData.model_validate, {"url": url, **kwargs},
+                          lambda: self._client.map(url=url, **kwargs))
+
+    def scrape(self, url: str, **kwargs: Any) -> Any:
+        args = {key: value for key, value in kwargs.items() if key != "max_age"}
+        return self._call("scrape", Document.model_validate, {"url": url, **args},
+                          lambda: self._client.scrape(url, **kwargs))
+
+    def batch_scrape(self, urls: list, **kwargs: Any) -> Any:
+        # Polling and cache settings don't change the result, so they aren't part of the key
+        args = {key: value for key, value in kwargs.items() if key not in ("poll_interval", "wait_timeout", "max_age")}
+        return self._call("batch_scrape", BatchScrapeJob.model_validate, {"urls": sorted(urls), **args},
+                          lambda: self._client.batch_scrape(urls, **kwargs))
+
+    def start_batch_scrape(self, urls: list, **kwargs: Any) -> Any:
+        args = {key: value for key, value in kwargs.items() if key != "max_age"}
+        key = _key("batch_scrape_job", {"urls": sorted(urls), **args})
+
+        if self._mode == "replay":
+            return BatchScrapeResponse(id=key, url=f"replay://batch_scrape_job/{key}")
+
+        response = self._client.start_batch_scrape(urls, **kwargs)
+        self._batch_jobs[response.id] = (key, time.time())
+        return response
+
+    def get_batch_scrape_status(self, job_id: str, **kwargs: Any) -> Any:
+        if self._mode == "replay":
+            # Only the first poll waits for the recorded job duration
+            first_poll = job_id not in self._batch_jobs
+            self._batch_jobs.setdefault(job_id, (job_id, time.time()))
+            recording = _load(_path("firecrawl", "batch_scrape_job", job_id), sleep=first_poll)
+            return BatchScrapeJob.model_validate(recording["response"])
+
+        key, started_at = self._batch_jobs[job_id]
+        status = self._client.get_batch_scrape_status(job_id, **kwargs)
+        _save(_path("firecrawl", "batch_scrape_job", key), {
+            "operation": "batch_scrape_job", "response": _dump(status),
+            "duration_seconds": round(time.time() - started_at, 3)
+        })
+        return status
+
+    def cancel_batch_scrape(self, job_id: str) -> bool:
+        if self._mode == "replay":
+            return True
+
+        cancelled = self._client.cancel_batch_scrape(job_id)
+
+        # Mark the recording as abandoned, so replay stops polling where this run did
+        path = _path("firecrawl", "batch_scrape_job", self._batch_jobs[job_id][0])
+        if path.exists():
+            recording = _load(path, sleep=False)
+            recording["response"]["status"] = "cancelled"
+            _save(path, recording)
+        return cancelled
+
+
+def wrap_firecrawl(client: Any) -> Any:
+    """
+    Wrap the Firecrawl client for record/replay according to config.REPLAY_MODE.
+
+    Args:
+        client: Firecrawl client
+
+    Returns:
+        The client itself when REPLAY_MODE is "off", otherwise a ReplayFirecrawl wrapper
+    """
+    if config.REPLAY_MODE in ("record", "replay"):
+        print(f"📼 Firecrawl {config.REPLAY_MODE} mode ({config.REPLAY_DIR})")
+        return ReplayFirecrawl(client, config.REPLAY_MODE)
+    return client
+
+
+def run_agent_with_replay(agent: Any, input: str, **kwargs: Any) -> Any:
+    """
+    Run an agent, recording or replaying its response according to config.REPLAY_MODE.
+
+    Replayed responses expose .content (rebuilt with the agent's output_schema)
+    and .metrics (recorded input/output tokens), which is all run_agent() reads.
+
+    Args:
+        agent: Agno Agent to run
+        input: Prompt text
+        **kwargs: Extra keyword arguments passed through to agent.run()
+
+    Returns:
+        Agent RunOutput, or a replayed stand-in
+    """
+    if config.REPLAY_MODE not in ("record", "replay"):
+        return agent.run(input=input, **kwargs)
+
+    model_id = getattr(agent.model, "id", str(agent.model))
+    path = _path("agents", agent.name, _key(agent.name, model_id, input))
+
+    if config.REPLAY_MODE == "replay":
+        recording = _load(path)
+        content = recording["content"]
+        output_schema: Optional[Any] = getattr(agent, "output_schema", None)
+        if output_schema is not None and isinstance(content, dict):
+            content = output_schema.model_validate(content)
+        return SimpleNamespace(
+            content=content,
+            metrics=SimpleNamespace(**recording.get("metrics", {}))
+        )
+
+    start_time = time.time()
+    response = agent.run(input=input, **kwargs)
+    metrics = getattr(response, "metrics", None)
+    _save(path, {
+        "agent": agent.name,
+        "model": model_id,
+        "content": _dump(response.content),
+        "metrics": {
+            "input_tokens": getattr(metrics, "input_tokens", 0) or 0,
+            "output_tokens": getattr(metrics, "output_tokens", 0) or 0
+        },
+        "duration_seconds": round(time.time() - start_time, 3)
+    })
+    return response
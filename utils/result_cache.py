@@ -0,0 +1,114 @@
+"""
+Result Cache
+Local file cache for Firecrawl results that Firecrawl itself doesn't cache
+(e.g. URL maps), so reruns and the cache warmer can skip the call.
+
+Entries are JSON files under config.RESULT_CACHE_DIR/<namespace>/, one per key,
+written atomically so concurrent runs and the warmer can share the directory.
+Entries don't expire on read: callers compare entry_age() with the TTL of their
+kind of result (e.g. config.MAP_CACHE_TTL). Namespaces that grow with every
+scraped page are bounded with prune(), which evicts entries by age and count.
+
+Usage:
+    entry = get_entry("map", cache_key)
+    if entry and entry_age(entry) < config.MAP_CACHE_TTL:
+        return entry["value"]
+    put_entry("map", cache_key, result)
+
+    prune("page", max_age_seconds=config.FALLBACK_CACHE_MAX_AGE, max_entries=config.FALLBACK_CACHE_MAX_PAGES)
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import time
+import config
+
+
+def _entry_path(namespace: str, key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+    return Path(config.RESULT_CACHE_DIR) / namespace / f"{digest}.json"
+
+
+def get_entry(namespace: str, key: str) -> Optional[Dict]:
+    """
+    Load a cache entry.
+
+    Args:
+        namespace: Kind of result (e.g. "map")
+        key: Cache key within the namespace
+
+    Returns:
+        Dict with keys: key, stored_at, value - or None if there is no readable entry
+    """
+    path = _entry_path(namespace, key)
+    if not path.exists():
+        return None
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("key") == key else None
+
+
+def put_entry(namespace: str, key: str, value: Any) -> None:
+    """
+    Store a value (must be JSON serializable), replacing any previous entry for the key.
+
+    Args:
+        namespace: Kind of result (e.g. "map")
+        key: Cache key within the namespace
+        value: Value to store
+    """
+    path = _entry_path(namespace, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {"key": key, "stored_at": time.time(), "value": value}
+    tmp_path = path.with_suffix(f".{time.time_ns()}.tmp")
+    tmp_path.write_text(json.dumps(entry, default=str), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def entry_age(entry: Optional[Dict]) -> float:
+    """Seconds since the entry was stored (infinite for a missing entry)"""
+    if not entry:
+        return float("inf")
+    return max(time.time() - entry.get("stored_at", 0), 0.0)
+
+
+def prune(namespace: str, max_age_seconds: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+    """
+    Evict old entries from a namespace (by file modification time, without reading them).
+
+    Args:
+        namespace: Kind of result (e.g. "page")
+        max_age_seconds: Remove entries stored longer ago than this
+        max_entries: Then remove the oldest entries beyond this count
+
+    Returns:
+        Number of entries removed
+    """
+    directory = Path(config.RESULT_CACHE_DIR) / namespace
+    if not directory.is_dir():
+        return 0
+
+    entries = []
+    for path in directory.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # Replaced or removed meanwhile
+    entries.sort(reverse=True)  # Newest first
+
+    now = time.time()
+    keep = [entry for entry in entries if max_age_seconds is None or now - entry[0] <= max_age_seconds]
+    if max_entries is not None:
+        keep = keep[:max_entries]
+    kept = {path for _, path in keep}
+
+    removed = 0
+    for _, path in entries:
+        if path not in kept:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
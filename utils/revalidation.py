@@ -0,0 +1,95 @@
+"""
+Stale-While-Revalidate
+Background refresh of cached results that are served past their TTL.
+
+A cached result is "fresh" within its TTL, "stale" for SWR_GRACE_SECONDS after
+it and "expired" beyond that. Stale results are returned right away and a
+refresh is queued here; expired ones must be refreshed before use. A few daemon
+worker threads (SWR_REFRESH_WORKERS) run the refreshes, and each key is queued
+at most once until its refresh finishes, so popular domains don't trigger a
+refresh per request.
+
+Refreshes run outside any step: their Firecrawl calls count in the process
+metrics but not in a run's telemetry.
+
+Usage:
+    freshness = classify_freshness(entry_age(entry), config.MAP_CACHE_TTL)
+    if freshness == "stale":
+        schedule_refresh(f"map:{cache_key}", lambda: map_website(domain, limit, use_cache=False))
+"""
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+import queue
+import threading
+import config
+
+
+_queue: "queue.Queue[Tuple[str, Callable[[], Any]]]" = queue.Queue()
+_pending: Set[str] = set()
+_workers: List[threading.Thread] = []
+_stats = {"queued": 0, "deduplicated": 0, "refreshed": 0, "failed": 0}
+_lock = threading.Lock()
+
+
+def classify_freshness(age_seconds: float, ttl_seconds: float) -> str:
+    """
+    Classify a cached result by age.
+
+    Args:
+        age_seconds: Age of the cached result
+        ttl_seconds: TTL of its kind of result
+
+    Returns:
+        "fresh", "stale" (servable while a refresh is queued) or "expired"
+    """
+    if age_seconds < ttl_seconds:
+        return "fresh"
+    if config.STALE_WHILE_REVALIDATE and age_seconds < ttl_seconds + config.SWR_GRACE_SECONDS:
+        return "stale"
+    return "expired"
+
+
+def _work() -> None:
+    while True:
+        key, refresh = _queue.get()
+        try:
+            refresh()
+            outcome = "refreshed"
+        except Exception as e:
+            print(f"⚠️  Background refresh of {key} failed: {e}")
+            outcome = "failed"
+        with _lock:
+            _pending.discard(key)
+            _stats[outcome] += 1
+        _queue.task_done()
+
+
+def schedule_refresh(key: str, refresh: Callable[[], Any]) -> bool:
+    """
+    Queue a background refresh of a stale cached result.
+
+    Args:
+        key: Identifies the cached result (e.g. "map:https://gong.io|5000")
+        refresh: Callable that refetches the result and stores it in its cache
+
+    Returns:
+        True if queued, False if a refresh of `key` is already pending
+    """
+    with _lock:
+        if key in _pending:
+            _stats["deduplicated"] += 1
+            return False
+        _pending.add(key)
+        _stats["queued"] += 1
+        while len(_workers) < config.SWR_REFRESH_WORKERS:
+            worker = threading.Thread(target=_work, name=f"revalidate-{len(_workers)}", daemon=True)
+            worker.start()
+            _workers.append(worker)
+    _queue.put((key, refresh))
+    return True
+
+
+def get_revalidation_stats() -> Dict:
+    """Process-wide refresh counts plus the number of refreshes still pending"""
+    with _lock:
+        return {**_stats, "pending": len(_pending)}
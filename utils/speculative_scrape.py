@@ -0,0 +1,156 @@
+"""
+Speculative Scraping
+Starts scraping the pages the URL prioritizer almost always selects (/about,
+/customers, /pricing, ...) while its LLM call is still running, so Step 5 only
+has to fetch the rest.
+
+Step 4 picks up to SPECULATIVE_SCRAPE_MAX_URLS top-level section pages per
+company by path (the same sections the prioritizer's instructions put first)
+and starts a batch scrape in a background thread. Step 5 takes the scrape for
+its run, scrapes the remaining selected pages meanwhile, and uses the
+speculative pages the prioritizer also selected (re-fetching any the scrape
+didn't return). If it selected none of them, Step 5 doesn't wait for the
+scrape. Speculative pages it didn't select are dropped (their last good copy
+is still kept for outages, see utils/firecrawl_helpers.py).
+
+Usage:
+    # Step 4, before the prioritizer call
+    start_speculative_scrape(pick_speculative_urls(vendor_urls) + pick_speculative_urls(prospect_urls))
+
+    # Step 5
+    speculative = take_speculative_scrape()
+    covered = [url for url in selected if speculative and speculative.covers(url)]
+    if covered:  # Never wait for a scrape none of whose pages were selected
+        pages = speculative.pages_for(covered)
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import contextvars
+import re
+import threading
+import config
+from utils.firecrawl_helpers import batch_scrape_urls
+from utils.telemetry import capture_firecrawl_calls, get_run_key
+
+
+# Top-level section paths the prioritizer reliably selects, best first
+_SECTION_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r"^(about|about-us|company)$",
+        r"^(customers|case-studies|customer-stories|success-stories|testimonials)$",
+        r"^(products?|platform|solutions|features)$",
+        r"^(pricing|plans)$",
+        r"^(team|leadership)$",
+    )
+]
+
+# Speculative scrapes not yet taken by Step 5 (oldest first; runs that fail in Step 4 never take theirs)
+_MAX_PENDING_SCRAPES = 64
+_scrapes: "OrderedDict[str, SpeculativeScrape]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _url_key(url: str) -> str:
+    """Compare URLs without scheme, "www." or trailing slash"""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return f"{parts.netloc.lower().removeprefix('www.')}{parts.path.rstrip('/')}"
+
+
+def pick_speculative_urls(urls: List[str], limit: Optional[int] = None) -> List[str]:
+    """
+    Pick the URLs of a company the prioritizer is very likely to select.
+
+    Args:
+        urls: Mapped URLs of one company
+        limit: Maximum URLs to pick (default: config.SPECULATIVE_SCRAPE_MAX_URLS)
+
+    Returns:
+        Up to `limit` top-level section pages, in section order
+    """
+    limit = config.SPECULATIVE_SCRAPE_MAX_URLS if limit is None else limit
+    ranked = []
+    seen = set()
+    for url in urls:
+        parts = urlsplit(url)
+        path = parts.path.strip("/").lower()
+        if parts.query or _url_key(url) in seen:
+            continue
+        rank = next((rank for rank, pattern in enumerate(_SECTION_PATTERNS) if pattern.match(path)), None)
+        if rank is not None:
+            ranked.append((rank, url))
+            seen.add(_url_key(url))
+    return [url for _, url in sorted(ranked, key=lambda item: item[0])[:limit]]
+
+
+class SpeculativeScrape:
+    """A batch scrape started before the URL selection it anticipates"""
+
+    def __init__(self, urls: List[str]):
+        self.urls = urls
+        self.firecrawl_calls: List[Dict] = []
+        self._keys = {_url_key(url) for url in urls}
+        self._future: Future = Future()
+
+    def run(self) -> None:
+        # Records land in self.firecrawl_calls before the result is published
+        with capture_firecrawl_calls() as self.firecrawl_calls:
+            try:
+                self._future.set_result(batch_scrape_urls(self.urls, formats=config.STAGE_SCRAPE_FORMATS["batch"]))
+            except Exception as e:
+                self._future.set_result({"success": False, "error": str(e), "results": {}})
+
+    def done(self) -> bool:
+        """True once the scrape finished (its firecrawl_calls are complete)"""
+        return self._future.done()
+
+    def covers(self, url: str) -> bool:
+        """True if `url` is one of the speculatively scraped pages"""
+        return _url_key(url) in self._keys
+
+    def pages_for(self, urls: List[str], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Wait for the scrape and get the pages for the selected URLs.
+
+        Args:
+            urls: Selected URLs covered by this scrape (keys of the result)
+            timeout: Maximum seconds to wait (default: config.BATCH_SCRAPE_TIMEOUT)
+
+        Returns:
+            Dict mapping selected URL -> batch scrape page dict (pages the scrape
+            didn't return, or everything if it failed, are left out)
+        """
+        try:
+            result = self._future.result(timeout=config.BATCH_SCRAPE_TIMEOUT if timeout is None else timeout)
+        except FutureTimeoutError:
+            return {}
+        scraped = {_url_key(url): page for url, page in (result.get("results") or {}).items()}
+        return {url: scraped[_url_key(url)] for url in urls if _url_key(url) in scraped}
+
+
+def start_speculative_scrape(urls: List[str]) -> Optional[SpeculativeScrape]:
+    """
+    Start scraping `urls` in the background for the current run's Step 5.
+
+    Returns:
+        The scrape, or None if there is nothing to scrape
+    """
+    if not urls:
+        return None
+    scrape = SpeculativeScrape(urls)
+    with _lock:
+        _scrapes[get_run_key()] = scrape
+        while len(_scrapes) > _MAX_PENDING_SCRAPES:
+            _scrapes.popitem(last=False)
+    # Copy the context so the scrape runs with the run's profile and deadline
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(scrape.run,), name="speculative-scrape", daemon=True).start()
+    return scrape
+
+
+def take_speculative_scrape() -> Optional[SpeculativeScrape]:
+    """Remove and return the current run's speculative scrape, if Step 4 started one"""
+    with _lock:
+        return _scrapes.pop(get_run_key(), None)
@@ -0,0 +1,209 @@
+"""
+Structured Data
+Deterministic extraction of company facts from a homepage's structured data:
+schema.org JSON-LD (Organization and its subtypes), OpenGraph and meta tags.
+
+Well-marked-up sites publish their name, description, size, location and social
+profiles this way, so the Company Profile Analyst only has to fill the fields
+the markup leaves out - or isn't needed at all (see steps/step7_prospect_analysis.py).
+Firecrawl's page metadata (og_site_name, description, ...) is used when the raw
+HTML is not available.
+
+Usage:
+    structured = extract_structured_data(result["raw_html"], result["metadata"])
+    structured["company_name"]  # "Globex Logistics"
+"""
+
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+import json
+
+
+# schema.org types describing the company itself (plus any type ending in "Organization")
+_ORGANIZATION_TYPES = {"Organization", "Corporation", "LocalBusiness", "OnlineBusiness", "OnlineStore", "NGO"}
+
+# Descriptions shorter than this are taglines, not a description of the business
+_MIN_DESCRIPTION_CHARS = 40
+
+# CompanyProfile fields structured data can fill
+PROFILE_FIELDS = ("company_name", "what_they_do", "industry", "company_size", "target_market")
+
+
+class _StructuredDataParser(HTMLParser):
+    """Collects JSON-LD blocks and meta tags from an HTML document"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self._in_json_ld = False
+        self._buffer: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List) -> None:
+        attributes = {name.lower(): value or "" for name, value in attrs}
+        if tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._in_json_ld = True
+            self._buffer = []
+        elif tag == "meta":
+            name = (attributes.get("property") or attributes.get("name") or "").lower()
+            content = attributes.get("content", "").strip()
+            if name and content:
+                self.meta.setdefault(name, content)
+
+    def handle_data(self, data: str) -> None:
+        if self._in_json_ld:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._in_json_ld:
+            self.json_ld.append("".join(self._buffer))
+            self._in_json_ld = False
+
+
+def _json_ld_nodes(blocks: List[str]) -> List[Dict]:
+    """Flatten JSON-LD blocks (single objects, lists and @graph containers) into nodes"""
+    nodes = []
+    pending: List[Any] = []
+    for block in blocks:
+        try:
+            pending.append(json.loads(block))
+        except ValueError:
+            continue  # Malformed markup is common; skip the block
+
+    while pending:
+        item = pending.pop(0)
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            if "@graph" in item:
+                pending.extend(item["@graph"] if isinstance(item["@graph"], list) else [item["@graph"]])
+            nodes.append(item)
+    return nodes
+
+
+def _is_organization(node: Dict) -> bool:
+    types = node.get("@type", [])
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(t, str) and (t in _ORGANIZATION_TYPES or t.endswith("Organization")) for t in types)
+
+
+def _text(value: Any) -> Optional[str]:
+    """First non-empty string in a JSON-LD value (strings, lists or {"name": ...} objects)"""
+    if isinstance(value, list):
+        return next((text for text in map(_text, value) if text), None)
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("@value"))
+    if isinstance(value, (str, int, float)) and str(value).strip():
+        return str(value).strip()
+    return None
+
+
+def _company_size(value: Any) -> Optional[str]:
+    """Format schema.org numberOfEmployees (number or QuantitativeValue) as an employee count"""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        low, high = value.get("minValue"), value.get("maxValue")
+        if low is not None and high is not None:
+            return f"{low}-{high} employees"
+        value = value.get("value", low if low is not None else high)
+    if value is None or not str(value).strip():
+        return None
+    return f"{value} employees" if str(value).replace(",", "").isdigit() else str(value).strip()
+
+
+def _location(value: Any) -> Optional[str]:
+    """Format a schema.org address (PostalAddress or plain text) as "City, Region, Country" """
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        parts = [_text(value.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+        return ", ".join(part for part in parts if part) or None
+    return _text(value)
+
+
+def _description(text: Optional[str]) -> Optional[str]:
+    return text if text and len(text.strip()) >= _MIN_DESCRIPTION_CHARS else None
+
+
+def extract_structured_data(html: str, metadata: Optional[Dict] = None) -> Dict:
+    """
+    Extract company facts from a page's structured data.
+
+    JSON-LD wins over OpenGraph, which wins over plain meta tags and Firecrawl's
+    page metadata. Fields no source provides are left out.
+
+    Args:
+        html: Raw page HTML (may be empty)
+        metadata: Firecrawl page metadata dict (fallback for OpenGraph/meta values)
+
+    Returns:
+        Dict with any of: company_name, what_they_do, industry, company_size,
+        target_market, location, social_links, plus "sources" (which kinds of
+        structured data contributed, e.g. ["json-ld", "opengraph"])
+    """
+    parser = _StructuredDataParser()
+    if html:
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            pass  # Keep whatever was parsed before the markup broke
+
+    metadata = metadata or {}
+    meta = parser.meta
+    nodes = _json_ld_nodes(parser.json_ld)
+    organization = next((node for node in nodes if _is_organization(node)), {})
+    audience = next((node["audience"] for node in nodes if isinstance(node.get("audience"), dict)), {})
+
+    values = {
+        "company_name": _text(organization.get("legalName")) or _text(organization.get("name")),
+        "what_they_do": _description(_text(organization.get("description"))),
+        "industry": _text(organization.get("industry")),
+        "company_size": _company_size(organization.get("numberOfEmployees")),
+        "target_market": _text(audience.get("audienceType")),
+        "location": _location(organization.get("address") or organization.get("location")),
+    }
+    social_links = organization.get("sameAs", [])
+    social_links = [link for link in (social_links if isinstance(social_links, list) else [social_links])
+                    if isinstance(link, str) and link.startswith("http")]
+
+    sources = ["json-ld"] if any(values.values()) or social_links else []
+
+    # (source kind, value) candidates in order of preference
+    fallbacks = {
+        "company_name": [
+            ("opengraph", meta.get("og:site_name")), ("meta", meta.get("application-name")),
+            ("opengraph", metadata.get("og_site_name"))
+        ],
+        "what_they_do": [
+            ("opengraph", _description(meta.get("og:description"))), ("meta", _description(meta.get("description"))),
+            ("opengraph", _description(metadata.get("og_description"))), ("meta", _description(metadata.get("description")))
+        ],
+    }
+    for field, candidates in fallbacks.items():
+        if values[field]:
+            continue
+        kind, value = next(((kind, value) for kind, value in candidates if value and value.strip()), (None, None))
+        if value:
+            values[field] = value.strip()
+            sources.append(kind)
+
+    structured = {field: value for field, value in values.items() if value}
+    if social_links:
+        structured["social_links"] = social_links
+    structured["sources"] = sorted(set(sources))
+    return structured
+
+
+def known_profile_fields(structured: Dict) -> Dict[str, str]:
+    """
+    Get the CompanyProfile field values structured data already provides.
+
+    Args:
+        structured: Output of extract_structured_data
+
+    Returns:
+        Dict mapping CompanyProfile field -> value (known fields only)
+    """
+    return {field: structured[field] for field in PROFILE_FIELDS if structured.get(field)}
@@ -0,0 +1,303 @@
+"""
+Step Telemetry
+Collects per-step wall time and per-call agent and Firecrawl usage while a step
+executor runs, and attaches it to the step output, so telemetry travels with the
+workflow results (CLI metadata.json and API results alike).
+
+Usage:
+    @instrument_step
+    def extract_offerings(step_input: StepInput) -> StepOutput:
+        ...
+        response = run_agent(offerings_extractor, prompt)  # recorded automatically
+"""
+
+from agno.workflow.types import StepInput, StepOutput
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import ast
+import functools
+import time
+import config
+from utils import metrics
+from utils.deadline import start_run_deadline, step_deadline
+from utils.profiles import get_profile_setting, step_profile
+
+
+# Agent and Firecrawl call records for the step executor currently running in this
+# context. Agno runs parallel steps with copy_context(), so each step gets its own lists.
+_agent_calls: ContextVar[Optional[List[Dict]]] = ContextVar("_agent_calls", default=None)
+_firecrawl_calls: ContextVar[Optional[List[Dict]]] = ContextVar("_firecrawl_calls", default=None)
+
+# Identifier of the workflow run the current step belongs to (used for fair rate limiting)
+_run_key: ContextVar[str] = ContextVar("_run_key", default="default")
+
+# Executor name of the step currently running (labels Prometheus metrics)
+_step_name: ContextVar[str] = ContextVar("_step_name", default="unknown")
+
+
+def get_run_key() -> str:
+    """
+    Get the identifier of the workflow run executing the current step.
+
+    Returns:
+        Run id (or session id on Agno versions without run_context), "default" outside a step
+    """
+    return _run_key.get()
+
+
+def _resolve_run_key(step_input: StepInput, run_context: Any = None) -> str:
+    run_id = getattr(run_context, "run_id", None)
+    if run_id:
+        return run_id
+
+    session_id = getattr(getattr(step_input, "workflow_session", None), "session_id", None)
+    return session_id or "default"
+
+
+def record_agent_call(record: Dict) -> None:
+    """
+    Record one agent call for the currently running step and the process metrics.
+
+    Calls made outside an instrumented step are not attached to any step.
+
+    Args:
+        record: Dict describing the call (agent, model, token counts, ...)
+    """
+    calls = _agent_calls.get()
+    if calls is not None:
+        calls.append(record)
+    metrics.observe_agent_call(_step_name.get(), record)
+
+
+def record_firecrawl_call(record: Dict) -> None:
+    """
+    Record one Firecrawl call for the currently running step and the process metrics.
+
+    Calls made outside an instrumented step are not attached to any step.
+
+    Args:
+        record: Dict describing the call (operation, duration, pages, cache hits, ...)
+    """
+    calls = _firecrawl_calls.get()
+    if calls is not None:
+        calls.append(record)
+    metrics.observe_firecrawl_call(_step_name.get(), record)
+
+
+@contextmanager
+def capture_firecrawl_calls() -> Iterator[List[Dict]]:
+    """
+    Collect the Firecrawl calls made in this context in a list of their own.
+
+    For work started by one step on behalf of a later one (e.g. speculative
+    scrapes): the later step attaches the records with attach_firecrawl_calls.
+    """
+    calls: List[Dict] = []
+    token = _firecrawl_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _firecrawl_calls.reset(token)
+
+
+def attach_firecrawl_calls(records: Iterable[Dict]) -> None:
+    """Add Firecrawl call records captured elsewhere to the current step (already counted in the metrics)"""
+    calls = _firecrawl_calls.get()
+    if calls is not None:
+        calls.extend(records)
+
+
+def estimate_cost(model_id: str, input_tokens: int, output_tokens: int) -> float:
+    """
+    Estimate the USD cost of an agent call from config.MODEL_PRICING.
+
+    Args:
+        model_id: OpenAI model id (e.g. "gpt-4o")
+        input_tokens: Input tokens used
+        output_tokens: Output tokens used
+
+    Returns:
+        Estimated cost in USD (0.0 for models without pricing)
+    """
+    pricing = config.MODEL_PRICING.get(model_id)
+    if not pricing:
+        return 0.0
+    return round((input_tokens * pricing["input"] + output_tokens * pricing["output"]) / 1_000_000, 6)
+
+
+def summarize_step_telemetry(
+    agent_calls: List[Dict],
+    firecrawl_calls: List[Dict],
+    started_at: Optional[str] = None,
+    duration_seconds: float = 0.0,
+    degradations: Optional[List[Dict]] = None
+) -> Dict:
+    """
+    Summarize call records into step-level telemetry.
+
+    Args:
+        agent_calls: Agent call records from record_agent_call
+        firecrawl_calls: Firecrawl call records from record_firecrawl_call
+        started_at: ISO timestamp the step started at
+        duration_seconds: Step wall time
+        degradations: Work the step cut to meet the run deadline (see utils/deadline.py)
+
+    Returns:
+        Dict with timing, token, cost, retry and cache totals plus the raw call records
+    """
+    input_tokens = sum(call.get("input_tokens", 0) for call in agent_calls)
+    output_tokens = sum(call.get("output_tokens", 0) for call in agent_calls)
+
+    return {
+        "started_at": started_at,
+        "duration_seconds": duration_seconds,
+        # Time spent waiting for rate limit capacity and Firecrawl concurrency slots
+        "queue_seconds": round(
+            sum(call.get("queue_seconds", 0) for call in agent_calls + firecrawl_calls), 3
+        ),
+        "models": sorted({call["model"] for call in agent_calls if call.get("model")}),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "cost_usd": round(sum(call.get("cost_usd", 0) for call in agent_calls), 6),
+        # Attempts past the cascade's last model are retries (see utils/agent_runner.py)
+        "retries": sum(1 for call in agent_calls if call.get("attempt", 0) > call.get("cascade_level", 0)),
+        "failed_calls": sum(1 for call in agent_calls + firecrawl_calls if call.get("error")),
+        "pages_scraped": sum(call.get("pages", 0) for call in firecrawl_calls),
+        "cache_hits": sum(call.get("cache_hits", 0) for call in firecrawl_calls),
+        "cache_misses": sum(call.get("cache_misses", 0) for call in firecrawl_calls),
+        # Cache hits served past SCRAPE_MAX_AGE while a background refresh runs
+        "stale_pages": sum(call.get("stale_pages", 0) for call in firecrawl_calls),
+        "degradations": degradations or [],
+        "agent_calls": agent_calls,
+        "firecrawl_calls": firecrawl_calls
+    }
+
+
+def instrument_step(executor: Callable[[StepInput], StepOutput]) -> Callable[[StepInput], StepOutput]:
+    """
+    Decorator that records wall time and agent/Firecrawl usage for a step executor.
+
+    Adds a "telemetry" key to the step's dict content. Also makes the run's
+    execution profile and deadline visible to the step (the deadline clock
+    starts on the run's first step).
+
+    Args:
+        executor: Step executor function
+
+    Returns:
+        Wrapped step executor
+    """
+    @functools.wraps(executor)
+    def wrapper(step_input: StepInput, run_context: Any = None) -> StepOutput:
+        agent_calls: List[Dict] = []
+        firecrawl_calls: List[Dict] = []
+        degradations: List[Dict] = []
+        run_key = _resolve_run_key(step_input, run_context)
+        profile = getattr(step_input.input, "profile", None)
+        deadline_seconds = getattr(step_input.input, "deadline_seconds", None)
+        if deadline_seconds is None:
+            with step_profile(profile):
+                deadline_seconds = get_profile_setting("deadline_seconds")
+        deadline = start_run_deadline(run_key, deadline_seconds)
+        agent_token = _agent_calls.set(agent_calls)
+        firecrawl_token = _firecrawl_calls.set(firecrawl_calls)
+        run_key_token = _run_key.set(run_key)
+        step_name_token = _step_name.set(executor.__name__)
+
+        started_at = datetime.now().isoformat()
+        start_time = time.time()
+        try:
+            with step_profile(profile), step_deadline(deadline, degradations):
+                output = executor(step_input)
+        finally:
+            _step_name.reset(step_name_token)
+            _run_key.reset(run_key_token)
+            _firecrawl_calls.reset(firecrawl_token)
+            _agent_calls.reset(agent_token)
+        duration_seconds = round(time.time() - start_time, 2)
+        metrics.observe_step(executor.__name__, duration_seconds, success=getattr(output, "success", True) is not False)
+
+        if isinstance(output, StepOutput) and isinstance(output.content, dict):
+            output.content["telemetry"] = summarize_step_telemetry(
+                agent_calls, firecrawl_calls, started_at, duration_seconds, degradations
+            )
+
+        return output
+
+    # Agno inspects the executor signature to decide whether to pass run_context,
+    # so expose the wrapper's own signature rather than the wrapped executor's
+    del wrapper.__wrapped__
+
+    return wrapper
+
+
+def collect_step_contents(step_outputs: Iterable[StepOutput]) -> Dict[str, Any]:
+    """
+    Flatten workflow step outputs (including Parallel sub-steps) into a name -> content dict.
+
+    Args:
+        step_outputs: Step outputs (e.g. WorkflowRunOutput.step_results)
+
+    Returns:
+        Dict mapping step name -> step content (string contents deserialized when possible)
+    """
+    contents = {}
+    for step_output in step_outputs:
+        for sub_step in (getattr(step_output, 'steps', None) or [step_output]):
+            content = sub_step.content
+            if isinstance(content, str):
+                try:
+                    content = ast.literal_eval(content)
+                except (ValueError, SyntaxError, NameError, TypeError):
+                    pass
+            contents[sub_step.step_name] = content
+    return contents
+
+
+def collect_run_telemetry(step_contents: Dict[str, Any]) -> Dict:
+    """
+    Aggregate step telemetry for run metadata.
+
+    Args:
+        step_contents: Dict mapping step name -> step content dict
+
+    Returns:
+        Dict with keys: totals (run-wide sums), steps (per-step telemetry) and
+        degradations (work cut to meet the run deadline, in step order)
+    """
+    steps = {
+        step_name: content["telemetry"]
+        for step_name, content in step_contents.items()
+        if isinstance(content, dict) and isinstance(content.get("telemetry"), dict)
+    }
+
+    def total(key: str) -> Any:
+        return sum(step.get(key, 0) for step in steps.values())
+
+    return {
+        "totals": {
+            "step_seconds": round(total("duration_seconds"), 2),
+            "queue_seconds": round(total("queue_seconds"), 3),
+            "input_tokens": total("input_tokens"),
+            "output_tokens": total("output_tokens"),
+            "total_tokens": total("total_tokens"),
+            "cost_usd": round(total("cost_usd"), 6),
+            "agent_calls": sum(len(step.get("agent_calls", [])) for step in steps.values()),
+            "firecrawl_calls": sum(len(step.get("firecrawl_calls", [])) for step in steps.values()),
+            "retries": total("retries"),
+            "failed_calls": total("failed_calls"),
+            "pages_scraped": total("pages_scraped"),
+            "cache_hits": total("cache_hits"),
+            "cache_misses": total("cache_misses"),
+            "stale_pages": total("stale_pages")
+        },
+        "steps": steps,
+        "degradations": [
+            {"step": step_name, **degradation}
+            for step_name, step in steps.items()
+            for degradation in step.get("degradations", [])
+        ]
+    }
@@ -0,0 +1,327 @@
+"""
+Token Budget Helpers
+Token estimation, per-agent input budgets and priority-aware page packing.
+
+MAX_URLS_TO_SCRAPE limits pages, not tokens, so a single giant page can still
+overflow an extractor's context window. Every agent call gets an input budget
+(see get_input_token_budget) and scraped pages are packed into that budget in
+page priority order (PrioritizedURL.priority, 1 = highest) before prompting.
+JSON context sections (e.g. vendor intelligence in Steps 7-8) are fitted the
+same way with fit_json_sections(), so the task instructions that follow them
+are never the part that gets cut.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import copy
+import json
+import math
+import config
+from utils.profiles import get_profile_setting
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")  # gpt-4o / gpt-4o-mini tokenizer
+except Exception:
+    # tiktoken is optional - fall back to the characters-per-token heuristic
+    _ENCODING = None
+
+
+CHARS_PER_TOKEN = 4
+PAGE_SEPARATOR = "\n\n---\n\n"
+TRUNCATION_MARKER = "\n\n[... truncated to fit token budget ...]"
+LOWEST_PAGE_PRIORITY = 10  # PrioritizedURL.priority scale: 1 (highest) to 10 (lowest)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses tiktoken when installed, otherwise ~4 characters per token.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_budget(text: str, budget_tokens: int) -> str:
+    """
+    Truncate text so it fits within a token budget.
+
+    Args:
+        text: Text to truncate
+        budget_tokens: Maximum number of tokens to keep
+
+    Returns:
+        Original text if it fits, otherwise the truncated text with a marker appended
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+
+    keep_tokens = max(budget_tokens - estimate_tokens(TRUNCATION_MARKER), 0)
+
+    if _ENCODING is not None:
+        truncated = _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:keep_tokens])
+    else:
+        truncated = text[:keep_tokens * CHARS_PER_TOKEN]
+
+    return truncated + TRUNCATION_MARKER
+
+
+def truncate_middle(text: str, budget_tokens: int, keep_tail_tokens: Optional[int] = None) -> str:
+    """
+    Truncate a prompt so it fits within a token budget, cutting from the middle.
+
+    Prompts put their context first and their task instructions last, so the
+    tail (up to `keep_tail_tokens`, at most half the budget) is always kept and
+    the context before it is cut.
+
+    Args:
+        text: Prompt to truncate
+        budget_tokens: Maximum number of tokens to keep
+        keep_tail_tokens: Tokens kept from the end (default: config.PROMPT_OVERHEAD_TOKENS)
+
+    Returns:
+        Original text if it fits, otherwise head + marker + tail
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+
+    keep_tail_tokens = config.PROMPT_OVERHEAD_TOKENS if keep_tail_tokens is None else keep_tail_tokens
+    tail_tokens = min(keep_tail_tokens, budget_tokens // 2)
+    head_tokens = max(budget_tokens - tail_tokens - estimate_tokens(TRUNCATION_MARKER), 0)
+
+    if _ENCODING is not None:
+        tokens = _ENCODING.encode(text, disallowed_special=())
+        head = _ENCODING.decode(tokens[:head_tokens])
+        tail = _ENCODING.decode(tokens[len(tokens) - tail_tokens:]) if tail_tokens else ""
+    else:
+        head = text[:head_tokens * CHARS_PER_TOKEN]
+        tail = text[len(text) - tail_tokens * CHARS_PER_TOKEN:] if tail_tokens else ""
+
+    return head + TRUNCATION_MARKER + "\n\n" + tail
+
+
+def _shrink_json(value: Any) -> bool:
+    """Drop the last item of the longest list in `value` (top level or one level down)"""
+    lists = [value] if isinstance(value, list) else []
+    if isinstance(value, dict):
+        for item in value.values():
+            if isinstance(item, list):
+                lists.append(item)
+            elif isinstance(item, dict):
+                lists.extend(nested for nested in item.values() if isinstance(nested, list))
+    longest = max(lists, key=len, default=None)
+    if not longest:
+        return False
+    longest.pop()
+    return True
+
+
+def fit_json(value: Any, budget_tokens: int) -> str:
+    """
+    Serialize a context section (e.g. vendor intelligence) within a token budget.
+
+    Lists are ranked best first, so the last items of the longest lists are
+    dropped until the JSON fits; whatever still doesn't fit is truncated.
+
+    Args:
+        value: JSON-serializable dict or list
+        budget_tokens: Maximum number of tokens for the section
+
+    Returns:
+        Indented JSON
+    """
+    text = json.dumps(value, indent=2, default=str)
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+
+    value = copy.deepcopy(value)
+    while estimate_tokens(text) > budget_tokens and _shrink_json(value):
+        text = json.dumps(value, indent=2, default=str)
+    return truncate_to_budget(text, budget_tokens)
+
+
+def fit_json_sections(sections: Dict[str, Any], budget_tokens: int) -> Dict[str, str]:
+    """
+    Serialize several context sections of one prompt within a shared token budget.
+
+    Sections that fit their fair share keep everything; the spare tokens go to
+    the larger sections, which are shrunk with fit_json().
+
+    Args:
+        sections: Dict mapping section name -> JSON-serializable value
+        budget_tokens: Token budget for all sections together
+
+    Returns:
+        Dict mapping section name -> indented JSON
+    """
+    texts = {name: json.dumps(value, indent=2, default=str) for name, value in sections.items()}
+    sizes = {name: estimate_tokens(text) for name, text in texts.items()}
+    if sum(sizes.values()) <= budget_tokens:
+        return texts
+
+    remaining = budget_tokens
+    ordered = sorted(sections, key=lambda name: sizes[name])
+    fitted = {}
+    for index, name in enumerate(ordered):
+        share = remaining // (len(ordered) - index)
+        fitted[name] = texts[name] if sizes[name] <= share else fit_json(sections[name], share)
+        remaining -= estimate_tokens(fitted[name])
+
+    return {name: fitted[name] for name in sections}
+
+
+def get_prompt_context_budget(agent) -> int:
+    """Tokens available for an agent's context sections (its input budget minus instructions and task text)"""
+    return get_input_token_budget(agent) - config.PROMPT_OVERHEAD_TOKENS
+
+
+def get_input_token_budget(agent) -> int:
+    """
+    Get the input token budget for an agent call.
+
+    Per-agent overrides in config.AGENT_INPUT_TOKEN_BUDGETS win. Otherwise the
+    budget is the model's context window minus the output reserve, capped at
+    config.MAX_INPUT_TOKENS_PER_CALL to keep call latency predictable. With rate
+    limiting on, a call never gets more than its model's TPM bucket can hold
+    (config.MODEL_RATE_LIMITS), so one call can't outgrow the rate limit.
+
+    Args:
+        agent: Agno Agent (uses agent.name and agent.model.id)
+
+    Returns:
+        Maximum number of input tokens for this agent
+    """
+    agent_name = getattr(agent, "name", None)
+    model_id = getattr(getattr(agent, "model", None), "id", None)
+
+    if agent_name in config.AGENT_INPUT_TOKEN_BUDGETS:
+        budget = config.AGENT_INPUT_TOKEN_BUDGETS[agent_name]
+    else:
+        context_window = config.MODEL_CONTEXT_WINDOWS.get(model_id, config.DEFAULT_CONTEXT_WINDOW)
+        budget = min(context_window - config.OUTPUT_TOKEN_RESERVE, config.MAX_INPUT_TOKENS_PER_CALL)
+
+    if config.RATE_LIMIT_ENABLED:
+        tpm = config.MODEL_RATE_LIMITS.get(model_id, config.DEFAULT_RATE_LIMIT)["tpm"]
+        budget = min(budget, tpm - config.RATE_LIMIT_OUTPUT_TOKEN_ESTIMATE)
+
+    return budget
+
+
+def pack_pages(
+    pages: Dict[str, str],
+    budget_tokens: int,
+    priorities: Optional[Dict[str, int]] = None
+) -> Tuple[str, Dict]:
+    """
+    Combine scraped pages into one prompt section that fits a token budget.
+
+    Pages are added in priority order (1 = highest, unknown pages last, ties keep
+    scrape order). A page that does not fit is truncated if at least
+    config.MIN_TRUNCATED_PAGE_TOKENS remain, otherwise it is skipped so smaller
+    lower-priority pages can still fit.
+
+    Args:
+        pages: Dict mapping URL -> markdown content
+        budget_tokens: Token budget for the combined content
+        priorities: Optional dict mapping URL -> priority (1-10)
+
+    Returns:
+        Tuple of (combined_content, stats) where stats has keys:
+        estimated_tokens, pages_included, pages_truncated, pages_dropped
+    """
+    priorities = priorities or {}
+    ordered_urls = sorted(pages, key=lambda url: priorities.get(url, LOWEST_PAGE_PRIORITY + 1))
+
+    separator_tokens = estimate_tokens(PAGE_SEPARATOR)
+    blocks: List[str] = []
+    used_tokens = 0
+    truncated_urls: List[str] = []
+    dropped_urls: List[str] = []
+
+    for url in ordered_urls:
+        block = f"URL: {url}\n\n{pages[url]}"
+        block_tokens = estimate_tokens(block) + (separator_tokens if blocks else 0)
+        remaining = budget_tokens - used_tokens
+
+        if block_tokens <= remaining:
+            blocks.append(block)
+            used_tokens += block_tokens
+        elif remaining >= config.MIN_TRUNCATED_PAGE_TOKENS:
+            block = truncate_to_budget(block, remaining - separator_tokens)
+            blocks.append(block)
+            used_tokens += estimate_tokens(block) + separator_tokens
+            truncated_urls.append(url)
+        else:
+            dropped_urls.append(url)
+
+    return PAGE_SEPARATOR.join(blocks), {
+        "estimated_tokens": used_tokens,
+        "pages_included": len(blocks),
+        "pages_truncated": truncated_urls,
+        "pages_dropped": dropped_urls
+    }
+
+
+def build_page_context(
+    pages: Dict[str, str],
+    agent,
+    priorities: Optional[Dict[str, int]] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Pack scraped pages into the input budget of the agent that will read them.
+
+    In "compact" and "deterministic" extraction modes (see config.EXECUTION_PROFILES)
+    the page context is capped at config.COMPACT_PAGE_CONTEXT_TOKENS for faster calls.
+
+    Args:
+        pages: Dict mapping URL -> markdown content
+        agent: Agno Agent the content is for
+        priorities: Optional dict mapping URL -> priority (1-10)
+        max_tokens: Optional further cap on the page context (e.g. when the prompt
+            already carries pre-extracted candidates)
+
+    Returns:
+        Combined "URL: ...\\n\\n<content>" blocks separated by "---"
+    """
+    return pack_page_context(pages, agent, priorities, max_tokens)[0]
+
+
+def pack_page_context(
+    pages: Dict[str, str],
+    agent,
+    priorities: Optional[Dict[str, int]] = None,
+    max_tokens: Optional[int] = None
+) -> Tuple[str, List[str]]:
+    """
+    Like build_page_context, but also report which pages the agent sees in full.
+
+    Returns:
+        Tuple of (page context, URLs included without truncation)
+    """
+    budget = get_prompt_context_budget(agent)
+    if get_profile_setting("extraction_mode") in ("compact", "deterministic"):
+        budget = min(budget, config.COMPACT_PAGE_CONTEXT_TOKENS)
+    if max_tokens is not None:
+        budget = min(budget, max_tokens)
+    content, stats = pack_pages(pages, budget, priorities)
+
+    if stats["pages_truncated"] or stats["pages_dropped"]:
+        print(
+            f"✂️  {agent.name}: packed {stats['pages_included']}/{len(pages)} pages into {budget:,} tokens "
+            f"({len(stats['pages_truncated'])} truncated, {len(stats['pages_dropped'])} dropped)"
+        )
+
+    cut = set(stats["pages_truncated"]) | set(stats["pages_dropped"])
+    return content, [url for url in pages if url not in cut]
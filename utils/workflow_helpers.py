@@ -22,14 +22,14 @@ def get_parallel_step_content(
 
     Args:
         step_input: StepInput object
-        parallel_block_name: Name of the parallel block (e.g., "parallel_validation")
+        parallel_block_name: Name of the parallel block (e.g., "parallel_discovery")
         step_name: Name of the step within the parallel block (e.g., "validate_vendor")
 
     Returns:
         Dict content of the step, or None if not found
 
     Example:
-        vendor_data = get_parallel_step_content(step_input, "parallel_validation", "validate_vendor")
+        vendor_data = get_parallel_step_content(step_input, "parallel_discovery", "validate_vendor")
     """
     # Get the parallel block
     parallel_block = step_input.get_step_content(parallel_block_name)
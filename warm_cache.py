@@ -0,0 +1,337 @@
+"""
+Playbook AI - Cache Warmer
+Refreshes the cached intelligence of watchlist domains before it expires, so
+runs for those domains start warm: URL maps (local result cache), Firecrawl's
+page cache for the domain's previously scraped pages, and the vendor intel pack
+(Step 6 elements, re-extracted from changed pages only - see
+utils/incremental_extraction.py).
+
+A domain is warmed once its oldest cached result enters the last
+WARM_REFRESH_MARGIN of its TTL (MAP_CACHE_TTL, SCRAPE_MAX_AGE). Warm passes
+only start in the off-peak hours (WARM_OFF_PEAK_HOURS) and spend at most
+WARM_PAGES_PER_HOUR Firecrawl pages per trailing hour; domains that don't fit
+the budget wait for the next pass, most overdue first. Pages and intel packs
+can only be warmed for domains that have been run before (the page list comes
+from their extraction state); new domains only get their URL map cached.
+
+Usage:
+    python warm_cache.py                          # Warm the configured watchlist (off-peak only)
+    python warm_cache.py gong.io sendoso.com      # Warm these domains
+    python warm_cache.py --now --profile fast     # Ignore the off-peak window
+
+In-process (serve.py, with WARM_IN_PROCESS=true):
+    start_background_warmer()
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from agno.workflow import Workflow, Step, Parallel
+from agno.workflow.types import StepInput, StepOutput
+from pydantic import BaseModel
+import config
+from steps.step6_vendor_extraction import (
+    extract_offerings,
+    extract_case_studies,
+    extract_proof_points,
+    extract_value_props,
+    extract_customers,
+    extract_use_cases,
+    extract_personas,
+    extract_differentiators,
+    index_vendor_entities
+)
+from utils.firecrawl_helpers import batch_scrape_urls, map_cache_key, map_website
+from utils.incremental_extraction import load_state
+from utils.profiles import get_profile_setting, resolve_profile_name, step_profile
+from utils.result_cache import entry_age, get_entry
+from utils.workflow_helpers import normalize_domain
+
+
+class WarmInput(BaseModel):
+    """Input of the intel pack workflow (the Step 6 executors only read the vendor side)"""
+    vendor_domain: str
+    profile: Optional[str] = None
+    deadline_seconds: Optional[int] = 0
+
+
+def load_watchlist() -> List[str]:
+    """Watchlist domains from WARM_WATCHLIST and WARM_WATCHLIST_FILE, normalized and deduplicated"""
+    domains = list(config.WARM_WATCHLIST)
+    if config.WARM_WATCHLIST_FILE and Path(config.WARM_WATCHLIST_FILE).exists():
+        for line in Path(config.WARM_WATCHLIST_FILE).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                domains.append(line)
+    return list(dict.fromkeys(normalize_domain(domain) for domain in domains))
+
+
+def in_off_peak_window(now: Optional[datetime] = None, hours: Optional[str] = None) -> bool:
+    """
+    Check whether `now` falls in the off-peak hours.
+
+    Args:
+        now: Local time (default: now)
+        hours: Comma-separated local hour ranges, end exclusive (default: config.WARM_OFF_PEAK_HOURS)
+
+    Returns:
+        True if warming may start (always True for an empty spec)
+    """
+    now = now or datetime.now()
+    hours = config.WARM_OFF_PEAK_HOURS if hours is None else hours
+    if not hours.strip():
+        return True
+    for window in hours.split(","):
+        start, _, end = window.strip().partition("-")
+        start, end = int(start), int(end or int(start) + 1)
+        in_window = start <= now.hour < end if start <= end else (now.hour >= start or now.hour < end)
+        if in_window:
+            return True
+    return False
+
+
+def _intel_pack_content(state: Optional[Dict]) -> Tuple[Dict, Dict]:
+    """Page hashes and elements of a saved intel pack (ignoring when it was saved)"""
+    state = state or {}
+    return state.get("pages", {}), state.get("elements", {})
+
+
+class CacheWarmer:
+    """Warms the caches of watchlist domains under an hourly Firecrawl page budget"""
+
+    LEDGER_NAME = "warmer.json"
+
+    def __init__(self, watchlist: Optional[List[str]] = None, profile: Optional[str] = None):
+        self.watchlist = watchlist if watchlist is not None else load_watchlist()
+        self.profile = resolve_profile_name(profile)
+        self.ledger_path = Path(config.RESULT_CACHE_DIR) / self.LEDGER_NAME
+        self._lock = threading.Lock()
+
+    # Ledger: pages spent per pass (for the hourly budget) and when each domain's pages were last refreshed
+
+    def _load_ledger(self) -> Dict:
+        try:
+            return json.loads(self.ledger_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"spent": [], "pages_warmed_at": {}}
+
+    def _save_ledger(self, ledger: Dict) -> None:
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.ledger_path.with_suffix(f".{time.time_ns()}.tmp")
+        tmp_path.write_text(json.dumps(ledger, indent=2), encoding="utf-8")
+        tmp_path.replace(self.ledger_path)
+
+    @staticmethod
+    def _budget_left(ledger: Dict) -> int:
+        hour_ago = time.time() - 3600
+        ledger["spent"] = [[at, pages] for at, pages in ledger["spent"] if at > hour_ago]
+        return config.WARM_PAGES_PER_HOUR - sum(pages for _, pages in ledger["spent"])
+
+    def plan_domain(self, domain: str, ledger: Dict) -> Dict:
+        """
+        Work out what is due for a domain (call inside the warmer's profile).
+
+        Returns:
+            Dict with keys: domain, map_due, page_urls (due pages, URL -> priority),
+            cost (Firecrawl pages) and overdue (seconds past the refresh point, for ordering)
+        """
+        margin = 1 - config.WARM_REFRESH_MARGIN
+        overdue = []
+
+        map_due = False
+        if config.MAP_CACHE_TTL > 0:
+            map_age = entry_age(get_entry("map", map_cache_key(domain, get_profile_setting("max_urls_to_map"))))
+            map_due = map_age >= config.MAP_CACHE_TTL * margin
+            if map_due:
+                overdue.append(min(map_age, 10 * config.MAP_CACHE_TTL) - config.MAP_CACHE_TTL * margin)
+
+        page_urls = {}
+        state = load_state(domain)
+        if state and state.get("urls") and config.SCRAPE_MAX_AGE > 0:
+            scrape_ttl = config.SCRAPE_MAX_AGE / 1000
+            # Firecrawl doesn't report cache ages up front; the pages were at most this fresh
+            fetched_at = max(state.get("saved_at", 0), ledger["pages_warmed_at"].get(domain, 0))
+            pages_age = time.time() - fetched_at
+            if pages_age >= scrape_ttl * margin:
+                page_urls = state["urls"]
+                overdue.append(pages_age - scrape_ttl * margin)
+
+        return {
+            "domain": domain,
+            "map_due": map_due,
+            "page_urls": page_urls,
+            "cost": int(map_due) + len(page_urls),
+            "overdue": max(overdue, default=0.0)
+        }
+
+    def _refresh_intel_pack(self, domain: str, pages: Dict[str, str], priorities: Dict[str, int]) -> None:
+        """Run Step 6 on the refreshed pages; extractors only re-read pages that changed"""
+        def refreshed_pages(step_input: StepInput) -> StepOutput:
+            # Stands in for Step 5 (the same keys the extractors read from batch_scrape)
+            return StepOutput(content={"vendor_content": pages, "vendor_page_priorities": priorities}, success=True)
+
+        intel_workflow = Workflow(
+            name="Cache Warmer - Vendor Intel Pack",
+            description="Re-extract vendor elements from refreshed pages",
+            steps=[
+                Step(name="batch_scrape", executor=refreshed_pages),
+                Parallel(
+                    Step(name="extract_offerings", executor=extract_offerings),
+                    Step(name="extract_case_studies", executor=extract_case_studies),
+                    Step(name="extract_proof_points", executor=extract_proof_points),
+                    Step(name="extract_value_props", executor=extract_value_props),
+                    Step(name="extract_customers", executor=extract_customers),
+                    Step(name="extract_use_cases", executor=extract_use_cases),
+                    Step(name="extract_personas", executor=extract_personas),
+                    Step(name="extract_differentiators", executor=extract_differentiators),
+                    name="vendor_element_extraction"
+                ),
+                Step(name="index_vendor_entities", executor=index_vendor_entities)
+            ]
+        )
+        intel_workflow.run(input=WarmInput(vendor_domain=domain, profile=self.profile))
+
+    def warm_domain(self, plan: Dict) -> Dict:
+        """
+        Refresh whatever is due for one domain.
+
+        Args:
+            plan: Output of plan_domain
+
+        Returns:
+            Dict with keys: domain, map_refreshed, pages_refreshed, intel_pack_refreshed, pages_spent
+        """
+        domain = plan["domain"]
+        summary = {"domain": domain, "map_refreshed": False, "pages_refreshed": 0,
+                   "intel_pack_refreshed": False, "pages_spent": 0}
+
+        if plan["map_due"]:
+            result = map_website(domain, use_cache=False)
+            summary["map_refreshed"] = result["success"]
+            summary["pages_spent"] += 1
+
+        if plan["page_urls"]:
+            urls = list(plan["page_urls"])
+            result = batch_scrape_urls(urls, formats=config.STAGE_SCRAPE_FORMATS["batch"], max_age=0)
+            summary["pages_spent"] += len(urls)
+            pages = {
+                url: data.get("minified_markdown") or data.get("markdown", "")
+                for url, data in (result.get("results") or {}).items()
+            }
+            pages = {url: markdown for url, markdown in pages.items() if markdown}
+            summary["pages_refreshed"] = len(pages)
+
+            # A partial scrape would look like removed pages to the incremental diff
+            if config.WARM_INTEL_PACKS and config.INCREMENTAL_EXTRACTION and len(pages) == len(urls):
+                before = _intel_pack_content(load_state(domain))
+                self._refresh_intel_pack(domain, pages, {url: plan["page_urls"].get(url, 10) for url in pages})
+                # save_state rewrites the pack on every run: only count changed pages or elements
+                summary["intel_pack_refreshed"] = _intel_pack_content(load_state(domain)) != before
+
+        return summary
+
+    def run_once(self, force: bool = False) -> Dict:
+        """
+        Run one warm pass over the watchlist.
+
+        Args:
+            force: Warm even outside the off-peak window
+
+        Returns:
+            Dict with keys: warmed (per-domain summaries), deferred (domains over budget),
+            skipped (reason, if the pass didn't run)
+        """
+        if not force and not in_off_peak_window():
+            return {"warmed": [], "deferred": [], "skipped": "outside off-peak hours"}
+
+        with self._lock, step_profile(self.profile):
+            ledger = self._load_ledger()
+            plans = [self.plan_domain(domain, ledger) for domain in self.watchlist]
+            plans = sorted((plan for plan in plans if plan["cost"]), key=lambda plan: -plan["overdue"])
+
+            warmed, deferred = [], []
+            for plan in plans:
+                if plan["cost"] > self._budget_left(ledger):
+                    deferred.append(plan["domain"])
+                    continue
+                print(f"🔥 Warming {plan['domain']} (map: {'yes' if plan['map_due'] else 'no'}, pages: {len(plan['page_urls'])})")
+                summary = self.warm_domain(plan)
+                ledger["spent"].append([time.time(), summary["pages_spent"]])
+                if summary["pages_refreshed"]:
+                    ledger["pages_warmed_at"][plan["domain"]] = time.time()
+                self._save_ledger(ledger)
+                warmed.append(summary)
+
+            if deferred:
+                print(f"⏳ Page budget spent - deferred {len(deferred)} domain(s) to the next pass")
+            return {"warmed": warmed, "deferred": deferred, "skipped": None}
+
+    def run_forever(self, interval: float = None) -> None:
+        """Run a warm pass every `interval` seconds (default: config.WARM_CHECK_INTERVAL)"""
+        interval = interval or config.WARM_CHECK_INTERVAL
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️  Cache warm pass failed: {e}")
+            time.sleep(interval)
+
+
+def start_background_warmer(profile: Optional[str] = None) -> Optional[threading.Thread]:
+    """
+    Start warming the watchlist in a daemon thread (for serve.py).
+
+    Returns:
+        The thread, or None if the watchlist is empty
+    """
+    warmer = CacheWarmer(profile=profile)
+    if not warmer.watchlist:
+        print("⚠️  WARM_IN_PROCESS is set but the watchlist is empty - cache warmer not started")
+        return None
+    thread = threading.Thread(target=warmer.run_forever, name="cache-warmer", daemon=True)
+    thread.start()
+    print(f"🔥 Cache warmer started for {len(warmer.watchlist)} domain(s) (off-peak hours: {config.WARM_OFF_PEAK_HOURS})")
+    return thread
+
+
+def main():
+    """CLI entry point: one warm pass over the given domains or the configured watchlist"""
+    args = sys.argv[1:]
+    force = "--now" in args
+    if force:
+        args.remove("--now")
+    profile = None
+    if "--profile" in args:
+        index = args.index("--profile")
+        profile = args[index + 1] if index + 1 < len(args) else ""
+        del args[index:index + 2]
+
+    try:
+        warmer = CacheWarmer(watchlist=[normalize_domain(domain) for domain in args] or None, profile=profile)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not warmer.watchlist:
+        print("Usage: python warm_cache.py [domain ...] [--now] [--profile fast|balanced|thorough]")
+        print("\nWith no domains, warms WARM_WATCHLIST / WARM_WATCHLIST_FILE.")
+        sys.exit(1)
+
+    result = warmer.run_once(force=force)
+    if result["skipped"]:
+        print(f"⏸️  Skipped: {result['skipped']} ({config.WARM_OFF_PEAK_HOURS}); use --now to warm anyway")
+        return
+    for summary in result["warmed"]:
+        print(
+            f"✅ {summary['domain']}: map {'refreshed' if summary['map_refreshed'] else 'fresh'}, "
+            f"{summary['pages_refreshed']} pages, intel pack {'refreshed' if summary['intel_pack_refreshed'] else 'unchanged'}"
+        )
+    if not result["warmed"] and not result["deferred"]:
+        print("✅ Nothing due - all caches are fresh")
+
+
+if __name__ == "__main__":
+    main()
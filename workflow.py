@@ -22,7 +22,8 @@ from steps.step6_vendor_extraction import (
     extract_customers,
     extract_use_cases,
     extract_personas,
-    extract_differentiators
+    extract_differentiators,
+    index_vendor_entities
 )
 
 # Import Phase 3 step executors (Step 7)
@@ -47,18 +48,14 @@ phase1_workflow = Workflow(
     name="Phase 1 - Intelligence Gathering",
     description="Validate domains, scrape homepages, prioritize URLs, and batch scrape content",
     steps=[
-        # Step 1: Parallel domain validation
+        # Steps 1-2: Domain mapping and homepage scraping, all four in parallel
+        # (homepage scrapes only need the input domains, so they overlap the map calls)
         Parallel(
             Step(name="validate_vendor", executor=validate_vendor_domain),
             Step(name="validate_prospect", executor=validate_prospect_domain),
-            name="parallel_validation"
-        ),
-
-        # Step 2: Parallel homepage scraping
-        Parallel(
             Step(name="scrape_vendor_home", executor=scrape_vendor_homepage),
             Step(name="scrape_prospect_home", executor=scrape_prospect_homepage),
-            name="parallel_homepage_scraping"
+            name="parallel_discovery"
         ),
 
         # Step 3: Parallel homepage analysis
@@ -82,18 +79,14 @@ phase1_2_workflow = Workflow(
     name="Phase 1-2 - Intelligence Gathering & Vendor Extraction",
     description="Gather intelligence and extract vendor GTM elements with 8 parallel specialists",
     steps=[
-        # Step 1: Parallel domain validation
+        # Steps 1-2: Domain mapping and homepage scraping, all four in parallel
+        # (homepage scrapes only need the input domains, so they overlap the map calls)
         Parallel(
             Step(name="validate_vendor", executor=validate_vendor_domain),
             Step(name="validate_prospect", executor=validate_prospect_domain),
-            name="parallel_validation"
-        ),
-
-        # Step 2: Parallel homepage scraping
-        Parallel(
             Step(name="scrape_vendor_home", executor=scrape_vendor_homepage),
             Step(name="scrape_prospect_home", executor=scrape_prospect_homepage),
-            name="parallel_homepage_scraping"
+            name="parallel_discovery"
         ),
 
         # Step 3: Parallel homepage analysis
@@ -120,7 +113,10 @@ phase1_2_workflow = Workflow(
             Step(name="extract_personas", executor=extract_personas),
             Step(name="extract_differentiators", executor=extract_differentiators),
             name="vendor_element_extraction"
-        )
+        ),
+
+        # Step 6b: Merge customers and personas found by several extractors
+        Step(name="index_vendor_entities", executor=index_vendor_entities)
     ]
 )
 
@@ -130,18 +126,14 @@ phase1_2_3_workflow = Workflow(
     name="Phase 1-2-3 - Complete Sales Intelligence Pipeline",
     description="Intelligence gathering, vendor extraction, and prospect persona identification",
     steps=[
-        # Step 1: Parallel domain validation
+        # Steps 1-2: Domain mapping and homepage scraping, all four in parallel
+        # (homepage scrapes only need the input domains, so they overlap the map calls)
         Parallel(
             Step(name="validate_vendor", executor=validate_vendor_domain),
             Step(name="validate_prospect", executor=validate_prospect_domain),
-            name="parallel_validation"
-        ),
-
-        # Step 2: Parallel homepage scraping
-        Parallel(
             Step(name="scrape_vendor_home", executor=scrape_vendor_homepage),
             Step(name="scrape_prospect_home", executor=scrape_prospect_homepage),
-            name="parallel_homepage_scraping"
+            name="parallel_discovery"
         ),
 
         # Step 3: Parallel homepage analysis
@@ -170,6 +162,9 @@ phase1_2_3_workflow = Workflow(
             name="vendor_element_extraction"
         ),
 
+        # Step 6b: Merge customers and personas found by several extractors
+        Step(name="index_vendor_entities", executor=index_vendor_entities),
+
         # Step 7a: Prospect context analysis (2 parallel analysts)
         Parallel(
             Step(name="analyze_company", executor=analyze_company_profile),
@@ -188,18 +183,14 @@ phase1_2_3_4_workflow = Workflow(
     name="Phase 1-2-3-4 - Complete Sales Intelligence + Playbook Generation",
     description="End-to-end: Intelligence, vendor extraction, prospect analysis, and actionable playbooks",
     steps=[
-        # Step 1: Parallel domain validation
+        # Steps 1-2: Domain mapping and homepage scraping, all four in parallel
+        # (homepage scrapes only need the input domains, so they overlap the map calls)
         Parallel(
             Step(name="validate_vendor", executor=validate_vendor_domain),
             Step(name="validate_prospect", executor=validate_prospect_domain),
-            name="parallel_validation"
-        ),
-
-        # Step 2: Parallel homepage scraping
-        Parallel(
             Step(name="scrape_vendor_home", executor=scrape_vendor_homepage),
             Step(name="scrape_prospect_home", executor=scrape_prospect_homepage),
-            name="parallel_homepage_scraping"
+            name="parallel_discovery"
         ),
 
         # Step 3: Parallel homepage analysis
@@ -228,6 +219,9 @@ phase1_2_3_4_workflow = Workflow(
             name="vendor_element_extraction"
         ),
 
+        # Step 6b: Merge customers and personas found by several extractors
+        Step(name="index_vendor_entities", executor=index_vendor_entities),
+
         # Step 7a: Prospect context analysis (2 parallel analysts)
         Parallel(
             Step(name="analyze_company", executor=analyze_company_profile),